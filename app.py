@@ -5,26 +5,43 @@ Professional-grade system for tracking employee performance and calculating bonu
 Built for enterprise fintech companies requiring accuracy and transparency
 """
 
-from flask import Flask, render_template, request, jsonify, send_file, flash, redirect, url_for
+from flask import Flask, render_template, request, jsonify, send_file, flash, redirect, url_for, Response, abort
+from flask.cli import AppGroup
 from flask_sqlalchemy import SQLAlchemy
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta, date
+from types import SimpleNamespace
+import base64
 import calendar
 import json
+import sys
 import uuid
+import click
+
+from excel_export import XLSX_MIMETYPE, SHEET_SUFFIX, stream_workbook, build_performance_workbook, sheet_title
+from excel_import import find_workbooks, iter_parsed_workbooks
+import database_config
+import work_calendar
+import response_cache
+from event_stream import broadcaster, StreamFull
+from performance_rules import calculate_performance_metrics, summary_financials
 
 app = Flask(__name__)
 import os
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'performancepro-enterprise-grade-secret-key')
 
-# Database configuration with fallback
-database_url = os.environ.get('DATABASE_URL')
-if database_url and database_url.startswith('postgres://'):
-    database_url = database_url.replace('postgres://', 'postgresql://', 1)
+# Database configuration with fallback (DATABASE_URL, MySQL settings, local SQLite)
+database_url = database_config.database_url()
 
-app.config['SQLALCHEMY_DATABASE_URI'] = database_url or 'sqlite:///performancepro.db'
+app.config['SQLALCHEMY_DATABASE_URI'] = database_url
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = database_config.engine_options(database_url)
+app.config['SQLALCHEMY_BINDS'] = database_config.read_replica_binds()  # Optional DATABASE_READ_URL
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
-db = SQLAlchemy(app)
+db = SQLAlchemy(app, session_options={'class_': database_config.RoutingSession})
+with app.app_context():
+    for bind_key, engine in db.engines.items():
+        database_config.instrument_engine(engine, bind_key or 'default')
 
 # Enterprise Models
 class Company(db.Model):
@@ -57,6 +74,8 @@ class Employee(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     department = db.relationship('Department', backref='employees')
+    
+    __table_args__ = (db.Index('ix_employee_name_id', 'name', 'id'),)  # Directory pages sorted by name
 
 class DailyPerformance(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -86,7 +105,10 @@ class DailyPerformance(db.Model):
     
     employee = db.relationship('Employee', backref='performances')
     
-    __table_args__ = (db.UniqueConstraint('employee_id', 'date', name='unique_employee_date'),)
+    __table_args__ = (
+        db.UniqueConstraint('employee_id', 'date', name='unique_employee_date'),
+        db.Index('ix_daily_performance_date', 'date'),  # Company-wide date range scans
+    )
 
 class PerformanceAudit(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -112,6 +134,10 @@ class MonthlySummary(db.Model):
     leave_days = db.Column(db.Integer, default=0)
     overtime_days = db.Column(db.Integer, default=0)
     
+    # Running Totals (maintained incrementally on every performance write)
+    recorded_days = db.Column(db.Integer, default=0)
+    efficiency_sum = db.Column(db.Float, default=0)
+    
     # Financial Calculations
     base_salary = db.Column(db.Float, default=0)
     bonus_rate = db.Column(db.Float, default=0)
@@ -129,63 +155,147 @@ class MonthlySummary(db.Model):
     
     __table_args__ = (db.UniqueConstraint('employee_id', 'year', 'month', name='unique_employee_month'),)
 
+class DailyRollup(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    date = db.Column(db.Date, nullable=False)
+    department_id = db.Column(db.Integer, nullable=False, default=0)  # 0 = no department
+    
+    # Running Totals of the day's DailyPerformance rows (maintained on every performance write)
+    total_points = db.Column(db.Float, default=0, nullable=False)
+    total_hours = db.Column(db.Float, default=0, nullable=False)
+    recorded_days = db.Column(db.Integer, default=0, nullable=False)  # Employee-days recorded
+    efficiency_sum = db.Column(db.Float, default=0, nullable=False)
+    task_failures = db.Column(db.Integer, default=0, nullable=False)
+    leave_days = db.Column(db.Integer, default=0, nullable=False)
+    overtime_days = db.Column(db.Integer, default=0, nullable=False)
+    
+    __table_args__ = (db.UniqueConstraint('date', 'department_id', name='unique_rollup_date_department'),)
+
+class CompanyHoliday(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    date = db.Column(db.Date, unique=True, nullable=False)
+    name = db.Column(db.String(100), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+# Business Rules & Limits
+DASHBOARD_LEADERBOARD_SIZE = 10
+LEADERBOARD_DEFAULT_LIMIT = 50
+LEADERBOARD_MAX_LIMIT = 500
+
+PERFORMANCE_GRADES = [
+    (12, {'grade': 'A+', 'class': 'success', 'desc': 'Exceptional'}),
+    (10, {'grade': 'A', 'class': 'success', 'desc': 'Excellent'}),
+    (8, {'grade': 'B+', 'class': 'primary', 'desc': 'Very Good'}),
+    (7, {'grade': 'B', 'class': 'info', 'desc': 'Good'}),
+    (5, {'grade': 'C', 'class': 'warning', 'desc': 'Satisfactory'}),
+]
+LOWEST_PERFORMANCE_GRADE = {'grade': 'D', 'class': 'danger', 'desc': 'Needs Improvement'}
+
+SUMMARY_TOTAL_FIELDS = (
+    'total_points', 'total_hours', 'recorded_days', 'efficiency_sum',
+    'task_failures', 'leave_days', 'overtime_days'
+)
+SUMMARY_DRIFT_TOLERANCE = 1e-6
+ROLLUP_TOTAL_FIELDS = SUMMARY_TOTAL_FIELDS  # DailyRollup keeps the same running totals per day and department
+ROLLUP_NO_DEPARTMENT = 0
+
+PERFORMANCE_REQUIRED_FIELDS = ('employee_id', 'date', 'completed_hrs')
+PERFORMANCE_INPUT_FIELDS = (
+    'meeting_hrs', 'assigned_hrs', 'completed_hrs', 'complexity_factor',
+    'qa_factor', 'task_failed', 'leave_taken'
+)
+PERFORMANCE_DERIVED_FIELDS = ('available_hrs', 'efficiency', 'raw_points', 'ot_points', 'approved_points')
+BULK_PERFORMANCE_MAX_ROWS = 5000
+UPSERT_CHUNK_SIZE = 500
+RECOMPUTE_CHUNK_SIZE = 10000
+FINALIZE_WORKERS = int(os.environ.get('FINALIZE_WORKERS', os.cpu_count() or 1))
+FINALIZE_PARALLEL_THRESHOLD = 2000
+EXPORT_FETCH_SIZE = 2000
+HOLIDAY_REFRESH_SECONDS = 60
+TREND_DEFAULT_WEEKS = 12
+TREND_MAX_WEEKS = 104
+DEPARTMENT_BASELINE_POINTS = {  # Shown for departments without data in the range
+    'Engineering': 9.2,
+    'Product Management': 8.8,
+    'Sales & Marketing': 7.5,
+    'Operations': 8.0,
+    'Finance & Admin': 7.8,
+    'Human Resources': 7.2
+}
+DISTRIBUTION_BUCKETS = [  # (lower bound of average points, label, colour), highest first
+    (10, 'Top Performers', 'rgb(16, 185, 129)'),
+    (7, 'High Performers', 'rgb(59, 130, 246)'),
+    (4, 'Average', 'rgb(245, 158, 11)'),
+    (0, 'Needs Support', 'rgb(239, 68, 68)'),
+]
+DISTRIBUTION_MAX_BINS = 100
+DISTRIBUTION_BIN_RANGE = 20  # Equal-width bins cover 0-20 points/day; the last bin is open-ended
+SUBTEAM_COLUMNS = {  # Drill-down groupings inside one department
+    'manager': 'reporting_manager',
+    'designation': 'designation',
+    'employment_type': 'employment_type'
+}
+EMPLOYEE_TREND_DEFAULT_DAYS = 30
+EMPLOYEE_TREND_MAX_DAYS = 3660
+EMPLOYEE_TREND_DAILY_MAX_DAYS = 180  # Longer windows are downsampled...
+EMPLOYEE_TREND_WEEKLY_MAX_DAYS = 1100  # ...to weeks (~150 points for 3 years), then months
+EMPLOYEE_TREND_BUCKETS = ('day', 'week', 'month')
+EMPLOYEE_PAGE_DEFAULT_SIZE = 50
+EMPLOYEE_PAGE_MAX_SIZE = 500
+EMPLOYEE_SORT_KEYS = ('id', 'name')
+EMPLOYEE_STATUSES = ('all', 'active', 'inactive')
+SALARY_BANDS = [  # (level, label, lower bound, upper bound)
+    ('Entry Level', '₹30K - ₹50K', None, 50000),
+    ('Mid Level', '₹50K - ₹80K', 50000, 80000),
+    ('Senior Level', '₹80K - ₹120K', 80000, 120000),
+    ('Leadership', '₹120K+', 120000, None),
+]
+TREND_FIELDS = ('records', 'total_points', 'avg_points', 'avg_efficiency', 'total_hours', 'leave_days')
+
 # Business Logic Functions
-def calculate_performance_metrics(performance):
-    """
-    Enterprise-grade performance calculation engine
-    Implements the sophisticated bonus calculation algorithm
-    """
-    
-    # Step 1: Calculate Available Working Hours
-    if performance.leave_taken:
-        performance.available_hrs = 0
-    else:
-        performance.available_hrs = max(0, 9 - performance.meeting_hrs)
-    
-    # Step 2: Calculate Work Efficiency Ratio
-    if performance.available_hrs == 0:
-        performance.efficiency = 0
-    else:
-        performance.efficiency = min(2.0, performance.completed_hrs / performance.available_hrs)
-    
-    # Step 3: Calculate Raw Performance Points
-    performance.raw_points = (
-        performance.completed_hrs * 
-        performance.complexity_factor * 
-        performance.qa_factor
-    )
-    
-    # Step 4: Calculate Overtime Contribution
-    performance.ot_points = max(0, performance.completed_hrs - performance.assigned_hrs)
-    
-    # Step 5: Apply Quality Gates and Calculate Final Points
-    if performance.task_failed:
-        performance.approved_points = 0  # Quality gate: Failed tasks = 0 points
-    else:
-        performance.approved_points = round(
-            performance.efficiency * performance.raw_points, 2
-        )
-    
-    return performance
+def month_date_range(year, month):
+    """Half-open [start, end) date range covering a calendar month"""
+    start = date(year, month, 1)
+    end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return start, end
+
+def in_month(year, month, column=None):
+    """Index-friendly predicate restricting a date column to a calendar month"""
+    column = DailyPerformance.date if column is None else column
+    start, end = month_date_range(year, month)
+    return db.and_(column >= start, column < end)
+
+holiday_state = {'loaded_at': None}
+
+def load_holidays(force=False):
+    """Sync the shared working-day calendar with CompanyHoliday (at most every HOLIDAY_REFRESH_SECONDS)"""
+    now = datetime.utcnow()
+    loaded_at = holiday_state['loaded_at']
+    if not force and loaded_at and (now - loaded_at).total_seconds() < HOLIDAY_REFRESH_SECONDS:
+        return
+    holiday_state['loaded_at'] = now
+    # Own connection: this runs inside callers' write transactions and must never disturb them
+    try:
+        with db.engine.connect() as connection:
+            holidays = [day for (day,) in connection.execute(db.select(CompanyHoliday.date))]
+    except Exception:
+        return  # Table not created yet; keep the current calendar
+    work_calendar.set_holidays(holidays)
 
 def get_working_days(year, month):
-    """Get all business days (Monday-Saturday) for a given month"""
-    business_days = []
-    first_day = date(year, month, 1)
-    last_day = date(year, month, calendar.monthrange(year, month)[1])
-    
-    current_date = first_day
-    while current_date <= last_day:
-        if current_date.weekday() < 6:  # Monday=0 to Saturday=5
-            business_days.append(current_date)
-        current_date += timedelta(days=1)
-    
-    return business_days
+    """Get all business days (Monday-Saturday minus company holidays) for a given month"""
+    load_holidays()
+    return work_calendar.working_days(year, month)
+
+def working_day_count(year, month):
+    load_holidays()
+    return work_calendar.working_day_count(year, month)
 
 def calculate_monthly_compensation(employee_id, year, month):
     """
     Enterprise bonus calculation algorithm
     Implements sophisticated financial calculations with multiple validation layers
+    Performs a full recompute of the month from DailyPerformance
     """
     
     # Fetch employee and performance data
@@ -193,157 +303,1194 @@ def calculate_monthly_compensation(employee_id, year, month):
     if not employee:
         return None
     
-    performances = DailyPerformance.query.filter_by(employee_id=employee_id).filter(
-        db.extract('year', DailyPerformance.date) == year,
-        db.extract('month', DailyPerformance.date) == month
-    ).all()
+    aggregate = month_aggregate_subquery(year, month, employee_id)
+    totals = db.session.query(
+        *month_metric_columns(aggregate).values()
+    ).select_from(aggregate).first()
     
-    working_days = get_working_days(year, month)
+    # Create or update monthly summary
+    summary = MonthlySummary.query.filter_by(
+        employee_id=employee_id, year=year, month=month
+    ).first()
     
-    # Core Performance Metrics
-    total_points = sum(p.approved_points for p in performances)
-    total_hours = sum(p.completed_hrs for p in performances)
-    work_performances = [p for p in performances if not p.leave_taken]
-    avg_efficiency = (
-        sum(p.efficiency for p in work_performances) / len(work_performances) 
-        if work_performances else 0
-    )
+    if not summary:
+        summary = MonthlySummary(employee_id=employee_id, year=year, month=month)
     
-    # Risk and Quality Metrics
-    task_failures = sum(1 for p in performances if p.task_failed)
-    leave_days = sum(1 for p in performances if p.leave_taken)
-    overtime_days = sum(1 for p in performances if p.ot_points > 0)
+    # Update running totals, then all derived metrics
+    for field in SUMMARY_TOTAL_FIELDS:
+        setattr(summary, field, getattr(totals, field) if totals else 0)
     
-    # Financial Calculations
-    max_possible_points = len(working_days) * 10  # 10 points per day maximum
-    max_bonus_amount = employee.base_salary * 0.5  # 50% salary cap
+    return update_summary_financials(summary, employee)
+
+def update_summary_financials(summary, employee):
+    """Derive averages, bonus and compensation from a summary's running totals"""
+    totals = {field: getattr(summary, field) for field in SUMMARY_TOTAL_FIELDS}
+    total_workdays = working_day_count(summary.year, summary.month)
+    
+    for field, value in summary_financials(totals, employee.base_salary, total_workdays).items():
+        setattr(summary, field, value)
+    
+    return summary
+
+def refresh_open_summaries(year, month):
+    """Re-derive bonus figures of a month's open summaries after its working days changed"""
+    summaries = MonthlySummary.query.options(db.joinedload(MonthlySummary.employee)).filter_by(
+        year=year, month=month, is_finalized=False
+    ).all()
+    for summary in summaries:
+        update_summary_financials(summary, summary.employee)
+    db.session.commit()
+    return len(summaries)
+
+def refresh_employee_summaries(employee):
+    """Re-derive bonus figures of an employee's open summaries after their salary changed; the caller commits"""
+    summaries = MonthlySummary.query.filter_by(employee_id=employee.id, is_finalized=False).all()
+    for summary in summaries:
+        update_summary_financials(summary, employee)
+    return len(summaries)
+
+def performance_contribution(performance):
+    """Contribution of one daily record to its MonthlySummary running totals"""
+    worked = not performance.leave_taken
+    return {
+        'total_points': performance.approved_points or 0,
+        'total_hours': performance.completed_hrs or 0,
+        'recorded_days': 1,
+        'efficiency_sum': (performance.efficiency or 0) if worked else 0,
+        'task_failures': 1 if performance.task_failed else 0,
+        'leave_days': 0 if worked else 1,
+        'overtime_days': 1 if (performance.ot_points or 0) > 0 else 0
+    }
+
+def summary_financial_expressions(employee_id, totals, total_workdays):
+    """SQL expressions mirroring summary_financials over SQL running totals, with the employee's current salary"""
+    base_salary = db.select(Employee.base_salary).where(Employee.id == employee_id).scalar_subquery()
+    work_days = totals['recorded_days'] - totals['leave_days']
+    max_possible_points = total_workdays * 10
+    max_bonus_amount = base_salary * 0.5
     
     if max_possible_points > 0:
-        bonus_rate_per_point = max_bonus_amount / max_possible_points
-        calculated_bonus = total_points * bonus_rate_per_point
-        final_bonus = min(calculated_bonus, max_bonus_amount)
+        bonus_rate = max_bonus_amount / max_possible_points
+        calculated_bonus = totals['total_points'] * bonus_rate
+        final_bonus = db.case((calculated_bonus > max_bonus_amount, max_bonus_amount), else_=calculated_bonus)
     else:
-        bonus_rate_per_point = 0
-        calculated_bonus = 0
-        final_bonus = 0
+        calculated_bonus = bonus_rate = final_bonus = db.literal(0.0)
+    
+    return {
+        'total_workdays': total_workdays,
+        'avg_efficiency': db.case((work_days > 0, totals['efficiency_sum'] * 1.0 / work_days), else_=0.0),
+        'base_salary': base_salary,
+        'bonus_rate': bonus_rate,
+        'calculated_bonus': calculated_bonus,
+        'final_bonus': final_bonus,
+        'total_compensation': base_salary + final_bonus
+    }
+
+def apply_summary_delta(employee_id, day, old_contribution, new_contribution):
+    """
+    Shift the matching MonthlySummary by the change in one daily record
+    Totals and derived financials are set in a single UPDATE; falls back to
+    a full recompute when the month has no summary yet
+    """
+    totals = {
+        field: getattr(MonthlySummary, field) + (new_contribution.get(field, 0) - old_contribution.get(field, 0))
+        for field in SUMMARY_TOTAL_FIELDS
+    }
+    financials = summary_financial_expressions(employee_id, totals, working_day_count(day.year, day.month))
+    
+    updated = db.session.execute(db.update(MonthlySummary).where(
+        MonthlySummary.employee_id == employee_id,
+        MonthlySummary.year == day.year,
+        MonthlySummary.month == day.month
+    ).values(**totals, **financials).execution_options(synchronize_session=False)).rowcount
+    
+    if not updated:
+        summary = calculate_monthly_compensation(employee_id, day.year, day.month)
+        if summary is not None:
+            db.session.add(summary)
+
+def clean_performance_input(data):
+    """Parse and clamp one daily performance payload to the allowed input ranges"""
+    return {
+        'employee_id': int(data['employee_id']),
+        'date': datetime.strptime(data['date'], '%Y-%m-%d').date(),
+        'meeting_hrs': max(0, min(9, float(data.get('meeting_hrs', 0)))),
+        'assigned_hrs': max(1, min(12, float(data.get('assigned_hrs', 9)))),
+        'completed_hrs': max(0, min(16, float(data.get('completed_hrs', 0)))),
+        'complexity_factor': max(0.5, min(3.0, float(data.get('complexity_factor', 1.0)))),
+        'qa_factor': max(0.3, min(2.0, float(data.get('qa_factor', 1.0)))),
+        'task_failed': bool(data.get('task_failed', False)),
+        'leave_taken': bool(data.get('leave_taken', False))
+    }
+
+def validate_performance_record(record):
+    """Required-field check plus clamping, shared by the bulk and import write paths"""
+    if not isinstance(record, dict):
+        raise ValueError('Record must be an object')
+    for field in PERFORMANCE_REQUIRED_FIELDS:
+        if field not in record:
+            raise ValueError(f'Missing required field: {field}')
+    return clean_performance_input(record)
+
+def score_performance_rows(rows):
+    """Run calculate_performance_metrics over a batch of cleaned input rows"""
+    return [vars(calculate_performance_metrics(SimpleNamespace(**row))) for row in rows]
+
+def performance_result(performance):
+    """API representation of the derived metrics of one daily record"""
+    if isinstance(performance, dict):
+        performance = SimpleNamespace(**performance)
+    return {
+        'approved_points': performance.approved_points,
+        'efficiency': round(performance.efficiency * 100, 1),
+        'available_hrs': performance.available_hrs,
+        'raw_points': performance.raw_points,
+        'ot_points': performance.ot_points
+    }
+
+def upsert_rows(model, rows, key_columns, update_columns, accumulate=False):
+    """
+    Insert or update rows with the dialect-native upsert
+    Conflicts are resolved on the unique constraint over key_columns; with
+    accumulate the update adds the new values to the stored ones instead
+    """
+    table = model.__table__
+    dialect = db.session.get_bind().dialect.name
     
-    total_compensation = employee.base_salary + final_bonus
+    if dialect in ('sqlite', 'postgresql'):
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        statement = insert(table)
+        statement = statement.on_conflict_do_update(
+            index_elements=list(key_columns),
+            set_={column: table.c[column] + statement.excluded[column] if accumulate else statement.excluded[column]
+                  for column in update_columns}
+        )
+    elif dialect == 'mysql':
+        from sqlalchemy.dialects.mysql import insert
+        statement = insert(table)
+        statement = statement.on_duplicate_key_update(
+            {column: table.c[column] + statement.inserted[column] if accumulate else statement.inserted[column]
+             for column in update_columns}
+        )
+    else:
+        for row in rows:
+            key = {column: row[column] for column in key_columns}
+            record = model.query.filter_by(**key).first() or model(**key)
+            for column in update_columns:
+                setattr(record, column, (getattr(record, column) or 0) + row[column] if accumulate else row[column])
+            db.session.add(record)
+        db.session.flush()
+        return
+    
+    # Multi-row VALUES, chunked to stay under driver bind-parameter limits
+    for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+        db.session.execute(statement.values(rows[start:start + UPSERT_CHUNK_SIZE]))
+
+def upsert_performance_rows(rows):
+    """Insert or update scored daily rows on the unique (employee_id, date) constraint"""
+    now = datetime.utcnow()
+    upsert_rows(
+        DailyPerformance,
+        [dict(row, updated_at=now) for row in rows],
+        key_columns=('employee_id', 'date'),
+        update_columns=PERFORMANCE_INPUT_FIELDS + PERFORMANCE_DERIVED_FIELDS + ('updated_at', 'updated_by')
+    )
+
+def known_employee_ids(employee_ids):
+    """The subset of employee_ids that exist; writes for any other id are rejected"""
+    return {
+        employee_id for (employee_id,) in db.session.query(Employee.id).filter(Employee.id.in_(employee_ids))
+    }
+
+class MonthFinalizedError(Exception):
+    """A performance write targets an employee month that has been finalized"""
+
+def finalized_months(rows):
+    """(employee_id, year, month) keys of rows whose MonthlySummary is finalized"""
+    keys = {(row['employee_id'], row['date'].year, row['date'].month) for row in rows}
+    if not keys:
+        return set()
+    finalized = db.session.query(MonthlySummary.employee_id, MonthlySummary.year, MonthlySummary.month).filter(
+        MonthlySummary.is_finalized == True,
+        MonthlySummary.employee_id.in_({employee_id for employee_id, _, _ in keys}),
+        MonthlySummary.year >= min(year for _, year, _ in keys),
+        MonthlySummary.year <= max(year for _, year, _ in keys)
+    )
+    return keys & {tuple(key) for key in finalized}
+
+def write_performance_rows(rows, performed_by):
+    """
+    Persist scored daily rows: upsert, summary deltas and audit trail
+    Runs inside the caller's transaction; the caller commits. Raises
+    MonthFinalizedError before writing anything if a row falls in a finalized month
+    Returns the employee -> department map for invalidate_performance_cache
+    """
+    closed = finalized_months(rows)
+    if closed:
+        employee_id, year, month = min(closed)
+        raise MonthFinalizedError(f"{year}-{month:02d} is finalized for employee {employee_id}")
+    
+    # Previous values of the rows being overwritten, for the summary deltas
+    employee_ids = {row['employee_id'] for row in rows}
+    dates = [row['date'] for row in rows]
+    keys = {(row['employee_id'], row['date']) for row in rows}
+    existing = [
+        previous for previous in db.session.query(
+            DailyPerformance.employee_id, DailyPerformance.date,
+            DailyPerformance.approved_points, DailyPerformance.completed_hrs,
+            DailyPerformance.efficiency, DailyPerformance.task_failed,
+            DailyPerformance.leave_taken, DailyPerformance.ot_points
+        ).filter(
+            DailyPerformance.employee_id.in_(employee_ids),
+            DailyPerformance.date >= min(dates),
+            DailyPerformance.date <= max(dates)
+        )
+        if (previous.employee_id, previous.date) in keys
+    ]
+    
+    for row in rows:
+        row['updated_by'] = performed_by
+    upsert_performance_rows(rows)
+    
+    # One summary delta per employee and month touched
+    deltas = {}
+    for previous in existing:
+        month_key = (previous.employee_id, previous.date.year, previous.date.month)
+        old_totals, _ = deltas.setdefault(month_key, ({}, {}))
+        add_contribution(old_totals, performance_contribution(SimpleNamespace(**previous._asdict())))
+    for row in rows:
+        month_key = (row['employee_id'], row['date'].year, row['date'].month)
+        _, new_totals = deltas.setdefault(month_key, ({}, {}))
+        add_contribution(new_totals, performance_contribution(SimpleNamespace(**row)))
+    
+    for (employee_id, year, month), (old_totals, new_totals) in deltas.items():
+        apply_summary_delta(employee_id, date(year, month, 1), old_totals, new_totals)
+    
+    # One rollup delta per day and department touched
+    departments = dict(db.session.query(Employee.id, Employee.department_id).filter(
+        Employee.id.in_(employee_ids)
+    ))
+    rollup_deltas = {}
+    for sign, records in ((-1, [SimpleNamespace(**previous._asdict()) for previous in existing]),
+                          (1, [SimpleNamespace(**row) for row in rows])):
+        for record in records:
+            department_id = departments.get(record.employee_id) or ROLLUP_NO_DEPARTMENT
+            add_contribution(rollup_deltas.setdefault((record.date, department_id), {}), {
+                field: sign * value for field, value in performance_contribution(record).items()
+            })
+    apply_rollup_deltas(rollup_deltas)
+    
+    # Audit trail as a single batch insert
+    db.session.execute(db.insert(PerformanceAudit), [
+        {
+            'employee_id': row['employee_id'],
+            'action': "Performance Updated",
+            'new_values': json.dumps({
+                'date': row['date'].isoformat(),
+                'completed_hrs': row['completed_hrs'],
+                'approved_points': row['approved_points']
+            }),
+            'performed_by': performed_by,
+            'timestamp': datetime.utcnow()
+        }
+        for row in rows
+    ])
     
-    # Create or update monthly summary
+    return departments
+
+def invalidate_performance_cache(rows, departments):
+    """Bump response-cache generations for the months and departments of written rows"""
+    response_cache.invalidate({
+        (row['date'].year, row['date'].month, departments.get(row['employee_id'])) for row in rows
+    })
+
+def invalidate_month_cache(months):
+    """Bump response-cache generations of whole months, every department included"""
+    department_ids = [None] + [department_id for (department_id,) in db.session.query(Department.id)]
+    response_cache.invalidate([
+        (year, month, department_id) for year, month in months for department_id in department_ids
+    ])
+
+def company_month_totals(year, month):
+    """Company-wide month totals over the daily rows, matching the dashboard's company stats"""
+    max_possible_points = working_day_count(year, month) * 10
+    aggregate = month_aggregate_subquery(year, month)
+    metrics = month_metric_columns(aggregate)
+    total_points, total_hours, total_bonus = active_employee_month_query(
+        aggregate,
+        db.func.coalesce(db.func.sum(metrics['total_points']), 0),
+        db.func.coalesce(db.func.sum(metrics['total_hours']), 0),
+        db.func.coalesce(db.func.sum(projected_bonus_expression(metrics, max_possible_points)), 0)
+    ).one()
+    return {'year': year, 'month': month, 'total_points': round(total_points, 2),
+            'total_hours': round(total_hours, 2), 'total_projected_bonus': round(total_bonus, 2)}
+
+def publish_performance_event(row):
+    """Push a compact change event for one saved daily record to /api/stream"""
+    def payload():
+        day = row['date']
+        summary = get_monthly_summary(row['employee_id'], day.year, day.month)
+        employee = db.session.get(Employee, row['employee_id'])
+        max_possible_points = working_day_count(day.year, day.month) * 10
+        max_bonus = employee.base_salary * 0.5
+        work_days = summary.recorded_days - summary.leave_days
+        avg_points = summary.total_points / work_days if work_days > 0 else 0
+        return {
+            'employee_id': row['employee_id'],
+            'date': day.isoformat(),
+            'approved_points': row['approved_points'],
+            'employee_month': {
+                'total_points': round(summary.total_points, 2),
+                'total_hours': round(summary.total_hours, 2),
+                'work_days': work_days,
+                'avg_efficiency': round(summary.avg_efficiency, 4),
+                'projected_bonus': round(min(summary.total_points * max_bonus / max_possible_points, max_bonus), 2)
+                                   if max_possible_points > 0 else 0,
+                'performance_grade': get_performance_grade(avg_points)
+            },
+            'company_month': company_month_totals(day.year, day.month)
+        }
+    broadcaster.publish('performance', payload)
+
+def publish_batch_event(rows):
+    """Push one event for a bulk write; clients refetch instead of patching row by row"""
+    months = sorted({(row['date'].year, row['date'].month) for row in rows})
+    broadcaster.publish('performance_batch', lambda: {
+        'saved': len(rows),
+        'months': [company_month_totals(year, month) for year, month in months]
+    })
+
+def add_contribution(totals, contribution):
+    """Accumulate one record's contribution into running totals"""
+    for field, value in contribution.items():
+        totals[field] = totals.get(field, 0) + value
+    return totals
+
+def apply_rollup_deltas(deltas):
+    """Add {(date, department_id): totals} deltas to DailyRollup in one accumulating upsert"""
+    rows = [
+        dict({field: totals.get(field, 0) for field in ROLLUP_TOTAL_FIELDS}, date=day, department_id=department_id)
+        for (day, department_id), totals in deltas.items() if any(totals.values())
+    ]
+    if rows:
+        upsert_rows(DailyRollup, rows, key_columns=('date', 'department_id'),
+                    update_columns=ROLLUP_TOTAL_FIELDS, accumulate=True)
+
+def rollup_totals_select(*criteria):
+    """DailyPerformance grouped by (date, department) into DailyRollup's columns"""
+    worked = DailyPerformance.leave_taken == False
+    department_id = db.func.coalesce(Employee.department_id, ROLLUP_NO_DEPARTMENT)
+    return db.select(
+        DailyPerformance.date.label('date'),
+        department_id.label('department_id'),
+        db.func.sum(DailyPerformance.approved_points).label('total_points'),
+        db.func.sum(DailyPerformance.completed_hrs).label('total_hours'),
+        db.func.count(DailyPerformance.id).label('recorded_days'),
+        db.func.sum(db.case((worked, DailyPerformance.efficiency), else_=0)).label('efficiency_sum'),
+        db.func.sum(db.case((DailyPerformance.task_failed == True, 1), else_=0)).label('task_failures'),
+        db.func.sum(db.case((DailyPerformance.leave_taken == True, 1), else_=0)).label('leave_days'),
+        db.func.sum(db.case((DailyPerformance.ot_points > 0, 1), else_=0)).label('overtime_days')
+    ).join(Employee, Employee.id == DailyPerformance.employee_id).where(*criteria).group_by(
+        DailyPerformance.date, department_id
+    )
+
+def rebuild_daily_rollups(start=None, end=None):
+    """
+    Regenerate DailyRollup from DailyPerformance (optionally for [start, end] only)
+    One DELETE plus one INSERT ... SELECT; the caller commits. Returns the rows written
+    """
+    rollup_criteria, performance_criteria = [], []
+    if start:
+        rollup_criteria.append(DailyRollup.date >= start)
+        performance_criteria.append(DailyPerformance.date >= start)
+    if end:
+        rollup_criteria.append(DailyRollup.date <= end)
+        performance_criteria.append(DailyPerformance.date <= end)
+    
+    db.session.execute(db.delete(DailyRollup).where(*rollup_criteria))
+    columns = ('date', 'department_id') + ROLLUP_TOTAL_FIELDS
+    result = db.session.execute(db.insert(DailyRollup).from_select(
+        columns, rollup_totals_select(*performance_criteria)
+    ))
+    return result.rowcount
+
+def move_employee_rollups(employee_id, old_department_id, new_department_id):
+    """Shift an employee's past days from one department's rollups to another's"""
+    deltas = {}
+    for row in db.session.execute(rollup_totals_select(DailyPerformance.employee_id == employee_id)):
+        totals = {field: getattr(row, field) or 0 for field in ROLLUP_TOTAL_FIELDS}
+        deltas[(row.date, old_department_id or ROLLUP_NO_DEPARTMENT)] = {
+            field: -value for field, value in totals.items()
+        }
+        deltas[(row.date, new_department_id or ROLLUP_NO_DEPARTMENT)] = totals
+    apply_rollup_deltas(deltas)
+
+def compute_summary_shard(shard, year, month, total_workdays, finalized_at, finalized_by):
+    """Build finalized MonthlySummary rows for one shard of employees (process-pool worker)"""
+    rows = []
+    for employee_id, base_salary, totals in shard:
+        row = dict(totals, employee_id=employee_id, year=year, month=month,
+                   is_finalized=True, finalized_at=finalized_at, finalized_by=finalized_by)
+        row.update(summary_financials(totals, base_salary, total_workdays))
+        rows.append(row)
+    return rows
+
+def finalize_month(year, month, performed_by, workers=1):
+    """
+    Compute and finalize MonthlySummary for every active employee in one transaction
+    Month data is bulk-loaded with a single grouped query; with workers > 1 (the
+    CLI) the summary maths is sharded across a process pool for large headcounts.
+    Web requests stay serial so a request never forks worker processes
+    Returns a dict with finalized/skipped counts, elapsed seconds and throughput
+    """
+    started = datetime.now()
+    finalized_ids = db.session.query(MonthlySummary.employee_id).filter_by(
+        year=year, month=month, is_finalized=True
+    )
+    
+    # Cheap no-op when every active employee is already finalized
+    pending = Employee.query.filter(
+        Employee.is_active == True, ~Employee.id.in_(finalized_ids)
+    ).count()
+    already_finalized = finalized_ids.count()
+    if not pending:
+        return {'finalized': 0, 'already_finalized': already_finalized,
+                'elapsed_seconds': 0.0, 'employees_per_second': 0.0}
+    
+    aggregate = month_aggregate_subquery(year, month)
+    metrics = month_metric_columns(aggregate)
+    employee_totals = [
+        (row.id, row.base_salary, {field: getattr(row, field) for field in SUMMARY_TOTAL_FIELDS})
+        for row in active_employee_month_query(
+            aggregate, Employee.id, Employee.base_salary,
+            *[metrics[field] for field in SUMMARY_TOTAL_FIELDS]
+        ).filter(~Employee.id.in_(finalized_ids))
+    ]
+    
+    total_workdays = working_day_count(year, month)
+    finalized_at = datetime.utcnow()
+    shard_args = (year, month, total_workdays, finalized_at, performed_by)
+    
+    if workers > 1 and len(employee_totals) >= FINALIZE_PARALLEL_THRESHOLD:
+        shard_size = -(-len(employee_totals) // workers)
+        shards = [employee_totals[i:i + shard_size] for i in range(0, len(employee_totals), shard_size)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(compute_summary_shard, shard, *shard_args) for shard in shards]
+            rows = [row for future in futures for row in future.result()]
+    else:
+        rows = compute_summary_shard(employee_totals, *shard_args)
+    
+    key_columns = ('employee_id', 'year', 'month')
+    upsert_rows(MonthlySummary, rows, key_columns,
+                update_columns=[column for column in rows[0] if column not in key_columns])
+    db.session.commit()
+    
+    elapsed = max((datetime.now() - started).total_seconds(), 1e-9)
+    return {
+        'finalized': len(rows),
+        'already_finalized': already_finalized,
+        'elapsed_seconds': round(elapsed, 3),
+        'employees_per_second': round(len(rows) / elapsed, 1)
+    }
+
+def get_monthly_summary(employee_id, year, month):
+    """
+    Month-to-date summary via a single unique-key lookup
+    A month without a stored summary is computed in memory (never added to the
+    session): reads may run on the replica, and only the write path persists summaries
+    """
     summary = MonthlySummary.query.filter_by(
         employee_id=employee_id, year=year, month=month
     ).first()
     
-    if not summary:
-        summary = MonthlySummary(employee_id=employee_id, year=year, month=month)
-    
-    # Update all metrics
-    summary.total_workdays = len(working_days)
-    summary.total_points = total_points
-    summary.avg_efficiency = avg_efficiency
-    summary.total_hours = total_hours
-    summary.task_failures = task_failures
-    summary.leave_days = leave_days
-    summary.overtime_days = overtime_days
-    summary.base_salary = employee.base_salary
-    summary.bonus_rate = bonus_rate_per_point
-    summary.calculated_bonus = calculated_bonus
-    summary.final_bonus = final_bonus
-    summary.total_compensation = total_compensation
+    if summary is None:
+        summary = calculate_monthly_compensation(employee_id, year, month)
     
     return summary
 
+def find_summary_drift(year, month, fix=False):
+    """
+    Compare open MonthlySummary totals with a full recompute of the month
+    Finalized summaries are the closed record of the month and are never rewritten
+    Returns (employee_id, field, stored, actual) tuples for every mismatch
+    """
+    aggregate = month_aggregate_subquery(year, month)
+    actual_totals = {
+        row.employee_id: row
+        for row in db.session.query(aggregate).all()
+    }
+    summaries = MonthlySummary.query.options(
+        db.joinedload(MonthlySummary.employee)
+    ).filter_by(year=year, month=month, is_finalized=False).all()
+    
+    drift = []
+    for summary in summaries:
+        actual = actual_totals.get(summary.employee_id)
+        mismatched = False
+        for field in SUMMARY_TOTAL_FIELDS:
+            stored_value = getattr(summary, field) or 0
+            actual_value = (getattr(actual, field) or 0) if actual else 0
+            if abs(stored_value - actual_value) > SUMMARY_DRIFT_TOLERANCE:
+                drift.append((summary.employee_id, field, stored_value, actual_value))
+                mismatched = True
+                if fix:
+                    setattr(summary, field, actual_value)
+        
+        if fix and mismatched:
+            update_summary_financials(summary, summary.employee)
+    
+    if fix:
+        db.session.commit()
+    
+    return drift
+
+def backfill_monthly_summaries():
+    """
+    Store a MonthlySummary for every employee month that has daily rows but no summary
+    Totals come from the same month aggregate as a full recompute; the caller commits.
+    Returns the number of summaries created
+    """
+    year = db.extract('year', DailyPerformance.date)
+    month = db.extract('month', DailyPerformance.date)
+    missing = db.session.query(DailyPerformance.employee_id, year, month).outerjoin(
+        MonthlySummary, db.and_(
+            MonthlySummary.employee_id == DailyPerformance.employee_id,
+            MonthlySummary.year == year,
+            MonthlySummary.month == month
+        )
+    ).filter(MonthlySummary.id == None).distinct()
+    
+    periods = {}
+    for employee_id, summary_year, summary_month in missing:
+        periods.setdefault((int(summary_year), int(summary_month)), set()).add(employee_id)
+    
+    created = 0
+    for (summary_year, summary_month), employee_ids in sorted(periods.items()):
+        employees = {employee.id: employee for employee in Employee.query.filter(Employee.id.in_(employee_ids))}
+        aggregate = month_aggregate_subquery(summary_year, summary_month)
+        for totals in db.session.query(aggregate).filter(aggregate.c.employee_id.in_(employees)):
+            summary = MonthlySummary(
+                employee_id=totals.employee_id, year=summary_year, month=summary_month,
+                **{field: getattr(totals, field) or 0 for field in SUMMARY_TOTAL_FIELDS}
+            )
+            db.session.add(update_summary_financials(summary, employees[totals.employee_id]))
+            created += 1
+    return created
+
+# Workbook Import
+def employee_sheet_index():
+    """Map tracker sheet names (without the suffix) to employee ids, by code and by exported name"""
+    index = {}
+    for employee_id, code, name in db.session.query(Employee.id, Employee.employee_id, Employee.name):
+        index.setdefault(code.lower(), set()).add(employee_id)
+        base = sheet_title(name, code, set())[:-len(SHEET_SUFFIX)]
+        index.setdefault(base.lower(), set()).add(employee_id)
+    return index
+
+def import_tracker_workbook(parsed, sheet_index, performed_by, dry_run=False):
+    """
+    Validate and upsert the parsed sheets of one workbook, one transaction per sheet
+    Returns the per-file report: sheets, imported rows and (sheet, row, error) entries
+    """
+    report = {'file': parsed['file'], 'sheets': 0, 'imported': 0, 'errors': []}
+    if parsed['error']:
+        report['errors'].append(('', '', parsed['error']))
+        return report
+    
+    for sheet in parsed['sheets']:
+        report['sheets'] += 1
+        report['errors'].extend((sheet['title'], row, error) for row, error in sheet['errors'])
+        
+        matches = sheet_index.get(sheet['employee_key'].lower(), set())
+        if len(matches) != 1:
+            problem = 'matches several employees' if matches else 'does not match any employee'
+            report['errors'].append((sheet['title'], '', f'Sheet name {problem}'))
+            continue
+        employee_id = next(iter(matches))
+        
+        # Same validation as the performance APIs; the last row wins for a repeated date
+        valid = {}
+        for record in sheet['records']:
+            try:
+                values = validate_performance_record(dict(record, employee_id=employee_id))
+            except (TypeError, ValueError) as e:
+                report['errors'].append((sheet['title'], record['row'], str(e)))
+                continue
+            valid[values['date']] = values
+        
+        if not valid or dry_run:
+            report['imported'] += len(valid)
+            continue
+        
+        try:
+            rows = score_performance_rows(list(valid.values()))
+            departments = write_performance_rows(rows, performed_by)
+            db.session.commit()
+            invalidate_performance_cache(rows, departments)
+            publish_batch_event(rows)
+            report['imported'] += len(valid)
+        except MonthFinalizedError as e:
+            db.session.rollback()
+            report['errors'].append((sheet['title'], '', f'Not imported: {e}'))
+        except Exception as e:
+            db.session.rollback()
+            report['errors'].append((sheet['title'], '', f'Database write failed: {e}'))
+    
+    return report
+
+# Month Aggregation Layer
+def month_aggregate_subquery(year, month, employee_id=None):
+    """
+    Per-employee month totals computed in a single grouped query
+    Returns a subquery with one row per employee that has performance data
+    """
+    on_leave = DailyPerformance.leave_taken == True
+    worked = DailyPerformance.leave_taken == False
+    
+    query = db.session.query(
+        DailyPerformance.employee_id.label('employee_id'),
+        db.func.sum(DailyPerformance.approved_points).label('total_points'),
+        db.func.sum(DailyPerformance.completed_hrs).label('total_hours'),
+        db.func.count(DailyPerformance.id).label('recorded_days'),
+        db.func.sum(db.case((worked, 1), else_=0)).label('work_days'),
+        db.func.sum(db.case((worked, DailyPerformance.efficiency), else_=0)).label('efficiency_sum'),
+        db.func.sum(db.case((DailyPerformance.task_failed == True, 1), else_=0)).label('task_failures'),
+        db.func.sum(db.case((on_leave, 1), else_=0)).label('leave_days'),
+        db.func.sum(db.case((DailyPerformance.ot_points > 0, 1), else_=0)).label('overtime_days')
+    ).filter(in_month(year, month))
+    
+    if employee_id is not None:
+        query = query.filter(DailyPerformance.employee_id == employee_id)
+    
+    return query.group_by(DailyPerformance.employee_id).subquery()
+
+def month_metric_columns(aggregate):
+    """Zero-filled metric columns of a month aggregate, keyed by name"""
+    return {
+        column.name: db.func.coalesce(column, 0).label(column.name)
+        for column in aggregate.c if column.name != 'employee_id'
+    }
+
+def active_employee_month_query(aggregate, *columns):
+    """Query over all active employees outer-joined to their month aggregate"""
+    return db.session.query(*columns).select_from(Employee).outerjoin(
+        aggregate, aggregate.c.employee_id == Employee.id
+    ).filter(Employee.is_active == True)
+
+def average_points_expression(metrics):
+    """SQL expression for average approved points per worked day"""
+    return db.case(
+        (metrics['work_days'] > 0, metrics['total_points'] * 1.0 / metrics['work_days']),
+        else_=0.0
+    )
+
+def projected_bonus_expression(metrics, max_possible_points):
+    """SQL expression mirroring the capped bonus projection of the dashboard"""
+    if max_possible_points <= 0:
+        return db.literal(0.0)
+    return Employee.base_salary * 0.5 * db.case(
+        (metrics['total_points'] >= max_possible_points, 1.0),
+        else_=metrics['total_points'] * 1.0 / max_possible_points
+    )
+
+def performance_grade_expression(avg_points):
+    """SQL CASE expression yielding the grade letter of get_performance_grade"""
+    return db.case(
+        *[(avg_points >= threshold, grade['grade']) for threshold, grade in PERFORMANCE_GRADES],
+        else_=LOWEST_PERFORMANCE_GRADE['grade']
+    )
+
+def build_month_metrics(employee, row, max_possible_points):
+    """Convert an aggregated month row into the dashboard metric structure"""
+    work_days = row.work_days
+    total_points = row.total_points
+    
+    max_bonus = employee.base_salary * 0.5
+    if max_possible_points > 0:
+        projected_bonus = min(total_points * max_bonus / max_possible_points, max_bonus)
+    else:
+        projected_bonus = 0
+    
+    avg_points_per_day = total_points / work_days if work_days > 0 else 0
+    avg_efficiency = row.efficiency_sum / work_days if work_days > 0 else 0
+    
+    return {
+        'employee': employee,
+        'total_points': total_points,
+        'total_hours': row.total_hours,
+        'work_days': work_days,
+        'avg_points_per_day': avg_points_per_day,
+        'avg_efficiency': avg_efficiency,
+        'projected_bonus': projected_bonus,
+        'performance_grade': get_performance_grade(avg_points_per_day)
+    }
+
+# Trend Aggregation
+def week_start(day):
+    """Monday of the week containing day"""
+    return day - timedelta(days=day.weekday())
+
+def months_between(start, end):
+    """(year, month) pairs from start's month through end's month"""
+    months = []
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+def week_bucket(column, starts):
+    """CASE expression numbering the week of a date column among ascending week starts"""
+    # Newest week first, so each row lands in the latest bucket it qualifies for
+    return db.case(
+        *[(column >= start, index) for index, start in reversed(list(enumerate(starts)))]
+    ).label('week')
+
+def weekly_trends(weeks, end=None, department=None, employee_id=None):
+    """
+    Monday-aligned weekly AVG/SUM/COUNT in one grouped query
+    Company and department trends read DailyRollup (one row per day and department);
+    employee trends read DailyPerformance. Returns `weeks` buckets, oldest first,
+    the last one being the (partial) week containing `end`; weeks without records
+    have records == 0 and zero figures
+    """
+    end = end or date.today()
+    starts = [week_start(end) - timedelta(weeks=weeks - 1 - index) for index in range(weeks)]
+    
+    if employee_id is None:
+        rows = rollup_weekly_rows(starts, end, department)
+    else:
+        rows = performance_weekly_rows(starts, end, employee_id)
+    return [
+        dict(
+            {field: rows.get(index, {}).get(field) or 0 for field in TREND_FIELDS},
+            week_start=start,
+            week_end=min(start + timedelta(days=6), end)
+        )
+        for index, start in enumerate(starts)
+    ]
+
+def rollup_weekly_rows(starts, end, department=None):
+    """Weekly trend figures from DailyRollup, keyed by week index"""
+    week = week_bucket(DailyRollup.date, starts)
+    records = db.func.sum(DailyRollup.recorded_days)
+    query = db.session.query(
+        week,
+        records.label('records'),
+        db.func.sum(DailyRollup.total_points).label('total_points'),
+        (db.func.sum(DailyRollup.total_points) * 1.0 / db.func.nullif(records, 0)).label('avg_points'),
+        (db.func.sum(DailyRollup.efficiency_sum) * 1.0 / db.func.nullif(records, 0)).label('avg_efficiency'),
+        db.func.sum(DailyRollup.total_hours).label('total_hours'),
+        db.func.sum(DailyRollup.leave_days).label('leave_days')
+    ).filter(DailyRollup.date >= starts[0], DailyRollup.date <= end)
+    
+    if department:
+        query = query.filter(department_filter(department, DailyRollup.department_id))
+    
+    return {row.week: row._asdict() for row in query.group_by(week)}
+
+def performance_weekly_rows(starts, end, employee_id):
+    """Weekly trend figures of one employee from DailyPerformance, keyed by week index"""
+    week = week_bucket(DailyPerformance.date, starts)
+    query = db.session.query(
+        week,
+        db.func.count(DailyPerformance.id).label('records'),
+        db.func.sum(DailyPerformance.approved_points).label('total_points'),
+        db.func.avg(DailyPerformance.approved_points).label('avg_points'),
+        db.func.avg(DailyPerformance.efficiency).label('avg_efficiency'),
+        db.func.sum(DailyPerformance.completed_hrs).label('total_hours'),
+        db.func.sum(db.case((DailyPerformance.leave_taken == True, 1), else_=0)).label('leave_days')
+    ).filter(
+        DailyPerformance.employee_id == employee_id,
+        DailyPerformance.date >= starts[0],
+        DailyPerformance.date <= end
+    )
+    return {row.week: row._asdict() for row in query.group_by(week)}
+
+def department_rollups(start, end, department=None, subteam=None):
+    """
+    Per-department (or, within one department, per sub-team) employee count and
+    average points/efficiency over [start, end] in one join/group-by
+    Only groups with active employees are returned
+    """
+    if subteam:
+        group = db.func.coalesce(db.func.nullif(getattr(Employee, SUBTEAM_COLUMNS[subteam]), ''), 'Unassigned')
+        group_columns = [group.label('name')]
+    else:
+        group_columns = [Department.id, Department.name.label('name')]
+    
+    query = db.session.query(
+        *group_columns,
+        db.func.count(db.distinct(Employee.id)).label('employee_count'),
+        db.func.count(DailyPerformance.id).label('records'),
+        db.func.avg(DailyPerformance.approved_points).label('avg_points'),
+        db.func.avg(DailyPerformance.efficiency).label('avg_efficiency')
+    ).select_from(Department).join(
+        Employee, db.and_(Employee.department_id == Department.id, Employee.is_active == True)
+    ).outerjoin(
+        DailyPerformance, db.and_(
+            DailyPerformance.employee_id == Employee.id,
+            DailyPerformance.date >= start,
+            DailyPerformance.date <= end
+        )
+    )
+    if department:
+        query = query.filter(department_filter(department))
+    
+    return query.group_by(*group_columns).order_by(*group_columns).all()
+
+def performance_histogram(year, month, edges):
+    """
+    Active employees bucketed by their average points per worked day, in one query
+    edges are ascending lower bounds of buckets 1..n (bucket 0 is below edges[0]);
+    returns (counts per bucket, employees without worked days)
+    """
+    averages = db.session.query(
+        DailyPerformance.employee_id.label('employee_id'),
+        db.func.avg(DailyPerformance.approved_points).label('avg_points')
+    ).filter(
+        in_month(year, month), DailyPerformance.leave_taken == False
+    ).group_by(DailyPerformance.employee_id).subquery()
+    
+    bucket = db.case(
+        (averages.c.avg_points == None, -1),
+        *[(averages.c.avg_points >= edge, index) for index, edge in reversed(list(enumerate(edges, 1)))],
+        else_=0
+    ).label('bucket')
+    rows = dict(
+        db.session.query(bucket, db.func.count(Employee.id)).select_from(Employee).outerjoin(
+            averages, averages.c.employee_id == Employee.id
+        ).filter(Employee.is_active == True).group_by(bucket).all()
+    )
+    return [rows.get(index, 0) for index in range(len(edges) + 1)], rows.get(-1, 0)
+
+def trend_bucket_starts(start, end, bucket):
+    """First day of every day/week/month bucket overlapping [start, end]"""
+    if bucket == 'day':
+        return [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+    if bucket == 'week':
+        first = week_start(start)
+        return [first + timedelta(weeks=offset) for offset in range((end - first).days // 7 + 1)]
+    return [date(year, month, 1) for year, month in months_between(start, end)]
+
+def employee_trend(employee_id, start, end, bucket):
+    """
+    Approved points of one employee over [start, end], one value per bucket
+    Days are filled from a date-indexed lookup (0 when nothing was recorded);
+    weeks and months hold the average points per recorded day
+    """
+    points = dict(db.session.query(DailyPerformance.date, DailyPerformance.approved_points).filter(
+        DailyPerformance.employee_id == employee_id,
+        DailyPerformance.date >= start,
+        DailyPerformance.date <= end
+    ))
+    starts = trend_bucket_starts(start, end, bucket)
+    if bucket == 'day':
+        return starts, [points.get(day, 0) for day in starts], [int(day in points) for day in starts]
+    
+    totals = {bucket_start: [0, 0] for bucket_start in starts}
+    for day, approved_points in points.items():
+        bucket_start = week_start(day) if bucket == 'week' else day.replace(day=1)
+        totals[bucket_start][0] += approved_points or 0
+        totals[bucket_start][1] += 1
+    values = [round(total / records, 2) if records else 0 for total, records in totals.values()]
+    return starts, values, [records for _, records in totals.values()]
+
+# Employee Directory
+def employee_directory_query(filters):
+    """Employees matching the directory filters, with departments eager-loaded"""
+    query = Employee.query.options(db.selectinload(Employee.department))
+    if filters['department']:
+        query = query.filter(department_filter(filters['department']))
+    if filters['status'] != 'all':
+        query = query.filter(Employee.is_active == (filters['status'] == 'active'))
+    if filters['type']:
+        query = query.filter(Employee.employment_type == filters['type'])
+    if filters['q']:
+        # q is matched literally: LIKE wildcards in it are escaped
+        literal = filters['q'].replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        pattern = f"%{literal}%"
+        query = query.filter(db.or_(*[
+            column.ilike(pattern, escape='\\')
+            for column in (Employee.name, Employee.email, Employee.designation, Employee.employee_id)
+        ]))
+    return query
+
+def employee_cursor(sort, employee):
+    """Opaque keyset cursor holding the sort key of the last employee on a page"""
+    key = [employee.name, employee.id] if sort == 'name' else [employee.id]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode().rstrip('=')
+
+def parse_employee_cursor(sort, cursor):
+    """Sort key of a cursor made by employee_cursor for the same sort; ValueError when it is not one"""
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except ValueError:
+        raise ValueError('after is not a valid cursor')
+    types = (str, int) if sort == 'name' else (int,)
+    if (not isinstance(key, list) or len(key) != len(types)
+            or not all(type(value) is expected for value, expected in zip(key, types))):
+        raise ValueError(f'after is not a cursor for sort={sort}')
+    return key
+
+def employee_page(filters):
+    """
+    One keyset page of the directory, ordered by id or by (name, id)
+    filters['after_key'] is the sort key of the last employee on the previous page, so
+    deleted or renamed rows cannot restart or shift the paging; returns
+    (employees, cursor to continue after or None on the last page)
+    """
+    query = employee_directory_query(filters)
+    after = filters['after_key']
+    if filters['sort'] == 'name':
+        if after is not None:
+            last_name, last_id = after
+            query = query.filter(db.or_(
+                Employee.name > last_name, db.and_(Employee.name == last_name, Employee.id > last_id)
+            ))
+        query = query.order_by(Employee.name, Employee.id)
+    else:
+        if after is not None:
+            query = query.filter(Employee.id > after[0])
+        query = query.order_by(Employee.id)
+    
+    employees = query.limit(filters['limit'] + 1).all()
+    if len(employees) > filters['limit']:
+        employees = employees[:filters['limit']]
+        return employees, employee_cursor(filters['sort'], employees[-1])
+    return employees, None
+
+def employee_directory_stats():
+    """
+    Headcount, payroll, department and salary-band figures of the whole directory in two
+    queries, cached until an employee changes (department_counts is keyed by str(id))
+    """
+    return response_cache.cached_value('employee_directory_stats', [(None, None, None)],
+                                       compute_employee_directory_stats)
+
+def compute_employee_directory_stats():
+    band_columns = []
+    for _, _, lower, upper in SALARY_BANDS:
+        criteria = [Employee.base_salary >= lower] if lower is not None else []
+        criteria += [Employee.base_salary < upper] if upper is not None else []
+        band_columns.append(db.func.sum(db.case((db.and_(*criteria), 1), else_=0)))
+    
+    total, active, payroll, unassigned, *bands = db.session.query(
+        db.func.count(Employee.id),
+        db.func.sum(db.case((Employee.is_active == True, 1), else_=0)),
+        db.func.sum(Employee.base_salary),
+        db.func.sum(db.case((Employee.department_id == None, 1), else_=0)),
+        *band_columns
+    ).one()
+    department_counts = {
+        str(department_id): count
+        for department_id, count in db.session.query(Employee.department_id, db.func.count(Employee.id)).filter(
+            Employee.department_id != None
+        ).group_by(Employee.department_id)
+    }
+    
+    return {
+        'total': total,
+        'active': active or 0,
+        'payroll': payroll or 0,
+        'unassigned': unassigned or 0,
+        'department_counts': department_counts,
+        'salary_bands': [(level, label, count or 0) for (level, label, _, _), count in zip(SALARY_BANDS, bands)],
+        'employment_types': [value for (value,) in db.session.query(Employee.employment_type).filter(
+            Employee.employment_type != None
+        ).distinct().order_by(Employee.employment_type)]
+    }
+
+def employee_result(employee):
+    """API representation of one directory entry"""
+    return {
+        'id': employee.id,
+        'employee_code': employee.employee_id,
+        'name': employee.name,
+        'email': employee.email,
+        'designation': employee.designation,
+        'department_id': employee.department_id,
+        'department': employee.department.name if employee.department else None,
+        'reporting_manager': employee.reporting_manager,
+        'employment_type': employee.employment_type,
+        'base_salary': employee.base_salary,
+        'join_date': employee.join_date.isoformat(),
+        'is_active': employee.is_active
+    }
+
+def parse_employee_directory_params():
+    """Sort, keyset cursor, page size and filters of a directory request"""
+    sort = request.args.get('sort', 'id')
+    if sort not in EMPLOYEE_SORT_KEYS:
+        raise ValueError(f"sort must be one of {', '.join(EMPLOYEE_SORT_KEYS)}")
+    status = request.args.get('status', 'all')
+    if status not in EMPLOYEE_STATUSES:
+        raise ValueError(f"status must be one of {', '.join(EMPLOYEE_STATUSES)}")
+    after = request.args.get('after') or None
+    return {
+        'sort': sort,
+        'after': after,
+        'after_key': parse_employee_cursor(sort, after) if after else None,
+        'limit': max(1, min(EMPLOYEE_PAGE_MAX_SIZE, int(request.args.get('limit', EMPLOYEE_PAGE_DEFAULT_SIZE)))),
+        'department': request.args.get('department') or None,
+        'status': status,
+        'type': request.args.get('type') or None,
+        'q': request.args.get('q', '').strip() or None
+    }
+
+# Response Cache Scopes
+def department_scope(value):
+    """Department id for a department id-or-name parameter (None means every department)"""
+    if not value:
+        return None
+    if value.isdigit():
+        return int(value)
+    department_id = db.session.query(Department.id).filter(Department.name == value).scalar()
+    return value if department_id is None else department_id
+
+def leaderboard_cache_scopes():
+    year, month = parse_month_param(request.args.get('month'))
+    return [(year, month, department_scope(request.args.get('department')))]
+
+def current_month_cache_scopes():
+    today = date.today()
+    return [(today.year, today.month, None)]
+
+def distribution_cache_scopes():
+    year, month = parse_month_param(request.args.get('month'))
+    return [(year, month, None)]
+
+def employee_trend_cache_scopes(employee_id):
+    start, end, _ = parse_employee_trend_params()
+    department_id = db.session.query(Employee.department_id).filter(Employee.id == employee_id).scalar()
+    return [(year, month, department_id) for year, month in months_between(start, end)]
+
+def dashboard_metrics_cache_scopes():
+    today = date.today()
+    return [(year, month, None) for year, month in months_between(week_start(today) - timedelta(weeks=4), today)]
+
+def department_performance_cache_scopes():
+    start, end, department, _ = parse_department_params()
+    return [(year, month, department_scope(department)) for year, month in months_between(start, end)]
+
+def trends_cache_scopes():
+    weeks, end, department, employee_id = parse_trend_params()
+    if employee_id is not None:
+        department = db.session.query(Employee.department_id).filter(Employee.id == employee_id).scalar()
+    else:
+        department = department_scope(department)
+    start = week_start(end) - timedelta(weeks=weeks - 1)
+    return [(year, month, department) for year, month in months_between(start, end)]
+
 # API Routes
+@app.after_request
+def remember_client_writes(response):
+    """Successful writes keep the client on the primary database for the read-your-writes window"""
+    if request.method in ('POST', 'PUT', 'PATCH', 'DELETE') and response.status_code < 400:
+        database_config.remember_write()
+    return response
+
 @app.route('/')
 def dashboard():
     """Enterprise Dashboard - Executive Overview"""
     current_date = datetime.now()
-    employees = Employee.query.filter_by(is_active=True).all()
     departments = Department.query.all()
     
-    # Calculate comprehensive metrics
-    dashboard_metrics = []
-    total_company_points = 0
-    total_company_hours = 0
-    total_company_bonus = 0
-    
-    for emp in employees:
-        performances = DailyPerformance.query.filter_by(employee_id=emp.id).filter(
-            db.extract('year', DailyPerformance.date) == current_date.year,
-            db.extract('month', DailyPerformance.date) == current_date.month
-        ).all()
-        
-        total_points = sum(p.approved_points for p in performances)
-        total_hours = sum(p.completed_hrs for p in performances)
-        work_days = len([p for p in performances if not p.leave_taken])
-        
-        # Calculate current month bonus projection
-        working_days = get_working_days(current_date.year, current_date.month)
-        max_bonus = emp.base_salary * 0.5
-        if working_days:
-            bonus_rate = max_bonus / (len(working_days) * 10)
-            projected_bonus = min(total_points * bonus_rate, max_bonus)
-        else:
-            projected_bonus = 0
-        
-        avg_points_per_day = total_points / work_days if work_days > 0 else 0
-        avg_efficiency = sum(p.efficiency for p in performances if not p.leave_taken) / work_days if work_days > 0 else 0
-        
-        dashboard_metrics.append({
-            'employee': emp,
-            'total_points': total_points,
-            'total_hours': total_hours,
-            'work_days': work_days,
-            'avg_points_per_day': avg_points_per_day,
-            'avg_efficiency': avg_efficiency,
-            'projected_bonus': projected_bonus,
-            'performance_grade': get_performance_grade(avg_points_per_day)
-        })
-        
-        total_company_points += total_points
-        total_company_hours += total_hours
-        total_company_bonus += projected_bonus
-    
-    # Sort by performance for leaderboard
-    dashboard_metrics.sort(key=lambda x: x['total_points'], reverse=True)
+    max_possible_points = working_day_count(current_date.year, current_date.month) * 10
+    
+    aggregate = month_aggregate_subquery(current_date.year, current_date.month)
+    metrics = month_metric_columns(aggregate)
+    
+    # Server-side top-N leaderboard
+    leaderboard_rows = active_employee_month_query(
+        aggregate, Employee, *metrics.values()
+    ).options(
+        db.joinedload(Employee.department)
+    ).order_by(
+        metrics['total_points'].desc(), Employee.id
+    ).limit(DASHBOARD_LEADERBOARD_SIZE).all()
+    
+    dashboard_metrics = [
+        build_month_metrics(row.Employee, row, max_possible_points)
+        for row in leaderboard_rows
+    ]
+    
+    # Company-wide totals over every active employee
+    total_employees, total_points, total_hours, total_bonus = active_employee_month_query(
+        aggregate,
+        db.func.count(Employee.id),
+        db.func.coalesce(db.func.sum(metrics['total_points']), 0),
+        db.func.coalesce(db.func.sum(metrics['total_hours']), 0),
+        db.func.coalesce(db.func.sum(projected_bonus_expression(metrics, max_possible_points)), 0)
+    ).one()
+    
+    grade = performance_grade_expression(average_points_expression(metrics))
+    grade_counts = dict(
+        active_employee_month_query(aggregate, grade, db.func.count(Employee.id)).group_by(grade).all()
+    )
     
     company_stats = {
-        'total_employees': len(employees),
-        'total_points': total_company_points,
-        'total_hours': total_company_hours,
-        'total_projected_bonus': total_company_bonus,
-        'avg_points_per_employee': total_company_points / len(employees) if employees else 0
+        'total_employees': total_employees,
+        'total_points': total_points,
+        'total_hours': total_hours,
+        'total_projected_bonus': total_bonus,
+        'avg_points_per_employee': total_points / total_employees if total_employees else 0
     }
     
     return render_template('dashboard.html',
-                         employees=employees,
                          departments=departments,
                          dashboard_metrics=dashboard_metrics,
+                         grade_counts=grade_counts,
                          company_stats=company_stats,
                          current_month=calendar.month_name[current_date.month],
-                         current_year=current_date.year)
+                         current_month_number=current_date.month,
+                         current_year=current_date.year,
+                         leaderboard_size=DASHBOARD_LEADERBOARD_SIZE)
 
 def get_performance_grade(avg_points):
     """Convert average points to performance grade"""
-    if avg_points >= 12:
-        return {'grade': 'A+', 'class': 'success', 'desc': 'Exceptional'}
-    elif avg_points >= 10:
-        return {'grade': 'A', 'class': 'success', 'desc': 'Excellent'}
-    elif avg_points >= 8:
-        return {'grade': 'B+', 'class': 'primary', 'desc': 'Very Good'}
-    elif avg_points >= 7:
-        return {'grade': 'B', 'class': 'info', 'desc': 'Good'}
-    elif avg_points >= 5:
-        return {'grade': 'C', 'class': 'warning', 'desc': 'Satisfactory'}
-    else:
-        return {'grade': 'D', 'class': 'danger', 'desc': 'Needs Improvement'}
+    for threshold, grade in PERFORMANCE_GRADES:
+        if avg_points >= threshold:
+            return dict(grade)
+    return dict(LOWEST_PERFORMANCE_GRADE)
 
 @app.route('/employees')
 def employees():
-    """Employee Management Hub"""
-    employees = Employee.query.all()
-    departments = Department.query.all()
-    return render_template('employees.html', employees=employees, departments=departments)
+    """Employee Management Hub (one keyset page of the directory; figures from aggregate queries)"""
+    try:
+        filters = parse_employee_directory_params()
+    except ValueError as e:
+        abort(400, description=f'Invalid parameter: {e}')
+    
+    employees, next_after = employee_page(filters)
+    departments = Department.query.order_by(Department.name).all()
+    stats = employee_directory_stats()
+    return render_template('employees.html', employees=employees, departments=departments,
+                           stats=stats, filters=filters, next_after=next_after,
+                           employment_types=stats['employment_types'])
+
+@app.route('/api/employees')
+def list_employees():
+    """
+    Employee directory API with keyset pagination
+    ?sort=id|name&after=<next_after of the previous page>&limit=N plus
+    department (id or name), status (all|active|inactive), type and q filters
+    """
+    try:
+        filters = parse_employee_directory_params()
+    except ValueError as e:
+        return jsonify({'success': False, 'error': f'Invalid parameter: {e}'}), 400
+    
+    employees, next_after = employee_page(filters)
+    response = jsonify({
+        'employees': [employee_result(employee) for employee in employees],
+        'next_after': next_after
+    })
+    response.headers['X-Total-Count'] = str(employee_directory_query(filters).order_by(None).count())
+    return response
 
 @app.route('/add_employee', methods=['GET', 'POST'])
 def add_employee():
@@ -367,6 +1514,7 @@ def add_employee():
         
         db.session.add(employee)
         db.session.commit()
+        response_cache.invalidate([(None, None, employee.department_id)])
         
         return jsonify({
             'success': True, 
@@ -386,15 +1534,14 @@ def employee_performance(employee_id):
     
     # Get current month performance data
     performances = DailyPerformance.query.filter_by(employee_id=employee_id).filter(
-        db.extract('year', DailyPerformance.date) == current_date.year,
-        db.extract('month', DailyPerformance.date) == current_date.month
+        in_month(current_date.year, current_date.month)
     ).order_by(DailyPerformance.date).all()
     
     working_days = get_working_days(current_date.year, current_date.month)
     performance_map = {p.date: p for p in performances}
     
-    # Calculate month-to-date metrics
-    mtd_summary = calculate_monthly_compensation(employee_id, current_date.year, current_date.month)
+    # Month-to-date metrics from the incrementally maintained summary
+    mtd_summary = get_monthly_summary(employee_id, current_date.year, current_date.month)
     
     return render_template('performance.html',
                          employee=employee,
@@ -411,120 +1558,293 @@ def save_performance_data():
         data = request.json
         
         # Validate input data
-        required_fields = ['employee_id', 'date', 'completed_hrs']
-        for field in required_fields:
+        for field in PERFORMANCE_REQUIRED_FIELDS:
             if field not in data:
                 return jsonify({'success': False, 'error': f'Missing required field: {field}'}), 400
         
-        # Get or create performance record
-        performance = DailyPerformance.query.filter_by(
-            employee_id=data['employee_id'],
-            date=datetime.strptime(data['date'], '%Y-%m-%d').date()
-        ).first()
-        
-        if not performance:
-            performance = DailyPerformance(
-                employee_id=data['employee_id'],
-                date=datetime.strptime(data['date'], '%Y-%m-%d').date()
-            )
-        
-        # Update performance data with validation
-        performance.meeting_hrs = max(0, min(9, float(data.get('meeting_hrs', 0))))
-        performance.assigned_hrs = max(1, min(12, float(data.get('assigned_hrs', 9))))
-        performance.completed_hrs = max(0, min(16, float(data.get('completed_hrs', 0))))
-        performance.complexity_factor = max(0.5, min(3.0, float(data.get('complexity_factor', 1.0))))
-        performance.qa_factor = max(0.3, min(2.0, float(data.get('qa_factor', 1.0))))
-        performance.task_failed = bool(data.get('task_failed', False))
-        performance.leave_taken = bool(data.get('leave_taken', False))
-        performance.updated_by = "System Admin"  # In real app, this would be current user
+        values = clean_performance_input(data)
+        if not known_employee_ids({values['employee_id']}):
+            return jsonify({'success': False, 'error': f"Unknown employee: {values['employee_id']}"}), 404
         
         # Calculate all derived metrics
-        performance = calculate_performance_metrics(performance)
-        
-        # Save to database
-        db.session.add(performance)
-        db.session.commit()
+        performance = score_performance_rows([values])[0]
         
-        # Create audit log
-        audit = PerformanceAudit(
-            employee_id=performance.employee_id,
-            action="Performance Updated",
-            new_values=json.dumps({
-                'date': data['date'],
-                'completed_hrs': performance.completed_hrs,
-                'approved_points': performance.approved_points
-            }),
-            performed_by="System Admin"
-        )
-        db.session.add(audit)
+        # Native upsert, summary delta and audit log in one transaction
+        departments = write_performance_rows([performance], performed_by="System Admin")  # In real app, this would be current user
         db.session.commit()
+        invalidate_performance_cache([performance], departments)
+        publish_performance_event(performance)
         
         return jsonify({
             'success': True,
-            'data': {
-                'approved_points': performance.approved_points,
-                'efficiency': round(performance.efficiency * 100, 1),
-                'available_hrs': performance.available_hrs,
-                'raw_points': performance.raw_points,
-                'ot_points': performance.ot_points
-            },
+            'data': performance_result(performance),
             'message': 'Performance data saved successfully'
         })
         
+    except MonthFinalizedError as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 409
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/performance/bulk', methods=['POST'])
+def save_performance_bulk():
+    """Bulk Performance Ingestion API (one upsert and one audit batch per request)"""
+    data = request.json
+    records = data.get('records') if isinstance(data, dict) else data
+    
+    if not isinstance(records, list) or not records:
+        return jsonify({'success': False, 'error': 'Expected a non-empty list of records'}), 400
+    if len(records) > BULK_PERFORMANCE_MAX_ROWS:
+        return jsonify({
+            'success': False,
+            'error': f'At most {BULK_PERFORMANCE_MAX_ROWS} records per request'
+        }), 413
+    
+    results = [None] * len(records)
+    valid = {}
+    superseded = {}
+    latest = {}
+    
+    # Validate every row with the same clamping rules as the single-record API
+    for index, record in enumerate(records):
+        try:
+            values = validate_performance_record(record)
+        except (TypeError, ValueError) as e:
+            results[index] = {'index': index, 'success': False, 'status': 'failed', 'error': str(e)}
+            continue
+        
+        # The last record for an employee and date wins; earlier ones share its outcome
+        key = (values['employee_id'], values['date'])
+        if key in valid:
+            superseded[valid[key][0]] = key
+        valid[key] = latest[key] = (index, values)
+    
+    known_employees = known_employee_ids({employee_id for employee_id, _ in valid})
+    for key, (index, values) in list(valid.items()):
+        if values['employee_id'] not in known_employees:
+            results[index] = {'index': index, 'success': False, 'status': 'failed',
+                              'error': f"Unknown employee: {values['employee_id']}"}
+            del valid[key]
+    
+    closed = finalized_months([values for _, values in valid.values()])
+    for key, (index, values) in list(valid.items()):
+        if (values['employee_id'], values['date'].year, values['date'].month) in closed:
+            results[index] = {'index': index, 'success': False, 'status': 'failed',
+                              'error': f"{values['date']:%Y-%m} is finalized for employee {values['employee_id']}"}
+            del valid[key]
+    
+    try:
+        rows = score_performance_rows([values for _, values in valid.values()])
+        if rows:
+            departments = write_performance_rows(rows, performed_by="System Admin")
+        db.session.commit()
+        if rows:
+            invalidate_performance_cache(rows, departments)
+            publish_batch_event(rows)
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+    
+    for (index, _), row in zip(valid.values(), rows):
+        results[index] = {
+            'index': index,
+            'success': True,
+            'status': 'saved',
+            'employee_id': row['employee_id'],
+            'date': row['date'].isoformat(),
+            'data': performance_result(row)
+        }
+    for index, key in superseded.items():
+        winner = latest[key][0]
+        if results[winner]['success']:
+            results[index] = {'index': index, 'success': True, 'status': 'superseded', 'superseded_by': winner}
+        else:
+            results[index] = dict(results[winner], index=index)
+    
+    failed = sum(1 for result in results if not result['success'])
+    return jsonify({
+        'success': failed == 0,
+        'saved': len(rows),
+        'superseded': len(records) - len(rows) - failed,
+        'failed': failed,
+        'results': results
+    })
+
+@app.route('/api/stream')
+def stream_events():
+    """Server-Sent Events feed of performance changes (replaces dashboard polling)"""
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    try:
+        subscriber = broadcaster.subscribe(last_event_id)
+    except StreamFull:
+        return jsonify({'success': False, 'error': 'Too many live connections, try again later'}), 503
+    
+    return Response(broadcaster.stream(subscriber), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'  # Stop nginx from buffering the stream
+    })
+
+@app.route('/api/db_stats')
+def get_database_stats():
+    """Connection pool state and checkout counters for monitoring"""
+    return jsonify({'success': True, 'engines': database_config.pool_statistics()})
+
+@app.route('/api/finalize_month', methods=['POST'])
+def finalize_month_api():
+    """Month-close API: finalize every active employee's MonthlySummary"""
+    data = request.json or {}
+    try:
+        year, month = int(data['year']), int(data['month'])
+        if not 1 <= month <= 12:
+            raise ValueError('month must be between 1 and 12')
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({'success': False, 'error': f'Invalid year/month: {e}'}), 400
+    
+    try:
+        result = finalize_month(year, month, performed_by="System Admin")
     except Exception as e:
         db.session.rollback()
         return jsonify({'success': False, 'error': str(e)}), 500
+    
+    period = f"{calendar.month_name[month]} {year}"
+    if result['finalized']:
+        message = (f"{period} finalized for {result['finalized']} employees "
+                   f"({result['employees_per_second']:,.0f} employees/sec)")
+    else:
+        message = f"{period} is already finalized"
+    
+    return jsonify(dict(result, success=True, message=message))
+
+@app.route('/api/export_excel/<int:employee_id>/<int:year>/<int:month>')
+def export_employee_excel(employee_id, year, month):
+    """Download one employee's month as a PerformanceTracker workbook"""
+    if not 1 <= month <= 12:
+        return jsonify({'success': False, 'error': 'month must be between 1 and 12'}), 400
+    
+    employee = Employee.query.get_or_404(employee_id)
+    filename = f"{employee.employee_id}_Performance_{year}_{month:02d}.xlsx"
+    return performance_workbook_response([Employee.id == employee.id], year, month, filename)
+
+@app.route('/api/export_excel/all/<int:year>/<int:month>')
+def export_company_excel(year, month):
+    """Download every active employee's month, one sheet per employee"""
+    if not 1 <= month <= 12:
+        return jsonify({'success': False, 'error': 'month must be between 1 and 12'}), 400
+    
+    criteria = [Employee.is_active == True]
+    department = request.args.get('department')
+    if department:
+        criteria.append(department_filter(department))
+    
+    filename = f"Company_Performance_{year}_{month:02d}.xlsx"
+    return performance_workbook_response(criteria, year, month, filename)
+
+def performance_workbook_response(criteria, year, month, filename):
+    """
+    Stream a tracker workbook for the employees matching criteria
+    Sheets are written in write-only mode on a background thread and sent in chunks,
+    so the download starts with the first sheet and memory stays flat
+    """
+    def build(workbook):
+        employees = db.session.query(
+            Employee.id, Employee.name, Employee.employee_id, Employee.base_salary
+        ).filter(*criteria).order_by(Employee.id).all()
+        
+        records = db.session.query(
+            DailyPerformance.employee_id, DailyPerformance.date,
+            *(getattr(DailyPerformance, field) for field in PERFORMANCE_INPUT_FIELDS)
+        ).filter(
+            in_month(year, month),
+            DailyPerformance.employee_id.in_(db.session.query(Employee.id).filter(*criteria))
+        ).order_by(DailyPerformance.employee_id, DailyPerformance.date).yield_per(EXPORT_FETCH_SIZE)
+        
+        return build_performance_workbook(workbook, employees, records, get_working_days(year, month))
+    
+    response = Response(stream_workbook(build, context=app.app_context), mimetype=XLSX_MIMETYPE)
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
 
 @app.route('/api/leaderboard')
+@database_config.replica_reads
+@response_cache.cached_json(leaderboard_cache_scopes)
 def get_enterprise_leaderboard():
-    """Real-time Performance Leaderboard API"""
-    current_date = datetime.now()
-    employees = Employee.query.filter_by(is_active=True).all()
+    """Real-time Performance Leaderboard API (ranked and paginated in the database)"""
+    try:
+        year, month = parse_month_param(request.args.get('month'))
+        limit = max(1, min(LEADERBOARD_MAX_LIMIT, int(request.args.get('limit', LEADERBOARD_DEFAULT_LIMIT))))
+        offset = max(0, int(request.args.get('offset', 0)))
+    except ValueError as e:
+        return jsonify({'success': False, 'error': f'Invalid parameter: {e}'}), 400
+    
+    department = request.args.get('department')
+    
+    aggregate = month_aggregate_subquery(year, month)
+    metrics = month_metric_columns(aggregate)
+    rank = db.func.row_number().over(
+        order_by=(metrics['total_points'].desc(), Employee.id)
+    ).label('rank')
+    
+    query = active_employee_month_query(
+        aggregate,
+        Employee.id, Employee.employee_id, Employee.name, Employee.designation,
+        Department.name.label('department_name'),
+        *metrics.values(), rank
+    ).outerjoin(Department, Employee.department_id == Department.id)
+    total_query = Employee.query.filter(Employee.is_active == True)
+    
+    if department:
+        query = query.filter(department_filter(department))
+        total_query = total_query.filter(department_filter(department))
+    
+    rows = query.order_by(rank).limit(limit).offset(offset).all()
     
     leaderboard_data = []
-    for emp in employees:
-        performances = DailyPerformance.query.filter_by(employee_id=emp.id).filter(
-            db.extract('year', DailyPerformance.date) == current_date.year,
-            db.extract('month', DailyPerformance.date) == current_date.month
-        ).all()
-        
-        # Calculate comprehensive metrics
-        total_points = sum(p.approved_points for p in performances)
-        work_performances = [p for p in performances if not p.leave_taken]
-        avg_efficiency = (
-            sum(p.efficiency for p in work_performances) / len(work_performances) * 100
-            if work_performances else 0
-        )
-        
-        performance_grade = get_performance_grade(
-            total_points / len(work_performances) if work_performances else 0
-        )
+    for row in rows:
+        avg_points = row.total_points / row.work_days if row.work_days else 0
+        avg_efficiency = row.efficiency_sum / row.work_days * 100 if row.work_days else 0
         
         leaderboard_data.append({
-            'employee_id': emp.id,
-            'employee_code': emp.employee_id,
-            'name': emp.name,
-            'designation': emp.designation,
-            'department': emp.department.name if emp.department else 'N/A',
-            'total_points': round(total_points, 2),
-            'work_days': len(work_performances),
+            'rank': row.rank,
+            'employee_id': row.id,
+            'employee_code': row.employee_id,
+            'name': row.name,
+            'designation': row.designation,
+            'department': row.department_name or 'N/A',
+            'total_points': round(row.total_points, 2),
+            'work_days': row.work_days,
             'avg_efficiency': round(avg_efficiency, 1),
-            'performance_grade': performance_grade,
-            'total_hours': sum(p.completed_hrs for p in performances),
-            'task_failures': sum(1 for p in performances if p.task_failed),
-            'overtime_days': sum(1 for p in performances if p.ot_points > 0)
+            'performance_grade': get_performance_grade(avg_points),
+            'total_hours': row.total_hours,
+            'task_failures': row.task_failures,
+            'overtime_days': row.overtime_days
         })
     
-    # Sort by total points (descending)
-    leaderboard_data.sort(key=lambda x: x['total_points'], reverse=True)
-    
-    # Add rankings
-    for i, employee_data in enumerate(leaderboard_data):
-        employee_data['rank'] = i + 1
-    
-    return jsonify(leaderboard_data)
+    response = jsonify(leaderboard_data)
+    response.headers['X-Total-Count'] = str(total_query.count())
+    return response
+
+def parse_month_param(value):
+    """Parse a YYYY-MM request parameter, defaulting to the current month"""
+    if not value:
+        current_date = datetime.now()
+        return current_date.year, current_date.month
+    
+    parsed = datetime.strptime(value, '%Y-%m')
+    return parsed.year, parsed.month
+
+def department_filter(value, column=None):
+    """Filter employees (or another department_id column) by department id or exact department name"""
+    column = Employee.department_id if column is None else column
+    if value.isdigit():
+        return column == int(value)
+    return column.in_(
+        db.session.query(Department.id).filter(Department.name == value)
+    )
 
 @app.route('/analytics')
+@database_config.replica_reads
 def analytics_dashboard():
     """Advanced Analytics Dashboard"""
     return render_template('analytics.html')
@@ -534,26 +1854,20 @@ def analytics_dashboard():
 # ============================================================================
 
 @app.route('/api/dashboard_metrics')
+@database_config.replica_reads
+@response_cache.cached_json(dashboard_metrics_cache_scopes)
 def get_dashboard_metrics():
     """Get real-time dashboard metrics for charts"""
-    current_date = datetime.now()
+    # Last 4 full weeks plus the current week, from one grouped query
+    *past_weeks, current_week = weekly_trends(5)
     
-    # Calculate real performance trends (last 4 weeks)
     weeks_data = []
     labels = []
     
-    for week in range(4, 0, -1):
-        week_start = current_date - timedelta(weeks=week)
-        week_end = week_start + timedelta(days=6)
-        
-        week_performances = DailyPerformance.query.filter(
-            DailyPerformance.date >= week_start.date(),
-            DailyPerformance.date <= week_end.date()
-        ).all()
-        
-        if week_performances:
-            avg_points = sum(p.approved_points for p in week_performances) / len(week_performances)
-            avg_efficiency = sum(p.efficiency for p in week_performances) / len(week_performances) * 100
+    for number, week in enumerate(past_weeks, 1):
+        if week['records']:
+            avg_points = week['avg_points']
+            avg_efficiency = week['avg_efficiency'] * 100
         else:
             avg_points = 8.0  # Default baseline
             avg_efficiency = 85.0
@@ -562,17 +1876,11 @@ def get_dashboard_metrics():
             'points': round(avg_points, 1),
             'efficiency': round(avg_efficiency, 1)
         })
-        labels.append(f'Week {5-week}')
+        labels.append(f'Week {number}')
     
     # Current week projection
-    current_week_start = current_date - timedelta(days=current_date.weekday())
-    current_performances = DailyPerformance.query.filter(
-        DailyPerformance.date >= current_week_start.date()
-    ).all()
-    
-    if current_performances:
-        current_avg = sum(p.approved_points for p in current_performances) / len(current_performances)
-        projected_points = min(current_avg * 1.05, 12)  # 5% improvement projection
+    if current_week['records']:
+        projected_points = min(current_week['avg_points'] * 1.05, 12)  # 5% improvement projection
         projected_efficiency = min(projected_points * 10, 100)
     else:
         projected_points = 9.0
@@ -592,53 +1900,88 @@ def get_dashboard_metrics():
         }
     })
 
+def parse_trend_params():
+    """weeks, end date, department and employee_id of a trends request"""
+    weeks = int(request.args.get('weeks', TREND_DEFAULT_WEEKS))
+    if not 1 <= weeks <= TREND_MAX_WEEKS:
+        raise ValueError(f'weeks must be between 1 and {TREND_MAX_WEEKS}')
+    end = request.args.get('end')
+    end = datetime.strptime(end, '%Y-%m-%d').date() if end else date.today()
+    employee_id = request.args.get('employee_id')
+    return weeks, end, request.args.get('department'), int(employee_id) if employee_id else None
+
+@app.route('/api/trends')
+@response_cache.cached_json(trends_cache_scopes)
+def get_performance_trends():
+    """Weekly performance trends for the company, a department or one employee (one grouped query)"""
+    try:
+        weeks, end, department, employee_id = parse_trend_params()
+    except ValueError as e:
+        return jsonify({'success': False, 'error': f'Invalid parameter: {e}'}), 400
+    
+    trends = weekly_trends(weeks, end, department=department, employee_id=employee_id)
+    return jsonify({
+        'labels': [week['week_start'].strftime('%d %b') for week in trends],
+        'weeks': [
+            dict(week,
+                 week_start=week['week_start'].isoformat(),
+                 week_end=week['week_end'].isoformat(),
+                 total_points=round(week['total_points'], 2),
+                 avg_points=round(week['avg_points'], 2),
+                 avg_efficiency=round(week['avg_efficiency'] * 100, 1),
+                 total_hours=round(week['total_hours'], 2))
+            for week in trends
+        ]
+    })
+
 @app.route('/api/department_performance')
+@database_config.replica_reads
+@response_cache.cached_json(department_performance_cache_scopes)
 def get_department_performance():
-    """Get department-wise performance breakdown"""
-    departments = Department.query.all()
-    dept_data = []
-    
-    current_date = datetime.now()
+    """Department-wise performance breakdown (or one department's sub-teams) for a date range"""
+    try:
+        start, end, department, subteam = parse_department_params()
+    except ValueError as e:
+        return jsonify({'success': False, 'error': f'Invalid parameter: {e}'}), 400
     
-    for dept in departments:
-        dept_employees = Employee.query.filter_by(department_id=dept.id, is_active=True).all()
-        
-        if dept_employees:
-            # Get current month performance for department
-            dept_performances = []
-            for emp in dept_employees:
-                performances = DailyPerformance.query.filter_by(employee_id=emp.id).filter(
-                    db.extract('year', DailyPerformance.date) == current_date.year,
-                    db.extract('month', DailyPerformance.date) == current_date.month
-                ).all()
-                dept_performances.extend(performances)
-            
-            if dept_performances:
-                avg_points = sum(p.approved_points for p in dept_performances) / len(dept_performances)
-                avg_efficiency = sum(p.efficiency for p in dept_performances) / len(dept_performances) * 100
-            else:
-                # Use baseline performance based on department
-                baseline_map = {
-                    'Engineering': 9.2,
-                    'Product Management': 8.8, 
-                    'Sales & Marketing': 7.5,
-                    'Operations': 8.0,
-                    'Finance & Admin': 7.8,
-                    'Human Resources': 7.2
-                }
-                avg_points = baseline_map.get(dept.name, 8.0)
-                avg_efficiency = avg_points * 10
-            
-            dept_data.append({
-                'name': dept.name,
-                'employee_count': len(dept_employees),
-                'avg_points': round(avg_points, 1),
-                'avg_efficiency': round(avg_efficiency, 1),
-                'performance_grade': get_dept_grade(avg_points)
-            })
+    dept_data = []
+    for row in department_rollups(start, end, department, subteam):
+        if row.records:
+            avg_points = row.avg_points
+            avg_efficiency = row.avg_efficiency * 100
+        else:
+            # Use baseline performance based on department
+            avg_points = DEPARTMENT_BASELINE_POINTS.get(row.name, 8.0) if not subteam else 0
+            avg_efficiency = avg_points * 10
+        
+        dept_data.append({
+            'name': row.name,
+            'employee_count': row.employee_count,
+            'avg_points': round(avg_points, 1),
+            'avg_efficiency': round(avg_efficiency, 1),
+            'performance_grade': get_dept_grade(avg_points)
+        })
     
     return jsonify(dept_data)
 
+def parse_department_params():
+    """start, end (default: current month), department and sub-team grouping of a rollup request"""
+    current_date = datetime.now()
+    month_start, next_month = month_date_range(current_date.year, current_date.month)
+    start = request.args.get('start')
+    end = request.args.get('end')
+    start = datetime.strptime(start, '%Y-%m-%d').date() if start else month_start
+    end = datetime.strptime(end, '%Y-%m-%d').date() if end else next_month - timedelta(days=1)
+    if end < start:
+        raise ValueError('end is before start')
+    
+    department, subteam = request.args.get('department'), request.args.get('by')
+    if subteam and subteam not in SUBTEAM_COLUMNS:
+        raise ValueError(f"by must be one of {', '.join(SUBTEAM_COLUMNS)}")
+    if subteam and not department:
+        raise ValueError('sub-team drill-down requires a department')
+    return start, end, department, subteam
+
 def get_dept_grade(avg_points):
     """Get department performance grade"""
     if avg_points >= 10:
@@ -653,77 +1996,115 @@ def get_dept_grade(avg_points):
         return {'grade': 'C', 'class': 'danger'}
 
 @app.route('/api/performance_distribution')
+@response_cache.cached_json(distribution_cache_scopes)
 def get_performance_distribution():
-    """Get employee performance distribution data"""
-    current_date = datetime.now()
-    employees = Employee.query.filter_by(is_active=True).all()
-    
-    distribution = {'top': 0, 'high': 0, 'average': 0, 'needs_support': 0}
-    
-    for emp in employees:
-        performances = DailyPerformance.query.filter_by(employee_id=emp.id).filter(
-            db.extract('year', DailyPerformance.date) == current_date.year,
-            db.extract('month', DailyPerformance.date) == current_date.month
-        ).all()
+    """
+    Employee performance distribution for a month, bucketed in the database
+    Default: the four performance bands; ?bins=N (0-DISTRIBUTION_BIN_RANGE points,
+    equal width) or ?thresholds=2,4,6 request a finer histogram
+    """
+    try:
+        year, month = parse_month_param(request.args.get('month'))
+        edges = parse_histogram_edges()
+    except ValueError as e:
+        return jsonify({'success': False, 'error': f'Invalid parameter: {e}'}), 400
+    
+    if edges is None:
+        bands = list(reversed(DISTRIBUTION_BUCKETS))  # Lowest first, like histogram buckets
+        counts, no_data = performance_histogram(year, month, [bound for bound, _, _ in bands[1:]])
+        counts[[label for _, label, _ in bands].index('Average')] += no_data  # No data counts as average
+        counts.reverse()  # Highest band first
         
-        work_performances = [p for p in performances if not p.leave_taken]
-        if work_performances:
-            avg_points = sum(p.approved_points for p in work_performances) / len(work_performances)
-            
-            if avg_points >= 10:
-                distribution['top'] += 1
-            elif avg_points >= 7:
-                distribution['high'] += 1
-            elif avg_points >= 4:
-                distribution['average'] += 1
-            else:
-                distribution['needs_support'] += 1
+        total = sum(counts)
+        if total > 0:
+            percentages = [round(count / total * 100) for count in counts]
         else:
-            # For employees with no data, assign to average
-            distribution['average'] += 1
-    
-    total = sum(distribution.values())
-    if total > 0:
-        percentages = {k: round(v/total*100) for k, v in distribution.items()}
-    else:
-        percentages = {'top': 25, 'high': 50, 'average': 20, 'needs_support': 5}
+            percentages = [25, 50, 20, 5]
+        
+        return jsonify({
+            'labels': [label for _, label, _ in DISTRIBUTION_BUCKETS],
+            'data': percentages,
+            'counts': counts,
+            'colors': [colour for _, _, colour in DISTRIBUTION_BUCKETS]
+        })
     
+    counts, no_data = performance_histogram(year, month, edges)
+    total = sum(counts)
+    bounds = [0] + edges
     return jsonify({
-        'labels': ['Top Performers', 'High Performers', 'Average', 'Needs Support'],
-        'data': [percentages['top'], percentages['high'], percentages['average'], percentages['needs_support']],
-        'colors': ['rgb(16, 185, 129)', 'rgb(59, 130, 246)', 'rgb(245, 158, 11)', 'rgb(239, 68, 68)']
+        'labels': [f"{low:g}-{high:g}" for low, high in zip(bounds, edges)] + [f"{bounds[-1]:g}+"],
+        'edges': edges,
+        'counts': counts,
+        'data': [round(count / total * 100, 1) if total else 0 for count in counts],
+        'no_data': no_data
     })
 
+def parse_histogram_edges():
+    """Bucket lower bounds from ?thresholds= or ?bins=, or None for the default bands"""
+    thresholds, bins = request.args.get('thresholds'), request.args.get('bins')
+    if thresholds:
+        edges = sorted({float(value) for value in thresholds.split(',')})
+        if not edges or edges[0] <= 0 or len(edges) >= DISTRIBUTION_MAX_BINS:
+            raise ValueError(f'thresholds must be positive, at most {DISTRIBUTION_MAX_BINS - 1}')
+        return edges
+    if bins:
+        bins = int(bins)
+        if not 1 <= bins <= DISTRIBUTION_MAX_BINS:
+            raise ValueError(f'bins must be between 1 and {DISTRIBUTION_MAX_BINS}')
+        width = DISTRIBUTION_BIN_RANGE / bins
+        return [round(width * index, 6) for index in range(1, bins)]
+    return None
+
 @app.route('/api/employee/<int:employee_id>/performance_trend')
+@response_cache.cached_json(employee_trend_cache_scopes)
 def get_employee_performance_trend(employee_id):
-    """Get individual employee performance trend for charts"""
-    current_date = datetime.now()
-    
-    # Get last 30 days of performance
-    performances = DailyPerformance.query.filter_by(employee_id=employee_id).filter(
-        DailyPerformance.date >= (current_date - timedelta(days=30)).date()
-    ).order_by(DailyPerformance.date).all()
+    """
+    Individual employee performance trend for charts
+    ?days=N (default 30) or ?start=&end= pick the window; long windows are
+    aggregated to weekly or monthly points unless ?bucket=day|week|month is given
+    """
+    try:
+        start, end, bucket = parse_employee_trend_params()
+    except ValueError as e:
+        return jsonify({'success': False, 'error': f'Invalid parameter: {e}'}), 400
     
-    labels = []
-    points_data = []
-    
-    # Fill in gaps for missing days to show complete trend
-    for i in range(30):
-        check_date = (current_date - timedelta(days=29-i)).date()
-        perf = next((p for p in performances if p.date == check_date), None)
-        
-        labels.append(check_date.strftime('%m/%d'))
-        if perf:
-            points_data.append(perf.approved_points)
-        else:
-            points_data.append(0)  # No performance data for this day
+    starts, points_data, records = employee_trend(employee_id, start, end, bucket)
+    label_format = {'day': '%m/%d', 'week': '%d %b %y', 'month': '%b %Y'}[bucket]
     
     return jsonify({
-        'labels': labels,
+        'labels': [day.strftime(label_format) for day in starts],
         'points': points_data,
-        'target': [10] * len(labels)  # Target line at 10 points
+        'records': records,
+        'target': [10] * len(starts),  # Target line at 10 points
+        'bucket': bucket,
+        'start': start.isoformat(),
+        'end': end.isoformat()
     })
 
+def parse_employee_trend_params():
+    """Window and bucket of an employee trend request (bucket chosen from the window length by default)"""
+    end = request.args.get('end')
+    end = datetime.strptime(end, '%Y-%m-%d').date() if end else date.today()
+    start = request.args.get('start')
+    if start:
+        start = datetime.strptime(start, '%Y-%m-%d').date()
+    else:
+        start = end - timedelta(days=int(request.args.get('days', EMPLOYEE_TREND_DEFAULT_DAYS)) - 1)
+    
+    days = (end - start).days + 1
+    if not 1 <= days <= EMPLOYEE_TREND_MAX_DAYS:
+        raise ValueError(f'the window must cover 1 to {EMPLOYEE_TREND_MAX_DAYS} days')
+    
+    bucket = request.args.get('bucket')
+    if bucket is None:
+        if days <= EMPLOYEE_TREND_DAILY_MAX_DAYS:
+            bucket = 'day'
+        else:
+            bucket = 'week' if days <= EMPLOYEE_TREND_WEEKLY_MAX_DAYS else 'month'
+    elif bucket not in EMPLOYEE_TREND_BUCKETS:
+        raise ValueError(f"bucket must be one of {', '.join(EMPLOYEE_TREND_BUCKETS)}")
+    return start, end, bucket
+
 @app.route('/api/employee/<int:employee_id>/edit', methods=['GET', 'POST'])
 def edit_employee(employee_id):
     """Edit employee information"""
@@ -731,6 +2112,8 @@ def edit_employee(employee_id):
     
     if request.method == 'POST':
         data = request.json
+        previous_department_id = employee.department_id
+        previous_salary = employee.base_salary
         
         # Update employee fields
         employee.name = data.get('name', employee.name)
@@ -756,7 +2139,14 @@ def edit_employee(employee_id):
         )
         
         db.session.add(audit)
+        if employee.department_id != previous_department_id:
+            move_employee_rollups(employee_id, previous_department_id, employee.department_id)
+        if employee.base_salary != previous_salary:
+            refresh_employee_summaries(employee)
         db.session.commit()
+        response_cache.invalidate([
+            (None, None, previous_department_id), (None, None, employee.department_id)
+        ])
         
         return jsonify({
             'success': True,
@@ -780,10 +2170,276 @@ def edit_employee(employee_id):
         'departments': [{'id': d.id, 'name': d.name} for d in departments]
     })
 
+# Maintenance Commands
+@app.cli.command('verify-summaries')
+@click.option('--year', type=int, help='Year to verify (default: every month with summaries)')
+@click.option('--month', type=int, help='Month to verify, requires --year')
+@click.option('--fix', is_flag=True, help='Overwrite drifted totals with the recomputed values')
+def verify_summaries_command(year, month, fix):
+    """Recompute open MonthlySummary totals from DailyPerformance and report drift"""
+    if year and month:
+        periods = [(year, month)]
+    else:
+        query = db.session.query(MonthlySummary.year, MonthlySummary.month).distinct()
+        if year:
+            query = query.filter(MonthlySummary.year == year)
+        periods = query.order_by(MonthlySummary.year, MonthlySummary.month).all()
+    
+    total_drift = 0
+    for period_year, period_month in periods:
+        drift = find_summary_drift(period_year, period_month, fix=fix)
+        total_drift += len(drift)
+        for employee_id, field, stored_value, actual_value in drift:
+            click.echo(f"{period_year}-{period_month:02d} employee {employee_id}: "
+                       f"{field} stored={stored_value} actual={actual_value}")
+    
+    status = 'fixed' if fix else 'found'
+    click.echo(f"Checked {len(periods)} month(s): {total_drift} drifted value(s) {status}")
+    if total_drift and not fix:
+        sys.exit(1)
+
+@app.cli.command('recompute-performance')
+@click.option('--start', 'start_date', type=click.DateTime(formats=['%Y-%m-%d']), required=True,
+              help='First date to recompute (YYYY-MM-DD)')
+@click.option('--end', 'end_date', type=click.DateTime(formats=['%Y-%m-%d']), required=True,
+              help='Last date to recompute, inclusive (YYYY-MM-DD)')
+@click.option('--chunk-size', default=RECOMPUTE_CHUNK_SIZE, show_default=True,
+              help='Rows scored and written per transaction')
+@click.option('--dry-run', is_flag=True, help='Report changed rows without writing them')
+def recompute_performance_command(start_date, end_date, chunk_size, dry_run):
+    """
+    Rescore derived DailyPerformance columns for a date range with the batch kernel
+    Rows in finalized months are the closed record and are left as they are
+    """
+    import numpy as np
+    from scoring_kernel import calculate_performance_metrics_batch, INPUT_COLUMNS, DERIVED_COLUMNS
+    
+    started = datetime.now()
+    selected = [DailyPerformance.id, DailyPerformance.employee_id, DailyPerformance.date] + [
+        getattr(DailyPerformance, column) for column in INPUT_COLUMNS + DERIVED_COLUMNS
+    ]
+    last_id, scanned, changed, locked, touched_months = 0, 0, 0, 0, set()
+    
+    while True:
+        rows = db.session.query(*selected).filter(
+            DailyPerformance.date >= start_date.date(),
+            DailyPerformance.date <= end_date.date(),
+            DailyPerformance.id > last_id
+        ).order_by(DailyPerformance.id).limit(chunk_size).all()
+        if not rows:
+            break
+        
+        last_id = rows[-1].id
+        scanned += len(rows)
+        columns = dict(zip(rows[0]._fields, zip(*rows)))
+        
+        derived = calculate_performance_metrics_batch(**{
+            column: columns[column] for column in INPUT_COLUMNS
+        })
+        stale = np.zeros(len(rows), dtype=bool)
+        for column in DERIVED_COLUMNS:
+            stored = np.array(columns[column], dtype=np.float64)  # NULL becomes NaN
+            stale |= stored != derived[column]
+        
+        closed = finalized_months([row._asdict() for row in rows])
+        if closed:
+            in_closed_month = np.array([
+                (row.employee_id, row.date.year, row.date.month) in closed for row in rows
+            ])
+            locked += int(np.count_nonzero(stale & in_closed_month))
+            stale &= ~in_closed_month
+        
+        stale_indexes = np.flatnonzero(stale)
+        changed += len(stale_indexes)
+        if dry_run or not len(stale_indexes):
+            continue
+        
+        db.session.execute(db.update(DailyPerformance), [
+            dict({'id': columns['id'][index]},
+                 **{column: float(derived[column][index]) for column in DERIVED_COLUMNS})
+            for index in stale_indexes
+        ])
+        db.session.commit()
+        touched_months.update(
+            (columns['date'][index].year, columns['date'][index].month) for index in stale_indexes
+        )
+    
+    # Bring affected month summaries and daily rollups back in line with the rewritten rows
+    for year, month in sorted(touched_months):
+        find_summary_drift(year, month, fix=True)
+    if touched_months:
+        rebuild_daily_rollups(start_date.date(), end_date.date())
+        db.session.commit()
+    invalidate_month_cache(touched_months)
+    
+    elapsed = max((datetime.now() - started).total_seconds(), 1e-9)
+    action = 'would change' if dry_run else 'rewritten'
+    click.echo(f"Scanned {scanned} row(s) in {elapsed:.2f}s ({scanned / elapsed:,.0f} rows/sec); "
+               f"{changed} {action}" + (f", {locked} left in finalized months" if locked else ''))
+
+@app.cli.command('rebuild-rollups')
+@click.option('--start', 'start_date', type=click.DateTime(formats=['%Y-%m-%d']),
+              help='First date to rebuild (default: all history)')
+@click.option('--end', 'end_date', type=click.DateTime(formats=['%Y-%m-%d']),
+              help='Last date to rebuild, inclusive')
+def rebuild_rollups_command(start_date, end_date):
+    """Regenerate DailyRollup from DailyPerformance"""
+    started = datetime.now()
+    start = start_date.date() if start_date else None
+    end = end_date.date() if end_date else None
+    written = rebuild_daily_rollups(start, end)
+    db.session.commit()
+    
+    first, last = db.session.query(db.func.min(DailyRollup.date), db.func.max(DailyRollup.date)).one()
+    if first:
+        invalidate_month_cache(months_between(max(first, start or first), min(last, end or last)))
+    
+    elapsed = max((datetime.now() - started).total_seconds(), 1e-9)
+    click.echo(f"Rebuilt {written} daily rollup row(s) in {elapsed:.2f}s")
+
+@app.cli.command('finalize-month')
+@click.option('--year', type=int, required=True)
+@click.option('--month', type=int, required=True)
+@click.option('--workers', type=int, default=None, help='Worker processes (default: FINALIZE_WORKERS)')
+def finalize_month_command(year, month, workers):
+    """Finalize MonthlySummary for every active employee"""
+    result = finalize_month(year, month, performed_by="System Admin", workers=workers or FINALIZE_WORKERS)
+    click.echo(f"Finalized {result['finalized']} employee(s) in {result['elapsed_seconds']}s "
+               f"({result['employees_per_second']:,.1f} employees/sec); "
+               f"{result['already_finalized']} already finalized")
+
+@app.cli.command('import-workbooks')
+@click.argument('paths', nargs=-1, required=True, type=click.Path(exists=True))
+@click.option('--workers', type=int, default=None, help='Parser processes (default: CPU count)')
+@click.option('--report', 'report_path', type=click.Path(dir_okay=False),
+              help='Write the per-file error report as CSV')
+@click.option('--dry-run', is_flag=True, help='Validate without writing to the database')
+def import_workbooks_command(paths, workers, report_path, dry_run):
+    """Import filled-in tracker workbooks (files or directories) into DailyPerformance"""
+    import csv
+    
+    workbooks = find_workbooks(paths)
+    sheet_index = employee_sheet_index()
+    started = datetime.now()
+    imported, failed = 0, 0
+    
+    report_file = open(report_path, 'w', newline='', encoding='utf-8') if report_path else None
+    writer = csv.writer(report_file) if report_file else None
+    if writer:
+        writer.writerow(['file', 'sheet', 'row', 'error'])
+    
+    try:
+        for parsed in iter_parsed_workbooks(workbooks, workers):
+            report = import_tracker_workbook(parsed, sheet_index, performed_by="Excel Import", dry_run=dry_run)
+            imported += report['imported']
+            failed += 1 if report['errors'] else 0
+            
+            status = '✅' if not report['errors'] else '❌'
+            click.echo(f"{status} {report['file']}: {report['sheets']} sheet(s), "
+                       f"{report['imported']} row(s), {len(report['errors'])} error(s)")
+            if writer:
+                writer.writerows([report['file'], sheet, row, error] for sheet, row, error in report['errors'])
+    finally:
+        if report_file:
+            report_file.close()
+    
+    elapsed = max((datetime.now() - started).total_seconds(), 1e-9)
+    action = 'validated' if dry_run else 'imported'
+    click.echo(f"{len(workbooks)} workbook(s), {imported} row(s) {action} in {elapsed:.1f}s; "
+               f"{failed} workbook(s) with errors")
+    if failed:
+        sys.exit(1)
+
+holidays_cli = AppGroup('holidays', help='Manage company holidays (excluded from working days)')
+
+def apply_holiday_change(day):
+    load_holidays(force=True)
+    refreshed = refresh_open_summaries(day.year, day.month)
+    click.echo(f"{day:%B %Y} now has {working_day_count(day.year, day.month)} working day(s); "
+               f"{refreshed} open summary(ies) refreshed")
+
+@holidays_cli.command('list')
+@click.option('--year', type=int, help='Only holidays in this year')
+def list_holidays_command(year):
+    """List company holidays"""
+    query = CompanyHoliday.query.order_by(CompanyHoliday.date)
+    if year:
+        query = query.filter(CompanyHoliday.date >= date(year, 1, 1), CompanyHoliday.date < date(year + 1, 1, 1))
+    for holiday in query:
+        click.echo(f"{holiday.date:%Y-%m-%d} {holiday.date:%a}  {holiday.name}")
+
+@holidays_cli.command('add')
+@click.argument('day', type=click.DateTime(formats=['%Y-%m-%d']))
+@click.argument('name')
+def add_holiday_command(day, name):
+    """Add a company holiday on DAY (YYYY-MM-DD)"""
+    day = day.date()
+    if CompanyHoliday.query.filter_by(date=day).first():
+        raise click.ClickException(f"{day} is already a holiday")
+    db.session.add(CompanyHoliday(date=day, name=name))
+    db.session.commit()
+    apply_holiday_change(day)
+
+@holidays_cli.command('remove')
+@click.argument('day', type=click.DateTime(formats=['%Y-%m-%d']))
+def remove_holiday_command(day):
+    """Remove the company holiday on DAY (YYYY-MM-DD)"""
+    day = day.date()
+    holiday = CompanyHoliday.query.filter_by(date=day).first()
+    if not holiday:
+        raise click.ClickException(f"{day} is not a holiday")
+    db.session.delete(holiday)
+    db.session.commit()
+    apply_holiday_change(day)
+
+app.cli.add_command(holidays_cli)
+
 # Initialize Database
+SCHEMA_COLUMN_UPGRADES = {
+    'monthly_summary': [
+        ('recorded_days', 'INTEGER DEFAULT 0'),
+        ('efficiency_sum', 'FLOAT DEFAULT 0'),
+    ]
+}
+
+def upgrade_schema():
+    """Bring databases created from an older schema up to date"""
+    inspector = db.inspect(db.engine)
+    added_columns = False
+    
+    for table_name, columns in SCHEMA_COLUMN_UPGRADES.items():
+        existing = {column['name'] for column in inspector.get_columns(table_name)}
+        for column_name, column_type in columns:
+            if column_name not in existing:
+                db.session.execute(db.text(
+                    f'ALTER TABLE {table_name} ADD COLUMN {column_name} {column_type}'
+                ))
+                added_columns = True
+    db.session.commit()
+    
+    # Indexes added after the initial schema
+    for index in DailyPerformance.__table__.indexes | Employee.__table__.indexes:
+        index.create(bind=db.engine, checkfirst=True)
+    
+    # Summaries written before running totals existed need a full recompute
+    if added_columns:
+        periods = db.session.query(MonthlySummary.year, MonthlySummary.month).distinct().all()
+        for year, month in periods:
+            find_summary_drift(year, month, fix=True)
+    
+    # Older versions computed summaries on demand only; reads now trust the stored rows
+    if backfill_monthly_summaries():
+        db.session.commit()
+    
+    # Rollups start from the history recorded before the table existed
+    if not db.session.query(DailyRollup.id).first() and db.session.query(DailyPerformance.id).first():
+        rebuild_daily_rollups()
+        db.session.commit()
+
 def init_enterprise_db():
     """Initialize enterprise database with sample data"""
     db.create_all()
+    upgrade_schema()
     
     # Create default department if none exists
     if Department.query.count() == 0:
@@ -814,6 +2470,7 @@ def init_enterprise_db():
         db.session.add(sample_employee)
     
     db.session.commit()
+    load_holidays(force=True)
 
 if __name__ == '__main__':
     with app.app_context():
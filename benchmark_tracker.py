@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+PerformanceTracker Workbook Benchmark
+Measures build + save time and peak memory for workbooks of N employee sheets
+Pass --baseline <git-rev> to compare against an earlier employee_performance_tracker.py
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_SIZES = [100, 1000, 5000]
+TRACKER_MODULE = "employee_performance_tracker.py"
+
+
+def load_tracker_module(path):
+    """Import a tracker module from an explicit file path"""
+    spec = importlib.util.spec_from_file_location("benchmark_tracker_module", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def peak_memory_mb():
+    """Peak resident memory of this process in MB"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_once(module_path, employees):
+    """Build and save one workbook in this process and print the measurements as JSON"""
+    module = load_tracker_module(module_path)
+    random.seed(42)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "benchmark.xlsx")
+
+        start = time.perf_counter()
+        tracker = module.PerformanceTracker()
+        for i in range(employees):
+            tracker.add_employee(f"Employee_{i:05d}", 2025, 8, sample_data=True)
+        built = time.perf_counter()
+        tracker.save_workbook(filename)
+        saved = time.perf_counter()
+
+        size_mb = os.path.getsize(filename) / (1024 * 1024)
+
+    print(json.dumps({
+        "employees": employees,
+        "build_s": round(built - start, 2),
+        "save_s": round(saved - built, 2),
+        "total_s": round(saved - start, 2),
+        "peak_mb": round(peak_memory_mb(), 1) if resource else None,
+        "file_mb": round(size_mb, 1)
+    }))
+
+
+def measure(module_path, employees):
+    """Run one measurement in a fresh interpreter so peak memory is not shared"""
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--run", module_path, str(employees)],
+        capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def baseline_module(revision, tmp):
+    """Write the tracker module from a git revision to a temporary file"""
+    source = subprocess.run(
+        ["git", "show", f"{revision}:{TRACKER_MODULE}"],
+        capture_output=True, text=True, check=True,
+        cwd=os.path.dirname(os.path.abspath(__file__))
+    ).stdout
+    path = os.path.join(tmp, f"baseline_{TRACKER_MODULE}")
+    with open(path, "w") as f:
+        f.write(source)
+    return path
+
+
+def print_table(label, results):
+    print(f"\n{label}")
+    print(f"{'Employees':>10} {'Build (s)':>10} {'Save (s)':>10} {'Total (s)':>10} {'Peak (MB)':>10} {'File (MB)':>10}")
+    for r in results:
+        peak = f"{r['peak_mb']:.1f}" if r['peak_mb'] is not None else "n/a"
+        print(f"{r['employees']:>10} {r['build_s']:>10.2f} {r['save_s']:>10.2f} {r['total_s']:>10.2f} "
+              f"{peak:>10} {r['file_mb']:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PerformanceTracker workbook generation")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="employee sheet counts to benchmark")
+    parser.add_argument("--baseline", metavar="GIT_REV",
+                        help="also benchmark the tracker module at this git revision")
+    parser.add_argument("--run", nargs=2, metavar=("MODULE", "EMPLOYEES"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        run_once(args.run[0], int(args.run[1]))
+        return
+
+    current = os.path.join(os.path.dirname(os.path.abspath(__file__)), TRACKER_MODULE)
+
+    print("⏱️ Benchmarking PerformanceTracker workbook generation...")
+    with tempfile.TemporaryDirectory() as tmp:
+        runs = [("Current", current)]
+        if args.baseline:
+            runs.insert(0, (f"Baseline ({args.baseline})", baseline_module(args.baseline, tmp)))
+
+        for label, path in runs:
+            print_table(label, [measure(path, size) for size in args.sizes])
+
+
+if __name__ == "__main__":
+    main()
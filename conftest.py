@@ -0,0 +1,90 @@
+"""
+Shared pytest fixtures
+The app reads its configuration at import time, so the database and cache
+settings are pinned here before any test module imports it
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+from datetime import date
+
+import pytest
+from sqlalchemy import event
+
+_database_dir = tempfile.mkdtemp(prefix='performancepro-tests-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(_database_dir, 'test.db')}"
+os.environ.pop('DATABASE_READ_URL', None)
+os.environ.setdefault('CACHE_TTL_SECONDS', '300')
+
+
+@pytest.fixture
+def app_context():
+    """Fresh schema, calendar and response cache for every test"""
+    import app as performance_app
+    import response_cache
+    import work_calendar
+
+    with performance_app.app.app_context():
+        performance_app.db.drop_all()
+        performance_app.db.create_all()
+        work_calendar.set_holidays([])
+        performance_app.holiday_state['loaded_at'] = None
+        response_cache.backend = response_cache.MemoryBackend()
+        yield performance_app
+        performance_app.db.session.remove()
+
+
+@pytest.fixture
+def client(app_context):
+    return app_context.app.test_client()
+
+
+@pytest.fixture
+def make_employee(app_context):
+    """Create an employee (and its department) and return its id"""
+    db, Employee, Department = app_context.db, app_context.Employee, app_context.Department
+    counter = [0]
+
+    def make(department='Engineering', name=None, **fields):
+        counter[0] += 1
+        dept = Department.query.filter_by(name=department).first() if department else None
+        if department and dept is None:
+            dept = Department(name=department, manager_name='Lead')
+            db.session.add(dept)
+            db.session.flush()
+        employee = Employee(
+            employee_id=f"EMP{counter[0]:05d}",
+            name=name or f"Employee {counter[0]:03d}",
+            email=f"employee{counter[0]}@example.com",
+            designation=fields.pop('designation', 'Engineer'),
+            department_id=dept.id if dept else None,
+            base_salary=fields.pop('base_salary', 60000),
+            join_date=fields.pop('join_date', date(2024, 1, 1)),
+            **fields
+        )
+        db.session.add(employee)
+        db.session.commit()
+        return employee.id
+
+    return make
+
+
+def performance_record(employee_id, day, **fields):
+    """API payload for one daily performance record"""
+    return dict({'employee_id': employee_id, 'date': day.isoformat(), 'completed_hrs': 8}, **fields)
+
+
+@contextmanager
+def statements(engine):
+    """SQL statements executed on engine inside the block"""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(' '.join(statement.split()))
+
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        yield executed
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
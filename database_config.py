@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Database Engine Configuration
+Resolves the database URL (DATABASE_URL, then the MySQL/PlanetScale settings,
+then local SQLite), tunes the connection pool per backend and applies SQLite
+pragmas on every new connection. Pool checkouts are counted per engine so
+/api/db_stats can report pool pressure.
+With DATABASE_READ_URL set, views marked @replica_reads send their queries to
+the read replica; writes always go to the primary, and a client that wrote
+recently keeps reading from the primary until the replica has caught up
+"""
+
+import os
+import threading
+import time
+from functools import wraps
+
+from flask import current_app, g, session
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.sql.dml import UpdateBase
+
+from database_mysql import get_mysql_connection_string
+
+DEFAULT_DATABASE_URL = 'sqlite:///performancepro.db'
+READ_BIND = 'read'
+READ_YOUR_WRITES_SECONDS = int(os.environ.get('READ_YOUR_WRITES_SECONDS', 10))  # Longer than the replica lag
+
+POOL_DEFAULTS = {
+    # SQLite connections are cheap; enough of them for gunicorn threads to wait on busy_timeout, not on the pool
+    'sqlite': {'pool_size': 10, 'max_overflow': 20, 'pool_pre_ping': False, 'pool_recycle': -1},
+    # Pre-ping replaces connections the server or a proxy dropped while idle
+    'postgresql': {'pool_size': 10, 'max_overflow': 20, 'pool_pre_ping': True, 'pool_recycle': 1800},
+    # Recycle below the idle timeouts of MySQL (wait_timeout) and PlanetScale
+    'mysql': {'pool_size': 5, 'max_overflow': 10, 'pool_pre_ping': True, 'pool_recycle': 280},
+}
+POOL_TIMEOUT_SECONDS = int(os.environ.get('DB_POOL_TIMEOUT', 30))
+
+SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000))
+SQLITE_CACHE_SIZE_KB = int(os.environ.get('SQLITE_CACHE_SIZE_KB', 64000))
+SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+SQLITE_PRAGMAS = (
+    'journal_mode=WAL',  # Readers no longer block the writer (and vice versa)
+    'synchronous=NORMAL',  # Safe with WAL; fsync at checkpoints instead of every commit
+    f'mmap_size={SQLITE_MMAP_SIZE}',
+    f'cache_size=-{SQLITE_CACHE_SIZE_KB}',  # Negative values are KiB
+    f'busy_timeout={SQLITE_BUSY_TIMEOUT_MS}',  # Wait for the write lock instead of "database is locked"
+)
+
+_statistics = {}
+
+
+def database_url(url=None):
+    """DATABASE_URL (or url), then the MySQL settings, then local SQLite"""
+    url = url or os.environ.get('DATABASE_URL') or get_mysql_connection_string() or DEFAULT_DATABASE_URL
+    if url.startswith('postgres://'):
+        url = url.replace('postgres://', 'postgresql://', 1)
+    return url
+
+
+def read_replica_binds(url=None):
+    """SQLALCHEMY_BINDS entry for the replica at DATABASE_READ_URL (empty when unset)"""
+    url = url or os.environ.get('DATABASE_READ_URL')
+    if not url:
+        return {}
+    url = database_url(url)
+    return {READ_BIND: dict(engine_options(url), url=url)}
+
+
+def backend_name(url):
+    return url.split(':', 1)[0].split('+', 1)[0]
+
+
+def is_memory_sqlite(url):
+    return url in ('sqlite://', 'sqlite:///:memory:') or 'mode=memory' in url
+
+
+def engine_options(url):
+    """create_engine() keyword arguments for a database URL"""
+    backend = backend_name(url)
+    if backend == 'sqlite':
+        options = {'connect_args': {'timeout': SQLITE_BUSY_TIMEOUT_MS / 1000}}
+        if is_memory_sqlite(url):
+            return options  # Single shared connection; pool sizing does not apply
+    else:
+        options = {}
+
+    pool = dict(POOL_DEFAULTS.get(backend, POOL_DEFAULTS['postgresql']))
+    for option, variable, parse in (
+        ('pool_size', 'DB_POOL_SIZE', int),
+        ('max_overflow', 'DB_MAX_OVERFLOW', int),
+        ('pool_recycle', 'DB_POOL_RECYCLE', int),
+        ('pool_pre_ping', 'DB_POOL_PRE_PING', lambda value: value.lower() in ('1', 'true', 'yes')),
+    ):
+        if os.environ.get(variable):
+            pool[option] = parse(os.environ[variable])
+    options.update(pool, pool_timeout=POOL_TIMEOUT_SECONDS)
+    return options
+
+
+class PoolStatistics:
+    """Connection and checkout counters of one engine, updated from pool events"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.connections_opened = 0
+        self.invalidations = 0
+        self.checkouts = 0
+        self.checked_out = 0
+        self.peak_checked_out = 0
+        self.hold_seconds_total = 0.0
+        self.hold_seconds_max = 0.0
+
+    def on_connect(self, dbapi_connection, connection_record):
+        with self.lock:
+            self.connections_opened += 1
+
+    def on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        connection_record.info['checked_out_at'] = time.monotonic()
+        with self.lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+
+    def on_checkin(self, dbapi_connection, connection_record):
+        checked_out_at = connection_record.info.pop('checked_out_at', None)
+        if checked_out_at is None:
+            return  # Checked out before the listeners were installed
+        held = time.monotonic() - checked_out_at
+        with self.lock:
+            self.checked_out -= 1
+            self.hold_seconds_total += held
+            self.hold_seconds_max = max(self.hold_seconds_max, held)
+
+    def on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self.lock:
+            self.invalidations += 1
+
+    def snapshot(self):
+        with self.lock:
+            completed = self.checkouts - self.checked_out
+            return {
+                'connections_opened': self.connections_opened,
+                'invalidations': self.invalidations,
+                'checkouts': self.checkouts,
+                'checked_out': self.checked_out,
+                'peak_checked_out': self.peak_checked_out,
+                'avg_hold_ms': round(self.hold_seconds_total * 1000 / completed, 2) if completed else 0,
+                'max_hold_ms': round(self.hold_seconds_max * 1000, 2)
+            }
+
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(f'PRAGMA {pragma}')
+    finally:
+        cursor.close()
+
+
+def instrument_engine(engine, name='default'):
+    """Install the SQLite pragmas and pool statistics listeners on an engine (before its first connection)"""
+    if name in _statistics:
+        return
+    if engine.dialect.name == 'sqlite':
+        event.listen(engine, 'connect', apply_sqlite_pragmas)
+
+    statistics = PoolStatistics()
+    event.listen(engine, 'connect', statistics.on_connect)
+    event.listen(engine, 'checkout', statistics.on_checkout)
+    event.listen(engine, 'checkin', statistics.on_checkin)
+    event.listen(engine, 'invalidate', statistics.on_invalidate)
+    _statistics[name] = (engine, statistics)
+
+
+def pool_statistics():
+    """Current pool state and checkout counters of every instrumented engine"""
+    report = {}
+    for name, (engine, statistics) in _statistics.items():
+        pool = engine.pool
+        state = {'backend': engine.dialect.name, 'pool': type(pool).__name__}
+        for field in ('size', 'checkedin', 'checkedout', 'overflow'):
+            if hasattr(pool, field):
+                state[field] = getattr(pool, field)()
+        state.update(statistics.snapshot())
+        report[name] = state
+    return report
+
+
+class RoutingSession(Session):
+    """Session that reads from the replica while the request is marked for it; flushes and DML use the primary"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (bind is None and serving_from_replica() and not self._flushing
+                and not isinstance(clause, UpdateBase)):
+            return self._db.engines[READ_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def replica_configured():
+    return READ_BIND in current_app.config.get('SQLALCHEMY_BINDS', {})
+
+
+def wrote_recently():
+    return session.get('wrote_at', 0) > time.time() - READ_YOUR_WRITES_SECONDS
+
+
+def replica_reads(view):
+    """
+    Serve a read-only view from the replica unless this client wrote within READ_YOUR_WRITES_SECONDS
+    Apply it outside @cached_json so the cache can keep replica and primary responses apart
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        g.read_replica = replica_configured() and not wrote_recently()
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def serving_from_replica():
+    """Whether this request's reads go to the replica (set by @replica_reads)"""
+    return bool(g and g.get('read_replica'))
+
+
+def remember_write():
+    """Pin this client to the primary for the read-your-writes window"""
+    if replica_configured():
+        session['wrote_at'] = time.time()
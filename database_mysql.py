@@ -17,20 +17,3 @@ def get_mysql_connection_string():
         return f"mysql+pymysql://{username}:{password_encoded}@{host}/{database}?ssl_disabled=true"
     
     return None
-
-# Usage in app.py:
-"""
-from database_mysql import get_mysql_connection_string
-
-# Database configuration with multiple fallbacks
-database_url = os.environ.get('DATABASE_URL')
-if not database_url:
-    database_url = get_mysql_connection_string()
-if not database_url:
-    database_url = 'sqlite:///performancepro.db'
-
-if database_url and database_url.startswith('postgres://'):
-    database_url = database_url.replace('postgres://', 'postgresql://', 1)
-
-app.config['SQLALCHEMY_DATABASE_URI'] = database_url
-"""
\ No newline at end of file
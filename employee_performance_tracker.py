@@ -6,7 +6,9 @@ Generates formula-protected Excel workbook for employee performance tracking
 
 import openpyxl
 from openpyxl import Workbook
-from openpyxl.styles import Font, Fill, PatternFill, Border, Side, Alignment
+from openpyxl.styles import Font, Fill, PatternFill, Border, Side, Alignment, NamedStyle, Protection
+from openpyxl.styles.borders import DEFAULT_BORDER
+from openpyxl.styles.fonts import DEFAULT_FONT
 from openpyxl.formatting.rule import CellIsRule
 from openpyxl.utils import get_column_letter
 from openpyxl.worksheet.datavalidation import DataValidation
@@ -15,6 +17,96 @@ from datetime import datetime, timedelta
 import calendar
 import random
 
+import work_calendar
+
+
+HEADERS = [
+    "Date", "Day", "Meeting Hrs", "Assigned Hrs", "Completed Hrs",
+    "Complexity Factor", "QA Factor", "Task Failed (Y/N)", 
+    "Leave Taken (Y/N)", "Available Hrs", "% Efficiency", 
+    "Raw Points", "OT Points", "Approved Points"
+]
+COLUMN_WIDTHS = [12, 8, 10, 10, 10, 10, 10, 12, 12, 10, 10, 10, 10, 12]
+EDITABLE_COLUMNS = [3, 4, 5, 6, 7, 8, 9]  # C, D, E, F, G, H, I
+DEFAULT_INPUTS = [0, 9, 9, 1, 1, "N", "N"]  # Meeting, Assigned, Completed, Complexity, QA, Failed, Leave
+COLUMN_NUMBER_FORMATS = {
+    1: "yyyy-mm-dd",                    # Date column
+    3: "0.0", 4: "0.0", 5: "0.0",       # Hours columns
+    6: "0.0", 7: "0.0",                 # Factor columns
+    11: "0.0%",                         # Efficiency percentage
+    12: "0.00", 13: "0.00", 14: "0.00"  # Points columns
+}
+SUMMARY_NUMBER_FORMAT = "₹#,##0.00"
+
+# Named styles, registered once per workbook and applied to cells by name
+HEADER_STYLE = "Tracker Header"
+LABEL_STYLE = "Tracker Label"
+SUMMARY_STYLE = "Tracker Summary"
+SUMMARY_INPUT_STYLE = "Tracker Summary Input"
+
+
+def summary_style(index):
+    """Named style for the summary value at index; only Base Salary stays editable"""
+    return SUMMARY_INPUT_STYLE if index == 2 else SUMMARY_STYLE
+
+
+def data_style_name(col, shaded):
+    """Named style for a daily data cell: input/formula, number format and row shading"""
+    kind = "Input" if col in EDITABLE_COLUMNS else "Formula"
+    shade = " Shaded" if shaded else ""
+    return f"Tracker {kind} {COLUMN_NUMBER_FORMATS.get(col, 'General')}{shade}"
+
+
+# Style names for each column of an unshaded (odd) and shaded (even) data row
+DATA_ROW_STYLES = {
+    shaded: [data_style_name(col, shaded) for col in range(1, len(HEADERS) + 1)]
+    for shaded in (False, True)
+}
+
+
+def tracker_named_styles():
+    """Build the NamedStyle objects used by tracker sheets"""
+    thin_border = Border(
+        left=Side(style='thin'), right=Side(style='thin'),
+        top=Side(style='thin'), bottom=Side(style='thin')
+    )
+    row_fill = PatternFill(start_color="F8F9FA", end_color="F8F9FA", fill_type="solid")
+    locked = Protection(locked=True)
+    unlocked = Protection(locked=False)
+    
+    styles = [
+        NamedStyle(
+            name=HEADER_STYLE,
+            font=Font(bold=True, color="FFFFFF"),
+            fill=PatternFill(start_color="2E86AB", end_color="2E86AB", fill_type="solid"),
+            alignment=Alignment(horizontal="center", vertical="center"),
+            border=thin_border, protection=locked
+        ),
+        NamedStyle(name=LABEL_STYLE, font=Font(bold=True), border=DEFAULT_BORDER, protection=locked),
+        NamedStyle(name=SUMMARY_STYLE, font=DEFAULT_FONT, border=DEFAULT_BORDER,
+                   number_format=SUMMARY_NUMBER_FORMAT, protection=locked),
+        NamedStyle(name=SUMMARY_INPUT_STYLE, font=DEFAULT_FONT, border=DEFAULT_BORDER,
+                   number_format=SUMMARY_NUMBER_FORMAT, protection=unlocked),
+    ]
+    
+    seen = set()
+    for shaded in (False, True):
+        for col in range(1, len(HEADERS) + 1):
+            name = data_style_name(col, shaded)
+            if name in seen:
+                continue
+            seen.add(name)
+            styles.append(NamedStyle(
+                name=name,
+                number_format=COLUMN_NUMBER_FORMATS.get(col, "General"),
+                font=DEFAULT_FONT,
+                fill=row_fill if shaded else PatternFill(),
+                border=thin_border,
+                protection=unlocked if col in EDITABLE_COLUMNS else locked
+            ))
+    
+    return styles
+
 
 class PerformanceTracker:
     def __init__(self):
@@ -26,32 +118,31 @@ class PerformanceTracker:
         if "Sheet" in self.workbook.sheetnames:
             self.workbook.remove(self.workbook["Sheet"])
     
+    def register_styles(self, workbook=None):
+        """Register the tracker's named styles once per workbook"""
+        workbook = workbook or self.workbook
+        if HEADER_STYLE in workbook.named_styles:
+            return
+        for style in tracker_named_styles():
+            workbook.add_named_style(style)
+    
     def get_workdays_for_month(self, year, month):
-        """Get all Monday-Saturday dates for a given month"""
-        workdays = []
-        # Get the first day of the month
-        first_day = datetime(year, month, 1)
-        # Get the last day of the month
-        last_day = datetime(year, month, calendar.monthrange(year, month)[1])
-        
-        current_date = first_day
-        while current_date <= last_day:
-            # Monday = 0, Sunday = 6, so exclude Sunday (6)
-            if current_date.weekday() < 6:  # Monday to Saturday
-                workdays.append(current_date)
-            current_date += timedelta(days=1)
-        
-        return workdays
+        """Get all working days (Monday-Saturday minus company holidays) for a given month"""
+        return [datetime(day.year, day.month, day.day) for day in work_calendar.working_days(year, month)]
     
     def create_employee_sheet(self, employee_name, year=2025, month=8, sample_data=False):
         """Create a new sheet for an employee with performance tracking"""
         
         # Create worksheet
         ws = self.workbook.create_sheet(title=f"{employee_name}_Performance")
+        self.register_styles()
         
         # Get workdays for the month
         workdays = self.get_workdays_for_month(year, month)
         
+        # Apply column widths (cell styles are applied as each cell is written)
+        self.apply_formatting(ws, len(workdays))
+        
         # Set up headers
         self.setup_headers(ws)
         
@@ -61,9 +152,6 @@ class PerformanceTracker:
         # Set up summary section
         self.setup_summary_section(ws, len(workdays))
         
-        # Apply formatting
-        self.apply_formatting(ws, len(workdays))
-        
         # Set up data validation
         self.setup_data_validation(ws, len(workdays))
         
@@ -77,18 +165,21 @@ class PerformanceTracker:
     
     def setup_headers(self, ws):
         """Set up column headers"""
-        headers = [
-            "Date", "Day", "Meeting Hrs", "Assigned Hrs", "Completed Hrs",
-            "Complexity Factor", "QA Factor", "Task Failed (Y/N)", 
-            "Leave Taken (Y/N)", "Available Hrs", "% Efficiency", 
-            "Raw Points", "OT Points", "Approved Points"
+        for col, header in enumerate(HEADERS, 1):
+            ws.cell(row=1, column=col, value=header).style = HEADER_STYLE
+    
+    def daily_row(self, row, day, inputs):
+        """Values for one daily data row: date, day formula, inputs C-I and formulas J-N"""
+        return [
+            day,                                                # Column A: Date
+            f'=TEXT(A{row},"ddd")',                             # Column B: Day (formula)
+            *inputs,                                            # Columns C-I: Input fields
+            f'=IF(I{row}="Y",0,9-C{row})',                      # Column J: Available Hrs
+            f'=IF(J{row}=0,0,E{row}/J{row})',                   # Column K: % Efficiency
+            f'=E{row}*F{row}*G{row}',                           # Column L: Raw Points
+            f'=IF(E{row}>D{row},E{row}-D{row},0)',              # Column M: OT Points
+            f'=IF(H{row}="Y",0,ROUND(K{row}*L{row},2))'         # Column N: Approved Points
         ]
-        
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = Font(bold=True, color="FFFFFF")
-            cell.fill = PatternFill(start_color="2E86AB", end_color="2E86AB", fill_type="solid")
-            cell.alignment = Alignment(horizontal="center", vertical="center")
     
     def setup_daily_data(self, ws, workdays, sample_data=False):
         """Set up daily data rows with formulas"""
@@ -96,12 +187,6 @@ class PerformanceTracker:
         for row_idx, date in enumerate(workdays, 2):
             row = row_idx
             
-            # Column A: Date
-            ws.cell(row=row, column=1, value=date.date())
-            
-            # Column B: Day (formula)
-            ws.cell(row=row, column=2, value=f'=TEXT(A{row},"ddd")')
-            
             # Columns C-I: Input fields with default values
             if sample_data:
                 # Generate realistic sample data
@@ -113,40 +198,17 @@ class PerformanceTracker:
                 task_failed = random.choice(["N", "N", "N", "N", "Y"])  # 20% failure rate
                 leave_taken = random.choice(["N", "N", "N", "N", "N", "N", "Y"])  # ~15% leave rate
                 
-                ws.cell(row=row, column=3, value=meeting_hrs)  # Meeting Hrs
-                ws.cell(row=row, column=4, value=assigned_hrs)  # Assigned Hrs
-                ws.cell(row=row, column=5, value=completed_hrs)  # Completed Hrs
-                ws.cell(row=row, column=6, value=complexity)  # Complexity Factor
-                ws.cell(row=row, column=7, value=qa_factor)  # QA Factor
-                ws.cell(row=row, column=8, value=task_failed)  # Task Failed
-                ws.cell(row=row, column=9, value=leave_taken)  # Leave Taken
+                inputs = [meeting_hrs, assigned_hrs, completed_hrs, complexity,
+                          qa_factor, task_failed, leave_taken]
             else:
-                # Default values
-                ws.cell(row=row, column=3, value=0)      # Meeting Hrs
-                ws.cell(row=row, column=4, value=9)      # Assigned Hrs
-                ws.cell(row=row, column=5, value=9)      # Completed Hrs
-                ws.cell(row=row, column=6, value=1)      # Complexity Factor
-                ws.cell(row=row, column=7, value=1)      # QA Factor
-                ws.cell(row=row, column=8, value="N")    # Task Failed
-                ws.cell(row=row, column=9, value="N")    # Leave Taken
-            
-            # Column J: Available Hrs (formula)
-            ws.cell(row=row, column=10, value=f'=IF(I{row}="Y",0,9-C{row})')
-            
-            # Column K: % Efficiency (formula)
-            ws.cell(row=row, column=11, value=f'=IF(J{row}=0,0,E{row}/J{row})')
-            
-            # Column L: Raw Points (formula)
-            ws.cell(row=row, column=12, value=f'=E{row}*F{row}*G{row}')
+                inputs = DEFAULT_INPUTS
             
-            # Column M: OT Points (formula)
-            ws.cell(row=row, column=13, value=f'=IF(E{row}>D{row},E{row}-D{row},0)')
-            
-            # Column N: Approved Points (formula)
-            ws.cell(row=row, column=14, value=f'=IF(H{row}="Y",0,ROUND(K{row}*L{row},2))')
+            row_styles = DATA_ROW_STYLES[row % 2 == 0]
+            for col, value in enumerate(self.daily_row(row, date.date(), inputs), 1):
+                ws.cell(row=row, column=col, value=value).style = row_styles[col - 1]
     
-    def setup_summary_section(self, ws, num_workdays):
-        """Set up summary calculation section"""
+    def summary_rows(self, num_workdays, base_salary=None):
+        """Summary block labels and values (formulas) placed below the daily data"""
         summary_start_row = num_workdays + 4  # Start 2 rows after data
         
         # Calculate absolute cell references for summary formulas
@@ -157,68 +219,31 @@ class PerformanceTracker:
         monthly_bonus_cell = f"C{summary_start_row + 4}"   # Row 34: Monthly Bonus
         
         # Summary labels and formulas with correct cell references
-        summary_data = [
+        return [
             ("Total Earned Points", f"=SUM(N2:N{num_workdays + 1})"),
             ("Total Workdays", f"=COUNTA(A2:A{num_workdays + 1})"),
-            ("Base Salary (₹)", self.base_salary),
+            ("Base Salary (₹)", self.base_salary if base_salary is None else base_salary),
             ("Bonus Rate per Point (₹)", f"={base_salary_cell}*0.5/({workdays_cell}*10)"),
             ("Monthly Bonus (₹)", f"=MIN({total_points_cell}*{bonus_rate_cell},{base_salary_cell}*0.5)"),
             ("Total Monthly Pay (₹)", f"={base_salary_cell}+{monthly_bonus_cell}")
         ]
+    
+    def setup_summary_section(self, ws, num_workdays):
+        """Set up summary calculation section"""
+        summary_start_row = num_workdays + 4  # Start 2 rows after data
         
-        for i, (label, value) in enumerate(summary_data):
+        for i, (label, value) in enumerate(self.summary_rows(num_workdays)):
             row = summary_start_row + i
-            ws.cell(row=row, column=1, value=label).font = Font(bold=True)
-            
-            if isinstance(value, str) and value.startswith("="):
-                ws.cell(row=row, column=3, value=value)
-            else:
-                ws.cell(row=row, column=3, value=value)
+            ws.cell(row=row, column=1, value=label).style = LABEL_STYLE
+            ws.cell(row=row, column=3, value=value).style = summary_style(i)
     
     def apply_formatting(self, ws, num_workdays):
-        """Apply formatting to the worksheet"""
-        
-        # Set column widths
-        column_widths = [12, 8, 10, 10, 10, 10, 10, 12, 12, 10, 10, 10, 10, 12]
-        for i, width in enumerate(column_widths, 1):
+        """Apply column widths; cell formatting comes from the named styles"""
+        for i, width in enumerate(COLUMN_WIDTHS, 1):
             ws.column_dimensions[get_column_letter(i)].width = width
-        
-        # Format data table
-        for row in range(2, num_workdays + 2):
-            for col in range(1, 15):
-                cell = ws.cell(row=row, column=col)
-                
-                # Alternating row colors
-                if row % 2 == 0:
-                    cell.fill = PatternFill(start_color="F8F9FA", end_color="F8F9FA", fill_type="solid")
-                
-                # Number formatting
-                if col in [3, 4, 5]:  # Hours columns
-                    cell.number_format = "0.0"
-                elif col in [6, 7]:  # Factor columns
-                    cell.number_format = "0.0"
-                elif col == 11:  # Efficiency percentage
-                    cell.number_format = "0.0%"
-                elif col in [12, 13, 14]:  # Points columns
-                    cell.number_format = "0.00"
-        
-        # Format summary section
-        summary_start_row = num_workdays + 4
-        for row in range(summary_start_row, summary_start_row + 6):
-            ws.cell(row=row, column=3).number_format = "₹#,##0.00"
-            
-        # Add borders
-        thin_border = Border(
-            left=Side(style='thin'), right=Side(style='thin'),
-            top=Side(style='thin'), bottom=Side(style='thin')
-        )
-        
-        for row in range(1, num_workdays + 2):
-            for col in range(1, 15):
-                ws.cell(row=row, column=col).border = thin_border
     
-    def setup_data_validation(self, ws, num_workdays):
-        """Set up data validation for input fields"""
+    def data_validations(self, num_workdays):
+        """Data validation rules for the input columns"""
         
         # Validation rules
         validations = [
@@ -229,6 +254,7 @@ class PerformanceTracker:
             (7, "decimal", "0.3,2.0", "QA factor must be between 0.3 and 2.0"),
         ]
         
+        rules = []
         for col, validation_type, formula_range, error_msg in validations:
             dv = DataValidation(type=validation_type, formula1=formula_range.split(',')[0], 
                               formula2=formula_range.split(',')[1])
@@ -236,7 +262,7 @@ class PerformanceTracker:
             dv.errorTitle = "Invalid Input"
             range_string = f"{get_column_letter(col)}2:{get_column_letter(col)}{num_workdays + 1}"
             dv.add(range_string)
-            ws.add_data_validation(dv)
+            rules.append(dv)
         
         # Dropdown validations for Y/N fields
         yn_validation = DataValidation(type="list", formula1='"Y,N"')
@@ -245,52 +271,54 @@ class PerformanceTracker:
         
         # Task Failed column
         yn_validation.add(f"H2:H{num_workdays + 1}")
-        ws.add_data_validation(yn_validation)
+        rules.append(yn_validation)
         
         # Leave Taken column
         yn_validation2 = DataValidation(type="list", formula1='"Y,N"')
         yn_validation2.error = "Please select Y or N"
         yn_validation2.errorTitle = "Invalid Selection"
         yn_validation2.add(f"I2:I{num_workdays + 1}")
-        ws.add_data_validation(yn_validation2)
+        rules.append(yn_validation2)
+        
+        return rules
     
-    def apply_conditional_formatting(self, ws, num_workdays):
-        """Apply conditional formatting"""
+    def setup_data_validation(self, ws, num_workdays):
+        """Set up data validation for input fields"""
+        for dv in self.data_validations(num_workdays):
+            ws.add_data_validation(dv)
+    
+    def conditional_formatting_rules(self, num_workdays):
+        """Conditional formatting rules as (cell range, rule) pairs"""
         
         # Red highlighting for Task Failed = "Y"
         red_fill = PatternFill(start_color="FFEBEE", end_color="FFEBEE", fill_type="solid")
         task_failed_rule = CellIsRule(operator="equal", formula=['"Y"'], fill=red_fill)
-        ws.conditional_formatting.add(f"H2:H{num_workdays + 1}", task_failed_rule)
         
         # Orange highlighting for Leave Taken = "Y"
         orange_fill = PatternFill(start_color="FFF3E0", end_color="FFF3E0", fill_type="solid")
         leave_rule = CellIsRule(operator="equal", formula=['"Y"'], fill=orange_fill)
-        ws.conditional_formatting.add(f"I2:I{num_workdays + 1}", leave_rule)
         
         # Green highlighting for efficiency > 100%
         green_fill = PatternFill(start_color="E8F5E8", end_color="E8F5E8", fill_type="solid")
         efficiency_rule = CellIsRule(operator="greaterThan", formula=["1"], fill=green_fill)
-        ws.conditional_formatting.add(f"K2:K{num_workdays + 1}", efficiency_rule)
+        
+        return [
+            (f"H2:H{num_workdays + 1}", task_failed_rule),
+            (f"I2:I{num_workdays + 1}", leave_rule),
+            (f"K2:K{num_workdays + 1}", efficiency_rule),
+        ]
+    
+    def apply_conditional_formatting(self, ws, num_workdays):
+        """Apply conditional formatting"""
+        for cell_range, rule in self.conditional_formatting_rules(num_workdays):
+            ws.conditional_formatting.add(cell_range, rule)
     
     def setup_protection(self, ws, num_workdays):
-        """Set up cell protection and sheet protection"""
-        
-        # First, lock all cells
-        for row in ws.iter_rows():
-            for cell in row:
-                cell.protection = openpyxl.styles.Protection(locked=True)
-        
-        # Unlock editable cells
-        editable_columns = [3, 4, 5, 6, 7, 8, 9]  # C, D, E, F, G, H, I
-        for col in editable_columns:
-            for row in range(2, num_workdays + 2):
-                ws.cell(row=row, column=col).protection = openpyxl.styles.Protection(locked=False)
-        
-        # Unlock Base Salary cell in summary
-        summary_start_row = num_workdays + 4
-        ws.cell(row=summary_start_row + 2, column=3).protection = openpyxl.styles.Protection(locked=False)
-        
-        # Protect the sheet
+        """Set up sheet protection; cell locking comes from the named styles"""
+        self.protect_sheet(ws)
+    
+    def protect_sheet(self, ws):
+        """Enable password protection on the sheet structure"""
         ws.protection.sheet = True
         ws.protection.password = self.password
         ws.protection.formatCells = False
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Server-Sent Events Broadcaster
+In-process fan-out of compact change events to /api/stream subscribers. Each
+subscriber owns a bounded queue, so a slow client can only lose its own events
+(it is told to resync) and never blocks the request that published them.
+Thread-safe for threaded servers (gunicorn gthread, Werkzeug); each worker
+process fans out the events published by its own requests
+"""
+
+import json
+import logging
+import os
+import queue
+import threading
+import uuid
+from collections import deque
+
+STREAM_HEARTBEAT_SECONDS = 15  # Keeps proxies open and detects disconnected clients
+STREAM_RETRY_MS = 5000
+STREAM_QUEUE_SIZE = 100
+STREAM_HISTORY_SIZE = 500  # Events replayed to clients reconnecting with Last-Event-ID
+STREAM_MAX_CLIENTS = int(os.environ.get('STREAM_MAX_CLIENTS', 48))  # Below the 64 gunicorn threads, so streams never hold them all
+
+RESYNC = 'resync'
+
+logger = logging.getLogger('performance')
+
+
+class StreamFull(Exception):
+    """Connection limit reached; each open stream holds a server thread"""
+
+
+class Subscriber:
+    def __init__(self, queue_size=STREAM_QUEUE_SIZE):
+        self.events = queue.Queue(maxsize=queue_size)
+        self.lagging = False  # Missed events; must refetch instead of patching
+
+
+class Broadcaster:
+    def __init__(self, history_size=STREAM_HISTORY_SIZE, max_clients=STREAM_MAX_CLIENTS):
+        self.lock = threading.Lock()
+        self.subscribers = set()
+        self.history = deque(maxlen=history_size)
+        self.max_clients = max_clients
+        self.epoch = uuid.uuid4().hex[:8]  # Event ids from another process or run force a resync
+        self.sequence = 0
+
+    def event_id(self, sequence):
+        return f"{self.epoch}-{sequence}"
+
+    def publish(self, event_type, payload):
+        """
+        Send an event to every subscriber; payload may be a callable so the
+        work of building it is skipped while nobody is listening (reconnecting
+        clients then see a gap and resync)
+        """
+        if callable(payload):
+            try:
+                payload = payload() if self.subscribers else None
+            except Exception as e:  # The write already committed; subscribers resync instead
+                logger.warning(f"Could not build {event_type} event: {e}")
+                payload = None
+
+        with self.lock:
+            self.sequence += 1
+            event = (self.event_id(self.sequence), event_type,
+                     None if payload is None else json.dumps(payload, separators=(',', ':')))
+            self.history.append(event)
+            for subscriber in self.subscribers:
+                try:
+                    subscriber.events.put_nowait(event)
+                except queue.Full:
+                    subscriber.lagging = True
+
+    def subscribe(self, last_event_id=None):
+        """Register a subscriber, queueing the events it missed since last_event_id"""
+        with self.lock:
+            if len(self.subscribers) >= self.max_clients:
+                raise StreamFull()
+            subscriber = Subscriber()
+
+            if last_event_id:
+                missed = self.replay(last_event_id)
+                if missed is None:
+                    subscriber.lagging = True
+                for event in missed or ():
+                    subscriber.events.put_nowait(event)
+
+            self.subscribers.add(subscriber)
+            return subscriber
+
+    def replay(self, last_event_id):
+        """Events published after last_event_id, or None when they cannot all be replayed"""
+        epoch, _, sequence = last_event_id.partition('-')
+        if epoch != self.epoch or not sequence.isdigit() or int(sequence) > self.sequence:
+            return None
+        first = self.sequence - len(self.history) + 1  # Sequence number of history[0]
+        missed = list(self.history)[max(int(sequence) + 1 - first, 0):]
+        if (int(sequence) + 1 < first or len(missed) > STREAM_QUEUE_SIZE
+                or any(data is None for _, _, data in missed)):
+            return None
+        return missed
+
+    def unsubscribe(self, subscriber):
+        with self.lock:
+            self.subscribers.discard(subscriber)
+
+    def stream(self, subscriber):
+        """SSE body for one subscriber; unsubscribes when the client goes away"""
+        try:
+            yield f"retry: {STREAM_RETRY_MS}\n\n"
+            while True:
+                if subscriber.lagging:
+                    subscriber.lagging = False
+                    while not subscriber.events.empty():
+                        subscriber.events.get_nowait()
+                    yield format_event(self.event_id(self.sequence), RESYNC, '{}')
+                    continue
+                try:
+                    event_id, event_type, data = subscriber.events.get(timeout=STREAM_HEARTBEAT_SECONDS)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                if data is None:
+                    subscriber.lagging = True
+                    continue
+                yield format_event(event_id, event_type, data)
+        finally:
+            self.unsubscribe(subscriber)
+
+
+def format_event(event_id, event_type, data):
+    return f"id: {event_id}\nevent: {event_type}\ndata: {data}\n\n"
+
+
+broadcaster = Broadcaster()
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Streaming Excel Export
+Writes PerformanceTracker-layout workbooks in openpyxl write-only mode and streams
+the .xlsx archive to the client in chunks while later sheets are still being built
+"""
+
+import itertools
+import queue
+import re
+import threading
+from contextlib import nullcontext
+from zipfile import ZipFile, ZIP_DEFLATED
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.utils import get_column_letter
+from openpyxl.workbook.protection import WorkbookProtection
+from openpyxl.worksheet.datavalidation import DataValidationList
+from openpyxl.formatting.formatting import ConditionalFormattingList
+from openpyxl.writer.excel import ExcelWriter
+
+from employee_performance_tracker import (
+    PerformanceTracker, HEADERS, COLUMN_WIDTHS, HEADER_STYLE, LABEL_STYLE,
+    DATA_ROW_STYLES, summary_style
+)
+
+XLSX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+STREAM_CHUNK_SIZE = 64 * 1024
+STREAM_QUEUE_DEPTH = 16
+MAX_SHEET_TITLE = 31
+SHEET_SUFFIX = "_Performance"
+BLANK_INPUTS = [None] * 7  # Workdays without a recorded entry
+
+class ExportCancelled(Exception):
+    """Raised on the producer thread when the client stops reading the stream"""
+
+
+class _Done:
+    """Queue sentinel marking the end of the archive"""
+
+
+class ChunkStream:
+    """Write-only, non-seekable file object that hands fixed-size chunks to a bounded queue"""
+
+    def __init__(self, chunks, cancelled, chunk_size=STREAM_CHUNK_SIZE):
+        self._chunks = chunks
+        self._cancelled = cancelled
+        self._chunk_size = chunk_size
+        self._buffer = bytearray()
+        self._abandoned = False
+
+    def write(self, data):
+        if self._abandoned:  # Late writes (e.g. ZipFile finalizer) after cancellation
+            return len(data)
+        self._buffer += data
+        while len(self._buffer) >= self._chunk_size:
+            self.put(bytes(self._buffer[:self._chunk_size]))
+            del self._buffer[:self._chunk_size]
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def finish(self):
+        """Send whatever is left in the buffer followed by the end marker"""
+        if self._buffer:
+            self.put(bytes(self._buffer))
+            self._buffer.clear()
+        self.put(_Done)
+
+    def put(self, item):
+        """Blocking put that gives up once the consumer has gone away"""
+        while True:
+            if self._cancelled.is_set():
+                self._abandoned = True
+                raise ExportCancelled()
+            try:
+                self._chunks.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+
+class StreamingExcelWriter(ExcelWriter):
+    """ExcelWriter that fills each write-only sheet just before it is archived"""
+
+    def __init__(self, workbook, archive, populate):
+        super().__init__(workbook, archive)
+        self._populate = populate
+
+    def write_worksheet(self, ws):
+        self._populate(ws)
+        super().write_worksheet(ws)
+
+        # Sheet XML is in the archive now; drop per-sheet rule objects
+        ws.data_validations = DataValidationList()
+        ws.conditional_formatting = ConditionalFormattingList()
+
+
+def write_workbook(build, fileobj):
+    """
+    Write a write-only workbook to a path or file object
+    build(workbook) creates the (empty) sheets and returns a populate(ws) callback
+    that fills each sheet just before it is archived
+    """
+    workbook = Workbook(write_only=True)
+    populate = build(workbook)
+    archive = ZipFile(fileobj, 'w', ZIP_DEFLATED, allowZip64=True)
+    StreamingExcelWriter(workbook, archive, populate).save()
+
+
+def stream_workbook(build, context=None, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Generate an .xlsx archive as a stream of byte chunks
+    The workbook is written on a background thread inside context() so the
+    download can start while later sheets are still being generated
+    """
+    chunks = queue.Queue(maxsize=STREAM_QUEUE_DEPTH)
+    cancelled = threading.Event()
+
+    def produce():
+        stream = ChunkStream(chunks, cancelled, chunk_size)
+        try:
+            with (context() if context else nullcontext()):
+                write_workbook(build, stream)
+            stream.finish()
+        except ExportCancelled:
+            return
+        except Exception as e:
+            try:
+                stream.put(e)
+            except ExportCancelled:
+                return
+
+    producer = threading.Thread(target=produce, name='excel-export', daemon=True)
+    producer.start()
+
+    try:
+        while True:
+            item = chunks.get()
+            if item is _Done:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        cancelled.set()
+
+
+def sheet_title(employee_name, employee_code, taken):
+    """Unique, Excel-safe '<Name>_Performance' sheet title"""
+    room = MAX_SHEET_TITLE - len(SHEET_SUFFIX)
+    base = re.sub(r"[\[\]:*?/\\']", "", employee_name).strip().replace(" ", "_")[:room]
+    title = f"{base}{SHEET_SUFFIX}"
+    if not base or title.lower() in taken:
+        title = f"{employee_code[:room]}{SHEET_SUFFIX}"
+    taken.add(title.lower())
+    return title
+
+
+def performance_inputs(record):
+    """Input columns C-I of the tracker sheet for one DailyPerformance record"""
+    return [
+        record.meeting_hrs, record.assigned_hrs, record.completed_hrs,
+        record.complexity_factor, record.qa_factor,
+        "Y" if record.task_failed else "N",
+        "Y" if record.leave_taken else "N"
+    ]
+
+
+def _cell(ws, value, style):
+    cell = WriteOnlyCell(ws, value=value)
+    cell.style = style
+    return cell
+
+
+def write_employee_sheet(ws, tracker, workdays, inputs_by_date, base_salary, missing_inputs=BLANK_INPUTS):
+    """
+    Fill a write-only worksheet with the same columns, formulas, formatting,
+    validation and protection as PerformanceTracker.create_employee_sheet
+    """
+    num_workdays = len(workdays)
+
+    # Column widths must be set before the first row is written
+    for i, width in enumerate(COLUMN_WIDTHS, 1):
+        ws.column_dimensions[get_column_letter(i)].width = width
+
+    ws.append([_cell(ws, header, HEADER_STYLE) for header in HEADERS])
+
+    for row, day in enumerate(workdays, 2):
+        values = tracker.daily_row(row, day, inputs_by_date.get(day, missing_inputs))
+        ws.append([_cell(ws, value, style) for value, style in zip(values, DATA_ROW_STYLES[row % 2 == 0])])
+
+    # Summary block starts 2 rows after the data
+    ws.append([])
+    ws.append([])
+    for i, (label, value) in enumerate(tracker.summary_rows(num_workdays, base_salary)):
+        ws.append([_cell(ws, label, LABEL_STYLE), None, _cell(ws, value, summary_style(i))])
+
+    for dv in tracker.data_validations(num_workdays):
+        ws.data_validations.append(dv)
+    for cell_range, rule in tracker.conditional_formatting_rules(num_workdays):
+        ws.conditional_formatting.add(cell_range, rule)
+    tracker.protect_sheet(ws)
+
+
+def build_performance_workbook(workbook, employees, performance_records, workdays,
+                               missing_inputs=BLANK_INPUTS, titles=None):
+    """
+    Create one tracker sheet per employee and return the populate callback
+    employees: (id, name, employee_id, base_salary) rows ordered by id
+    performance_records: DailyPerformance input rows ordered by (employee_id, date),
+    consumed lazily in lockstep with the sheets
+    missing_inputs fills workdays without a record; titles overrides the sheet names
+    """
+    tracker = PerformanceTracker()
+    tracker.register_styles(workbook)
+    workbook.security = WorkbookProtection(workbookPassword=tracker.password, lockStructure=True)
+
+    if titles is None:
+        taken = set()
+        titles = [sheet_title(employee.name, employee.employee_id, taken) for employee in employees]
+    pending = iter(employees)
+    for title in titles:
+        workbook.create_sheet(title=title)
+
+    groups = itertools.groupby(performance_records, key=lambda record: record.employee_id)
+    lookahead = [next(groups, None)]
+
+    def populate(ws):
+        employee = next(pending)
+
+        # Skip records of employees that have no sheet, then take this employee's
+        while lookahead[0] is not None and lookahead[0][0] < employee.id:
+            lookahead[0] = next(groups, None)
+        inputs_by_date = {}
+        if lookahead[0] is not None and lookahead[0][0] == employee.id:
+            inputs_by_date = {record.date: performance_inputs(record) for record in lookahead[0][1]}
+            lookahead[0] = next(groups, None)
+
+        write_employee_sheet(ws, tracker, workdays, inputs_by_date, employee.base_salary, missing_inputs)
+
+    return populate
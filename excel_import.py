@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Streaming Excel Import
+Reads filled-in PerformanceTracker workbooks in openpyxl read-only mode and turns
+the input columns C-I of every *_Performance sheet back into performance payloads
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from datetime import date, datetime
+
+import openpyxl
+
+from excel_export import SHEET_SUFFIX
+
+INPUT_FIELDS = (  # Columns C-I
+    'meeting_hrs', 'assigned_hrs', 'completed_hrs', 'complexity_factor',
+    'qa_factor', 'task_failed', 'leave_taken'
+)
+FLAG_FIELDS = ('task_failed', 'leave_taken')
+
+
+def find_workbooks(paths):
+    """Expand files and directories (searched recursively) into .xlsx paths"""
+    workbooks = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                workbooks.extend(os.path.join(root, f) for f in sorted(files)
+                                 if f.endswith('.xlsx') and not f.startswith('~$'))
+        else:
+            workbooks.append(path)
+    return workbooks
+
+
+def read_tracker_sheet(ws):
+    """
+    Payloads for the filled-in daily rows of one tracker sheet
+    Rows whose inputs are all blank are skipped; returns (records, errors)
+    """
+    records, errors = [], []
+
+    for row_idx, row in enumerate(ws.iter_rows(min_row=2, max_col=9, values_only=True), 2):
+        day = row[0] if row else None
+        if day is None:
+            break  # Blank row above the summary section
+
+        inputs = row[2:9]
+        if all(value is None or value == '' for value in inputs):
+            continue
+        if not isinstance(day, (datetime, date)):
+            errors.append((row_idx, f"Date cell holds {day!r}, not a date"))
+            continue
+
+        record = {'date': day.strftime('%Y-%m-%d'), 'row': row_idx}
+        for field, value in zip(INPUT_FIELDS, inputs):
+            if field in FLAG_FIELDS:
+                flag = str(value if value is not None else 'N').strip().upper()
+                if flag not in ('Y', 'N'):
+                    errors.append((row_idx, f"{field} must be Y or N, got {value!r}"))
+                    break
+                record[field] = flag == 'Y'
+            elif value is not None and value != '':
+                record[field] = value
+        else:
+            records.append(record)
+
+    return records, errors
+
+
+def read_tracker_workbook(path):
+    """Worker: parse every tracker sheet of one workbook (read-only, one sheet at a time)"""
+    result = {'file': path, 'sheets': [], 'error': None}
+    try:
+        wb = openpyxl.load_workbook(path, read_only=True)
+    except Exception as e:
+        result['error'] = f"cannot open workbook: {e}"
+        return result
+
+    try:
+        for ws in wb.worksheets:
+            if not ws.title.endswith(SHEET_SUFFIX):
+                continue
+            records, errors = read_tracker_sheet(ws)
+            result['sheets'].append({
+                'title': ws.title,
+                'employee_key': ws.title[:-len(SHEET_SUFFIX)],
+                'records': records,
+                'errors': errors
+            })
+    except Exception as e:
+        result['error'] = f"cannot read workbook: {e}"
+    finally:
+        wb.close()
+
+    return result
+
+
+def iter_parsed_workbooks(paths, workers=None):
+    """
+    Parse workbooks in worker processes and yield results as they finish
+    At most two workbooks per worker are in flight, so memory stays bounded
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(paths) == 1:
+        for path in paths:
+            yield read_tracker_workbook(path)
+        return
+
+    pending = iter(paths)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = set()
+        while True:
+            while len(in_flight) < workers * 2:
+                path = next(pending, None)
+                if path is None:
+                    break
+                in_flight.add(pool.submit(read_tracker_workbook, path))
+            if not in_flight:
+                return
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
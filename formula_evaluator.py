@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Tracker Formula Evaluator
+Pure-Python evaluation of the formula subset PerformanceTracker writes
+(IF, ROUND, SUM, COUNTA, MIN, TEXT, arithmetic, comparisons and cell references),
+so workbooks can be checked without Excel or LibreOffice recalculating them first
+"""
+
+import re
+from datetime import date, datetime
+from decimal import Decimal, ROUND_HALF_UP
+
+from openpyxl.utils import column_index_from_string
+
+TOKEN_PATTERN = re.compile(r'''
+    \s*(?:
+        (?P<number>\d+(?:\.\d*)?(?:[eE][+-]?\d+)?|\.\d+)
+      | (?P<string>"(?:[^"]|"")*")
+      | (?P<range>\$?[A-Z]{1,3}\$?\d+:\$?[A-Z]{1,3}\$?\d+)
+      | (?P<ref>\$?[A-Z]{1,3}\$?\d+)
+      | (?P<func>[A-Z][A-Z0-9.]*)\(
+      | (?P<op><>|>=|<=|[-+*/^&=<>(),])
+    )''', re.VERBOSE)
+CELL_PATTERN = re.compile(r'\$?([A-Z]{1,3})\$?(\d+)')
+
+COMPARISONS = {
+    '=': lambda a, b: a == b,
+    '<>': lambda a, b: a != b,
+    '<': lambda a, b: a < b,
+    '>': lambda a, b: a > b,
+    '<=': lambda a, b: a <= b,
+    '>=': lambda a, b: a >= b,
+}
+
+
+class FormulaError(Exception):
+    """Formula uses syntax or a function outside the tracker's formula set"""
+
+
+class ExcelError:
+    """Excel error value such as #DIV/0!, propagated through calculations"""
+
+    def __init__(self, code):
+        self.code = code
+
+    def __eq__(self, other):
+        return isinstance(other, ExcelError) and other.code == self.code
+
+    def __hash__(self):
+        return hash(self.code)
+
+    def __repr__(self):
+        return self.code
+
+
+DIV0 = ExcelError('#DIV/0!')
+VALUE = ExcelError('#VALUE!')
+
+
+def parse_cell(reference):
+    """'C12' -> (row, column)"""
+    column, row = CELL_PATTERN.fullmatch(reference).groups()
+    return int(row), column_index_from_string(column)
+
+
+def tokenize(formula):
+    tokens, position = [], 0
+    text = formula[1:] if formula.startswith('=') else formula
+    while position < len(text):
+        match = TOKEN_PATTERN.match(text, position)
+        if not match or match.end() == position:
+            if text[position:].strip():
+                raise FormulaError(f"Unsupported syntax at {text[position:]!r} in {formula}")
+            break
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+        position = match.end()
+    return tokens
+
+
+# Parsing: formulas become small nested tuples evaluated against a cell lookup
+class Parser:
+    def __init__(self, formula):
+        self.formula = formula
+        self.tokens = tokenize(formula)
+        self.position = 0
+
+    def parse(self):
+        node = self.comparison()
+        if self.position != len(self.tokens):
+            raise FormulaError(f"Unexpected {self.tokens[self.position][1]!r} in {self.formula}")
+        return node
+
+    def peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else (None, None)
+
+    def take(self, value=None):
+        kind, text = self.peek()
+        if kind is None or (value is not None and text != value):
+            raise FormulaError(f"Expected {value or 'a value'} in {self.formula}")
+        self.position += 1
+        return kind, text
+
+    def comparison(self):
+        node = self.concatenation()
+        while self.peek()[0] == 'op' and self.peek()[1] in COMPARISONS:
+            _, op = self.take()
+            node = ('compare', op, node, self.concatenation())
+        return node
+
+    def concatenation(self):
+        node = self.additive()
+        while self.peek() == ('op', '&'):
+            self.take()
+            node = ('concat', node, self.additive())
+        return node
+
+    def additive(self):
+        node = self.multiplicative()
+        while self.peek() in (('op', '+'), ('op', '-')):
+            _, op = self.take()
+            node = ('arith', op, node, self.multiplicative())
+        return node
+
+    def multiplicative(self):
+        node = self.unary()
+        while self.peek() in (('op', '*'), ('op', '/')):
+            _, op = self.take()
+            node = ('arith', op, node, self.unary())
+        return node
+
+    def unary(self):
+        if self.peek() in (('op', '-'), ('op', '+')):
+            _, op = self.take()
+            operand = self.unary()
+            return ('arith', '*', ('value', -1.0), operand) if op == '-' else operand
+        return self.primary()
+
+    def primary(self):
+        kind, text = self.take()
+        if kind == 'number':
+            return ('value', float(text))
+        if kind == 'string':
+            return ('value', text[1:-1].replace('""', '"'))
+        if kind == 'ref':
+            return ('ref', parse_cell(text))
+        if kind == 'range':
+            start, end = text.split(':')
+            return ('range', parse_cell(start), parse_cell(end))
+        if kind == 'func':
+            args = []
+            if self.peek() != ('op', ')'):
+                args.append(self.comparison())
+                while self.peek() == ('op', ','):
+                    self.take()
+                    args.append(self.comparison())
+            self.take(')')
+            if text not in FUNCTIONS:
+                raise FormulaError(f"Unsupported function {text} in {self.formula}")
+            return ('call', text, args)
+        if (kind, text) == ('op', '('):
+            node = self.comparison()
+            self.take(')')
+            return node
+        raise FormulaError(f"Unexpected {text!r} in {self.formula}")
+
+
+# Excel value semantics
+def to_number(value):
+    if isinstance(value, ExcelError):
+        return value
+    if value is None or value == '':
+        return 0.0
+    if isinstance(value, bool):
+        return 1.0 if value else 0.0
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return float(excel_serial(value))
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return VALUE
+
+
+def excel_serial(value):
+    """Days since 1899-12-30, Excel's date serial number"""
+    day = value.date() if isinstance(value, datetime) else value
+    return (day - date(1899, 12, 30)).days
+
+
+def compare(op, left, right):
+    """Excel comparison: blanks match 0 or "", text is case-insensitive and sorts after numbers"""
+    if left is None:
+        left = '' if isinstance(right, str) else 0.0
+    if right is None:
+        right = '' if isinstance(left, str) else 0.0
+
+    def key(value):
+        return (1, value.lower()) if isinstance(value, str) else (0, to_number(value))
+
+    return COMPARISONS[op](key(left), key(right))
+
+
+def excel_round(value, digits):
+    """ROUND(): half away from zero, like Excel (Python's round() is half-to-even)"""
+    quantum = Decimal(1).scaleb(-int(digits))
+    return float(Decimal(repr(value)).quantize(quantum, rounding=ROUND_HALF_UP))
+
+
+def excel_text(value, format_code):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        value = date.fromordinal(date(1899, 12, 30).toordinal() + int(value))
+    if not isinstance(value, (datetime, date)):
+        return VALUE
+    formats = {'ddd': '%a', 'dddd': '%A', 'yyyy-mm-dd': '%Y-%m-%d', 'dd/mm/yyyy': '%d/%m/%Y'}
+    if format_code.lower() not in formats:
+        raise FormulaError(f"Unsupported TEXT format {format_code!r}")
+    return value.strftime(formats[format_code.lower()])
+
+
+def first_error(values):
+    return next((v for v in values if isinstance(v, ExcelError)), None)
+
+
+def fn_if(evaluate, args):
+    condition = evaluate(args[0])
+    if isinstance(condition, ExcelError):
+        return condition
+    branch = args[1] if to_number(condition) else (args[2] if len(args) > 2 else ('value', False))
+    return evaluate(branch)
+
+
+def fn_round(evaluate, args):
+    value, digits = to_number(evaluate(args[0])), to_number(evaluate(args[1]))
+    return first_error([value, digits]) or excel_round(value, digits)
+
+
+def fn_sum(evaluate, args):
+    values = [v for arg in args for v in evaluate_args(evaluate, arg)]
+    numbers = [to_number(v) for v in values if isinstance(v, (int, float, ExcelError)) and not isinstance(v, bool)]
+    return first_error(numbers) or sum(numbers)
+
+
+def fn_min(evaluate, args):
+    values = [v for arg in args for v in evaluate_args(evaluate, arg)]
+    numbers = [to_number(v) for v in values if v is not None and not isinstance(v, str)]
+    return first_error(numbers) or (min(numbers) if numbers else 0.0)
+
+
+def fn_counta(evaluate, args):
+    return float(sum(1 for arg in args for v in evaluate_args(evaluate, arg) if v is not None and v != ''))
+
+
+def fn_text(evaluate, args):
+    value, format_code = evaluate(args[0]), evaluate(args[1])
+    return first_error([value]) or excel_text(value, format_code)
+
+
+FUNCTIONS = {
+    'IF': fn_if, 'ROUND': fn_round, 'SUM': fn_sum,
+    'MIN': fn_min, 'COUNTA': fn_counta, 'TEXT': fn_text,
+}
+
+
+def evaluate_args(evaluate, node):
+    """Values of a function argument; ranges expand to all their cells"""
+    if node[0] == 'range':
+        return evaluate(node)
+    return [evaluate(node)]
+
+
+class SheetEvaluator:
+    """
+    Evaluates the formulas of one worksheet
+    cells maps (row, column) -> value or formula string; results are memoized
+    """
+
+    def __init__(self, cells):
+        self.cells = cells
+        self.results = {}
+        self.parsed = {}
+
+    def value(self, row, column):
+        key = (row, column)
+        if key in self.results:
+            return self.results[key]
+        raw = self.cells.get(key)
+        if isinstance(raw, str) and raw.startswith('='):
+            self.results[key] = VALUE  # Guards against circular references
+            self.results[key] = self.evaluate(self.parse(raw))
+        else:
+            self.results[key] = raw
+        return self.results[key]
+
+    def parse(self, formula):
+        if formula not in self.parsed:
+            self.parsed[formula] = Parser(formula).parse()
+        return self.parsed[formula]
+
+    def evaluate(self, node):
+        kind = node[0]
+        if kind == 'value':
+            return node[1]
+        if kind == 'ref':
+            return self.value(*node[1])
+        if kind == 'range':
+            (top, left), (bottom, right) = node[1], node[2]
+            return [self.value(r, c) for r in range(top, bottom + 1) for c in range(left, right + 1)]
+        if kind == 'call':
+            return FUNCTIONS[node[1]](self.evaluate, node[2])
+        if kind == 'concat':
+            parts = [self.evaluate(node[1]), self.evaluate(node[2])]
+            return first_error(parts) or ''.join('' if p is None else str(p) for p in parts)
+        if kind == 'compare':
+            left, right = self.evaluate(node[2]), self.evaluate(node[3])
+            return first_error([left, right]) or compare(node[1], left, right)
+        if kind == 'arith':
+            left, right = to_number(self.evaluate(node[2])), to_number(self.evaluate(node[3]))
+            error = first_error([left, right])
+            if error:
+                return error
+            op = node[1]
+            if op == '+':
+                return left + right
+            if op == '-':
+                return left - right
+            if op == '*':
+                return left * right
+            return DIV0 if right == 0 else left / right
+        raise FormulaError(f"Unknown node {kind}")
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Performance Scoring Rules
+The daily points engine and the monthly bonus maths, kept free of Flask and
+the database so validate_formulas pool workers can import them without
+loading the web app
+"""
+
+
+def calculate_performance_metrics(performance):
+    """
+    Enterprise-grade performance calculation engine
+    Implements the sophisticated bonus calculation algorithm
+    """
+    
+    # Step 1: Calculate Available Working Hours
+    if performance.leave_taken:
+        performance.available_hrs = 0
+    else:
+        performance.available_hrs = max(0, 9 - performance.meeting_hrs)
+    
+    # Step 2: Calculate Work Efficiency Ratio
+    if performance.available_hrs == 0:
+        performance.efficiency = 0
+    else:
+        performance.efficiency = min(2.0, performance.completed_hrs / performance.available_hrs)
+    
+    # Step 3: Calculate Raw Performance Points
+    performance.raw_points = (
+        performance.completed_hrs * 
+        performance.complexity_factor * 
+        performance.qa_factor
+    )
+    
+    # Step 4: Calculate Overtime Contribution
+    performance.ot_points = max(0, performance.completed_hrs - performance.assigned_hrs)
+    
+    # Step 5: Apply Quality Gates and Calculate Final Points
+    if performance.task_failed:
+        performance.approved_points = 0  # Quality gate: Failed tasks = 0 points
+    else:
+        performance.approved_points = round(
+            performance.efficiency * performance.raw_points, 2
+        )
+    
+    return performance
+
+
+def summary_financials(totals, base_salary, total_workdays):
+    """Averages, bonus and compensation figures derived from month running totals"""
+    work_days = totals['recorded_days'] - totals['leave_days']
+    avg_efficiency = totals['efficiency_sum'] / work_days if work_days > 0 else 0
+    
+    # Financial Calculations
+    max_possible_points = total_workdays * 10  # 10 points per day maximum
+    max_bonus_amount = base_salary * 0.5  # 50% salary cap
+    
+    if max_possible_points > 0:
+        bonus_rate_per_point = max_bonus_amount / max_possible_points
+        calculated_bonus = totals['total_points'] * bonus_rate_per_point
+        final_bonus = min(calculated_bonus, max_bonus_amount)
+    else:
+        bonus_rate_per_point = 0
+        calculated_bonus = 0
+        final_bonus = 0
+    
+    return {
+        'total_workdays': total_workdays,
+        'avg_efficiency': avg_efficiency,
+        'base_salary': base_salary,
+        'bonus_rate': bonus_rate_per_point,
+        'calculated_bonus': calculated_bonus,
+        'final_bonus': final_bonus,
+        'total_compensation': base_salary + final_bonus
+    }
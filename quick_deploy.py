@@ -34,8 +34,8 @@ def prepare_for_deployment():
     
     # Check required files
     required_files = {
-        'Procfile': 'web: gunicorn run:app --host 0.0.0.0 --port $PORT',
-        'railway.json': '{"build": {"builder": "NIXPACKS"}, "deploy": {"startCommand": "gunicorn run:app --host 0.0.0.0 --port $PORT"}}',
+        'Procfile': 'web: gunicorn run:app --worker-class gthread --workers 1 --threads 64 --bind 0.0.0.0:$PORT',
+        'railway.json': '{"build": {"builder": "NIXPACKS"}, "deploy": {"startCommand": "gunicorn run:app --worker-class gthread --workers 1 --threads 64 --bind 0.0.0.0:$PORT"}}',
         'runtime.txt': 'python-3.11.0'
     }
     
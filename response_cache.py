@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Analytics Response Cache
+Caches JSON API responses keyed by (endpoint, parameters, month). Writes never
+delete entries: they bump generation counters for the affected month and
+department, and those counters are part of every key, so stale entries become
+unreachable at once and age out of the LRU/TTL store (or expire in Redis).
+ETags hash the response body (and the counters, when Redis shares them), so every
+worker tags the same data alike and clients can revalidate with If-None-Match.
+Responses read from a lagging replica are keyed apart from primary ones and kept
+no longer than the read-your-writes window, so they never reach a client that
+just wrote and go stale for at most that long
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from functools import wraps
+
+from flask import request, make_response
+
+import database_config
+
+CACHE_TTL_SECONDS = int(os.environ.get('CACHE_TTL_SECONDS', 300))  # 0 disables caching
+CACHE_MAX_ENTRIES = int(os.environ.get('CACHE_MAX_ENTRIES', 1024))
+CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL')  # e.g. redis://localhost:6379/0
+CACHED_HEADERS = ('X-Total-Count',)
+ALL_MONTHS = 'all'
+ALL_DEPARTMENTS = '*'
+
+logger = logging.getLogger('performance')
+
+
+class MemoryBackend:
+    """In-process LRU with a per-entry TTL; generations are plain counters"""
+
+    shared = False  # Counters are per process
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.generations = {}
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + (ttl or self.ttl), value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def current_generations(self, names):
+        with self.lock:
+            return [self.generations.get(name, 0) for name in names]
+
+    def bump(self, names):
+        with self.lock:
+            for name in names:
+                self.generations[name] = self.generations.get(name, 0) + 1
+
+
+class RedisBackend:
+    """Redis store shared by every worker process; generations are INCR counters"""
+
+    PREFIX = 'performancepro:cache:'
+    shared = True
+
+    def __init__(self, url, ttl=CACHE_TTL_SECONDS):
+        import redis  # Optional dependency, only needed when CACHE_REDIS_URL is set
+
+        self.client = redis.Redis.from_url(url, socket_timeout=0.5)
+        self.ttl = ttl
+
+    def get(self, key):
+        raw = self.client.get(self.PREFIX + 'entry:' + key)
+        return json.loads(raw) if raw else None
+
+    def set(self, key, value, ttl=None):
+        self.client.set(self.PREFIX + 'entry:' + key, json.dumps(value), ex=ttl or self.ttl)
+
+    def current_generations(self, names):
+        values = self.client.mget([self.PREFIX + 'gen:' + name for name in names])
+        return [int(value or 0) for value in values]
+
+    def bump(self, names):
+        pipeline = self.client.pipeline(transaction=False)
+        for name in names:
+            pipeline.incr(self.PREFIX + 'gen:' + name)
+        pipeline.execute()
+
+
+def create_backend():
+    if CACHE_REDIS_URL:
+        try:
+            return RedisBackend(CACHE_REDIS_URL)
+        except ImportError:
+            logger.warning("CACHE_REDIS_URL is set but redis is not installed; using the in-process cache")
+    return MemoryBackend()
+
+
+backend = create_backend()
+
+
+def period_name(year, month):
+    return ALL_MONTHS if year is None else f"{year}-{month:02d}"
+
+
+def generation_names(scopes):
+    """Counters a response depends on: its months and the all-months counter, per department"""
+    names = []
+    for year, month, department in scopes:
+        department = ALL_DEPARTMENTS if department is None else department
+        for period in (period_name(year, month), ALL_MONTHS):
+            name = f"{period}/{department}"
+            if name not in names:
+                names.append(name)
+    return names
+
+
+def invalidate(changes):
+    """
+    Bump generations for changed (year, month, department_id) scopes
+    year=None means every month (e.g. an employee record changed); the
+    company-wide counter of each period is always bumped as well
+    """
+    names = set()
+    for year, month, department in changes:
+        period = period_name(year, month)
+        names.add(f"{period}/{ALL_DEPARTMENTS}")
+        if department is not None:
+            names.add(f"{period}/{department}")
+    if not names:
+        return
+    try:
+        backend.bump(sorted(names))
+    except Exception as e:
+        logger.warning(f"Cache invalidation failed: {e}")
+
+
+def generation_versions(names, generations):
+    return ','.join(f"{name}={generation}" for name, generation in zip(names, generations))
+
+
+def cache_key(versions, replica):
+    params = '&'.join(f"{key}={value}" for key, value in sorted(request.args.items(multi=True)))
+    # Today's date is part of the key because views default to the current month
+    source = 'replica' if replica else 'primary'
+    return f"{request.path}?{params}|{date.today().isoformat()}|{source}|{versions}"
+
+
+def entity_tag(body, versions):
+    """ETag of a response body; shared generations are mixed in, per-process ones would differ by worker"""
+    tag = hashlib.sha1()
+    if backend.shared:
+        tag.update(versions.encode())
+    tag.update(body.encode())
+    return tag.hexdigest()
+
+
+def cached_value(name, scopes, compute):
+    """
+    compute() through the cache under the generations of scopes, for figures a
+    page renders rather than a whole response; the value must be JSON-serialisable
+    """
+    if CACHE_TTL_SECONDS <= 0:
+        return compute()
+    try:
+        names = generation_names(scopes)
+        replica = database_config.serving_from_replica()
+        source = 'replica' if replica else 'primary'
+        key = f"value:{name}|{source}|{generation_versions(names, backend.current_generations(names))}"
+        cached = backend.get(key)
+    except Exception:
+        return compute()
+    if cached is not None:
+        return cached['value']
+
+    value = compute()
+    try:
+        backend.set(key, {'value': value}, ttl=replica_ttl() if replica else None)
+    except Exception as e:
+        logger.warning(f"Cache write failed: {e}")
+    return value
+
+
+def replica_ttl():
+    return min(CACHE_TTL_SECONDS, database_config.READ_YOUR_WRITES_SECONDS)
+
+
+def cached_json(scopes):
+    """
+    Cache a JSON view's successful responses and answer If-None-Match with 304
+    scopes() returns the (year, month, department_id) scopes the response reads;
+    if it raises, the view runs uncached so it can report the bad parameter itself
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if CACHE_TTL_SECONDS <= 0:
+                return view(*args, **kwargs)
+            try:
+                names = generation_names(scopes(*args, **kwargs))
+                versions = generation_versions(names, backend.current_generations(names))
+                replica = database_config.serving_from_replica()
+                key = cache_key(versions, replica)
+                cached = backend.get(key)
+            except Exception:
+                return view(*args, **kwargs)
+
+            if cached is not None:
+                if request.if_none_match.contains(cached['etag']):
+                    return not_modified(cached['etag'])
+                response = make_response(cached['body'], 200, cached['headers'])
+                response.mimetype = 'application/json'
+                response.headers['X-Cache'] = 'HIT'
+                return revalidated(response, cached['etag'])
+
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            body = response.get_data(as_text=True)
+            etag = entity_tag(body, versions)
+            try:
+                backend.set(key, {
+                    'body': body,
+                    'etag': etag,
+                    'headers': {h: response.headers[h] for h in CACHED_HEADERS if h in response.headers}
+                }, ttl=replica_ttl() if replica else None)
+            except Exception as e:
+                logger.warning(f"Cache write failed: {e}")
+            if request.if_none_match.contains(etag):
+                return not_modified(etag)
+            response.headers['X-Cache'] = 'MISS'
+            return revalidated(response, etag)
+        return wrapper
+    return decorator
+
+
+def not_modified(etag):
+    response = make_response('', 304)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+def revalidated(response, etag):
+    """Tag a response and make browsers revalidate it on every use"""
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
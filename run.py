@@ -17,7 +17,7 @@ import os
 import sys
 import logging
 from datetime import datetime
-from app import app, db
+from app import app, db, upgrade_schema
 from sqlalchemy import text
 
 # Configure enterprise-grade logging
@@ -77,6 +77,7 @@ def initialize_database():
         with app.app_context():
             # Create all tables
             db.create_all()
+            upgrade_schema()
             logger.info("Database tables created/verified")
             
             # Initialize default data if needed
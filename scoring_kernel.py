@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Vectorized Performance Scoring Kernel
+Batch version of performance_rules.calculate_performance_metrics operating on NumPy column arrays
+Produces bit-identical results to the scalar engine for backfills and re-imports
+"""
+
+import numpy as np
+
+INPUT_COLUMNS = (
+    'meeting_hrs', 'assigned_hrs', 'completed_hrs', 'complexity_factor',
+    'qa_factor', 'task_failed', 'leave_taken'
+)
+DERIVED_COLUMNS = ('available_hrs', 'efficiency', 'raw_points', 'ot_points', 'approved_points')
+
+STANDARD_WORKDAY_HRS = 9.0
+MAX_EFFICIENCY = 2.0
+
+# Values this close to a rounding midpoint are re-rounded with Python's round()
+ROUNDING_TIE_TOLERANCE = 1e-9
+
+
+def round_half_even_2dp(values):
+    """
+    Round to 2 decimals exactly like Python's built-in round(x, 2)
+    NumPy's scale-and-rint can disagree with Python on near-midpoint inputs,
+    so those few elements fall back to the scalar round()
+    """
+    scaled = values * 100.0
+    rounded = np.rint(scaled) / 100.0
+
+    distance_to_midpoint = np.abs(scaled - np.floor(scaled) - 0.5)
+    near_midpoint = distance_to_midpoint <= ROUNDING_TIE_TOLERANCE * np.maximum(1.0, np.abs(scaled))
+    for index in np.flatnonzero(near_midpoint):
+        rounded[index] = round(float(values[index]), 2)
+
+    return rounded
+
+
+def calculate_performance_metrics_batch(meeting_hrs, assigned_hrs, completed_hrs,
+                                        complexity_factor, qa_factor, task_failed, leave_taken):
+    """
+    Score whole columns of daily records at once
+    Takes one array (or sequence) per input field and returns a dict of derived arrays
+    """
+    meeting_hrs = np.asarray(meeting_hrs, dtype=np.float64)
+    assigned_hrs = np.asarray(assigned_hrs, dtype=np.float64)
+    completed_hrs = np.asarray(completed_hrs, dtype=np.float64)
+    complexity_factor = np.asarray(complexity_factor, dtype=np.float64)
+    qa_factor = np.asarray(qa_factor, dtype=np.float64)
+    task_failed = np.asarray(task_failed, dtype=bool)
+    leave_taken = np.asarray(leave_taken, dtype=bool)
+
+    # Step 1: Calculate Available Working Hours
+    available_hrs = np.where(leave_taken, 0.0, np.maximum(0.0, STANDARD_WORKDAY_HRS - meeting_hrs))
+
+    # Step 2: Calculate Work Efficiency Ratio
+    has_capacity = available_hrs != 0
+    ratio = np.divide(completed_hrs, available_hrs, out=np.zeros_like(completed_hrs), where=has_capacity)
+    efficiency = np.where(has_capacity, np.minimum(MAX_EFFICIENCY, ratio), 0.0)
+
+    # Step 3: Calculate Raw Performance Points
+    raw_points = completed_hrs * complexity_factor * qa_factor
+
+    # Step 4: Calculate Overtime Contribution
+    ot_points = np.maximum(0.0, completed_hrs - assigned_hrs)
+
+    # Step 5: Apply Quality Gates and Calculate Final Points
+    approved_points = np.where(task_failed, 0.0, round_half_even_2dp(efficiency * raw_points))
+
+    return {
+        'available_hrs': available_hrs,
+        'efficiency': efficiency,
+        'raw_points': raw_points,
+        'ot_points': ot_points,
+        'approved_points': approved_points
+    }
@@ -0,0 +1,332 @@
+"""Dashboard and analytics aggregates checked against the stored daily rows"""
+
+import random
+from bisect import bisect_right
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+import pytest
+from flask import template_rendered
+
+from conftest import performance_record, statements
+
+
+@contextmanager
+def captured_context(app):
+    contexts = []
+
+    def record(sender, template, context, **extra):
+        contexts.append(context)
+
+    template_rendered.connect(record, app)
+    try:
+        yield contexts
+    finally:
+        template_rendered.disconnect(record, app)
+
+
+def save(client, employee_id, day, **fields):
+    response = client.post('/api/performance', json=performance_record(employee_id, day, **fields))
+    assert response.status_code == 200, response.json
+    return response.json['data']
+
+
+def test_dashboard_totals_match_the_daily_rows(app_context, client, make_employee):
+    today = date.today()
+    first_of_month = today.replace(day=1)
+    strong, steady, idle = make_employee(), make_employee(), make_employee()
+    retired = make_employee(is_active=False)
+
+    points = {strong: 0.0, steady: 0.0}
+    for offset in range(3):
+        day = first_of_month + timedelta(days=offset)
+        points[strong] += save(client, strong, day, completed_hrs=10, complexity_factor=1.5)['approved_points']
+        points[steady] += save(client, steady, day, completed_hrs=5)['approved_points']
+    save(client, retired, first_of_month, completed_hrs=12)
+    save(client, strong, first_of_month - timedelta(days=1), completed_hrs=12)  # Previous month
+
+    with captured_context(app_context.app) as contexts:
+        assert client.get('/').status_code == 200
+    context = contexts[0]
+
+    stats = context['company_stats']
+    assert stats['total_employees'] == 3
+    assert stats['total_points'] == pytest.approx(sum(points.values()))
+    assert stats['total_hours'] == pytest.approx(3 * 10 + 3 * 5)
+    assert [metric['employee'].id for metric in context['dashboard_metrics']] == [strong, steady, idle]
+    assert [metric['total_points'] for metric in context['dashboard_metrics']] == \
+        pytest.approx([points[strong], points[steady], 0])
+    grades = [app_context.get_performance_grade(metric['avg_points_per_day'])['grade']
+              for metric in context['dashboard_metrics']]
+    assert sum(context['grade_counts'].values()) == 3
+    for grade in set(grades):
+        assert context['grade_counts'][grade] == grades.count(grade)
+
+
+def test_leaderboard_ranks_and_pages_in_the_database(app_context, client, make_employee):
+    day = date(2025, 8, 4)
+    hours = {}
+    for index, department in enumerate(['Engineering', 'Sales'] * 3):
+        employee_id = make_employee(department=department)
+        hours[employee_id] = [9, 6, 9, 3, 0, 7][index]
+        if hours[employee_id]:
+            save(client, employee_id, day, completed_hrs=hours[employee_id])
+    make_employee(is_active=False)
+    expected = sorted(hours, key=lambda employee_id: (-hours[employee_id], employee_id))
+
+    full = client.get('/api/leaderboard', query_string={'month': '2025-08'})
+    assert [row['employee_id'] for row in full.json] == expected
+    assert [row['rank'] for row in full.json] == list(range(1, 7))
+    assert full.headers['X-Total-Count'] == '6'
+
+    pages = [client.get('/api/leaderboard', query_string={'month': '2025-08', 'limit': 4, 'offset': offset}).json
+             for offset in (0, 4)]
+    assert [row['employee_id'] for page in pages for row in page] == expected
+    assert pages[1][0]['rank'] == 5
+
+    sales = client.get('/api/leaderboard', query_string={'month': '2025-08', 'department': 'Sales'})
+    assert [row['rank'] for row in sales.json] == [1, 2, 3]
+    assert {row['department'] for row in sales.json} == {'Sales'}
+    assert sales.headers['X-Total-Count'] == '3'
+
+    assert client.get('/api/leaderboard', query_string={'month': 'August'}).status_code == 400
+
+
+@pytest.mark.parametrize('year, month, start, end', [
+    (2025, 2, date(2025, 2, 1), date(2025, 3, 1)),
+    (2024, 2, date(2024, 2, 1), date(2024, 3, 1)),
+    (2025, 12, date(2025, 12, 1), date(2026, 1, 1)),
+])
+def test_month_range_is_half_open(app_context, year, month, start, end):
+    assert app_context.month_date_range(year, month) == (start, end)
+
+
+def test_in_month_keeps_month_edges(app_context, client, make_employee):
+    employee_id = make_employee()
+    for day in (date(2025, 11, 30), date(2025, 12, 1), date(2025, 12, 31), date(2026, 1, 1)):
+        save(client, employee_id, day)
+
+    DailyPerformance = app_context.DailyPerformance
+    december = DailyPerformance.query.filter(app_context.in_month(2025, 12)).order_by(DailyPerformance.date)
+    assert [performance.date for performance in december] == [date(2025, 12, 1), date(2025, 12, 31)]
+    assert app_context.DailyRollup.query.filter(
+        app_context.in_month(2025, 12, app_context.DailyRollup.date)
+    ).count() == 2
+
+
+def test_month_filters_can_use_the_date_index(app_context):
+    query = app_context.DailyPerformance.query.with_entities(app_context.DailyPerformance.id).filter(
+        app_context.in_month(2025, 12)
+    ).statement.compile(compile_kwargs={'literal_binds': True})
+    plan = ' '.join(str(row) for row in app_context.db.session.execute(
+        app_context.db.text(f'EXPLAIN QUERY PLAN {query}')
+    ))
+    assert 'ix_daily_performance_date' in plan
+
+
+def seed_weeks(client, make_employee, end, weeks):
+    """Random daily rows for two departments over `weeks` Monday-aligned weeks ending at end"""
+    rng = random.Random(18)
+    employees = {make_employee(): 'Engineering', make_employee(): 'Engineering', make_employee(department='Sales'): 'Sales'}
+    start = end - timedelta(days=end.weekday(), weeks=weeks - 1)
+    saved = []
+    for offset in range((end - start).days + 1):
+        day = start + timedelta(days=offset)
+        for employee_id, department in employees.items():
+            if day.weekday() == 6 or rng.random() < 0.3:
+                continue
+            leave_taken = rng.random() < 0.1
+            data = save(client, employee_id, day, completed_hrs=rng.choice([0, 4, 7.5, 9, 11]), leave_taken=leave_taken)
+            saved.append(dict(data, department=department, employee_id=employee_id, day=day, leave_taken=leave_taken))
+    save(client, next(iter(employees)), start - timedelta(days=1))  # Outside the window
+    return employees, saved
+
+
+def expected_weeks(saved, end, weeks):
+    monday = end - timedelta(days=end.weekday())
+    buckets = []
+    for index in range(weeks):
+        start = monday - timedelta(weeks=weeks - 1 - index)
+        rows = [row for row in saved if start <= row['day'] <= min(start + timedelta(days=6), end)]
+        buckets.append({
+            'week_start': start.isoformat(),
+            'records': len(rows),
+            'total_points': round(sum(row['approved_points'] for row in rows), 2),
+            'avg_points': round(sum(row['approved_points'] for row in rows) / len(rows), 2) if rows else 0,
+            'leave_days': sum(1 for row in rows if row['leave_taken']),
+        })
+    return buckets
+
+
+def test_weekly_trends_match_the_daily_rows(app_context, client, make_employee):
+    end, weeks = date(2025, 8, 20), 5  # A Wednesday: the last week is partial
+    employees, saved = seed_weeks(client, make_employee, end, weeks)
+    fields = ['week_start', 'records', 'total_points', 'avg_points', 'leave_days']
+
+    def trend(**params):
+        response = client.get('/api/trends', query_string=dict(params, weeks=weeks, end=end.isoformat()))
+        assert response.status_code == 200, response.json
+        return [{field: week[field] for field in fields} for week in response.json['weeks']]
+
+    assert trend() == pytest.approx(expected_weeks(saved, end, weeks))
+    assert trend(department='Sales') == pytest.approx(
+        expected_weeks([row for row in saved if row['department'] == 'Sales'], end, weeks))
+    employee_id = next(iter(employees))
+    assert trend(employee_id=employee_id) == pytest.approx(
+        expected_weeks([row for row in saved if row['employee_id'] == employee_id], end, weeks))
+    assert client.get('/api/trends', query_string={'weeks': 0}).status_code == 400
+
+
+def test_dashboard_trend_is_one_grouped_query(app_context, client, make_employee):
+    weeks = 5
+    _, saved = seed_weeks(client, make_employee, date.today(), weeks)
+    expected = expected_weeks(saved, date.today(), weeks)
+
+    with statements(app_context.db.engine) as executed:
+        trends = client.get('/api/dashboard_metrics').json['trends']
+    assert len([sql for sql in executed if 'daily_rollup' in sql]) == 1
+    assert trends['labels'][-1] == 'Week 5 (Projected)'
+    assert trends['points'][:-1] == [round(week['avg_points'], 1) if week['records'] else 8.0
+                                     for week in expected[:-1]]
+
+
+def test_dashboard_weeks_are_monday_aligned(app_context, client, make_employee, monkeypatch):
+    class FixedDate(date):
+        @classmethod
+        def today(cls):
+            return cls(2025, 8, 13)  # A Wednesday
+
+    monkeypatch.setattr(app_context, 'date', FixedDate)
+    employee_id = make_employee()
+    # The Sunday before is three days back yet belongs to the previous week
+    sunday, monday = [save(client, employee_id, day, completed_hrs=hours)['approved_points']
+                      for day, hours in ((date(2025, 8, 10), 4), (date(2025, 8, 11), 9))]
+    earlier = save(client, employee_id, date(2025, 8, 4), completed_hrs=7)['approved_points']
+
+    trends = client.get('/api/dashboard_metrics').json['trends']
+    assert trends['points'] == [8.0, 8.0, 8.0, round((earlier + sunday) / 2, 1),
+                                round(min(monday * 1.05, 12), 1)]
+    assert trends['efficiency'][:3] == [85.0] * 3
+
+
+def test_department_rollups_match_the_daily_rows(app_context, client, make_employee):
+    start, end = date(2025, 8, 4), date(2025, 8, 9)
+    alice = make_employee(reporting_manager='Grace')
+    bob = make_employee(reporting_manager='Grace')
+    carol = make_employee()  # No manager
+    seller = make_employee(department='Sales')
+    retired = make_employee(is_active=False)
+    make_employee(department='Engineering')  # Nothing recorded
+    make_employee(department='Product Management')  # Department without records
+    points = {employee_id: [] for employee_id in (alice, bob, carol, seller)}
+    for offset, hours in enumerate([9, 4, 11, 7.5]):
+        day = start + timedelta(days=offset)
+        for employee_id in points:
+            points[employee_id].append(save(client, employee_id, day, completed_hrs=hours)['approved_points'])
+    save(client, retired, start, completed_hrs=12)
+    save(client, alice, end + timedelta(days=2), completed_hrs=12)  # Outside the range
+
+    def rollup(**params):
+        response = client.get('/api/department_performance',
+                              query_string=dict(params, start=start.isoformat(), end=end.isoformat()))
+        assert response.status_code == 200, response.json
+        return {row['name']: (row['employee_count'], row['avg_points']) for row in response.json}
+
+    def average(*employee_ids):
+        values = [value for employee_id in employee_ids for value in points[employee_id]]
+        return round(sum(values) / len(values), 1)
+
+    assert rollup() == {
+        'Engineering': (4, average(alice, bob, carol)),
+        'Sales': (1, average(seller)),
+        'Product Management': (1, 8.8),  # Baseline
+    }
+    assert rollup(department='Sales') == {'Sales': (1, average(seller))}
+    assert rollup(department='Engineering', by='manager') == {
+        'Grace': (2, average(alice, bob)), 'Unassigned': (2, average(carol))}
+
+    assert client.get('/api/department_performance', query_string={'by': 'manager'}).status_code == 400
+    assert client.get('/api/department_performance',
+                      query_string={'start': '2025-08-09', 'end': '2025-08-01'}).status_code == 400
+
+
+def test_distribution_buckets_match_the_employee_averages(app_context, client, make_employee):
+    rng = random.Random(20)
+    averages = []
+    for _ in range(12):
+        employee_id = make_employee()
+        points = []
+        for offset in range(rng.randrange(0, 5)):
+            day = date(2025, 8, 4) + timedelta(days=offset)
+            if rng.random() < 0.2:
+                save(client, employee_id, day, leave_taken=True)  # Not a worked day
+                continue
+            points.append(save(client, employee_id, day, completed_hrs=rng.choice([1, 3, 6, 8, 12, 16]),
+                               complexity_factor=rng.choice([1.0, 1.5, 2.5]))['approved_points'])
+        averages.append(sum(points) / len(points) if points else None)
+    make_employee(is_active=False)
+    save(client, make_employee(), date(2025, 9, 1), completed_hrs=16)  # Other month: no data in August
+    averages.append(None)
+    worked = [value for value in averages if value is not None]
+
+    def counts(edges):
+        return [sum(1 for value in worked if bisect_right(edges, value) == index) for index in range(len(edges) + 1)]
+
+    histogram = client.get('/api/performance_distribution', query_string={'month': '2025-08', 'thresholds': '6,2,4'}).json
+    assert histogram['labels'] == ['0-2', '2-4', '4-6', '6+']
+    assert histogram['counts'] == counts([2, 4, 6])
+    assert histogram['no_data'] == len(averages) - len(worked)
+
+    bins = client.get('/api/performance_distribution', query_string={'month': '2025-08', 'bins': 5}).json
+    assert bins['edges'] == [4, 8, 12, 16]
+    assert bins['counts'] == counts([4, 8, 12, 16])
+
+    bands = client.get('/api/performance_distribution', query_string={'month': '2025-08'}).json
+    expected = list(reversed(counts([4, 7, 10])))
+    expected[2] += len(averages) - len(worked)  # No data counts as average
+    assert bands['counts'] == expected
+    assert bands['labels'] == ['Top Performers', 'High Performers', 'Average', 'Needs Support']
+
+    for params in ({'bins': 0}, {'thresholds': '0,2'}, {'thresholds': 'high'}):
+        assert client.get('/api/performance_distribution', query_string=params).status_code == 400
+
+
+def test_employee_trend_windows_and_buckets(app_context, client, make_employee):
+    employee_id, other = make_employee(), make_employee()
+    points = {}
+    for day, hours in [(date(2025, 7, 30), 9), (date(2025, 8, 1), 4), (date(2025, 8, 2), 11),
+                       (date(2025, 8, 4), 7.5), (date(2025, 9, 2), 12)]:
+        points[day] = save(client, employee_id, day, completed_hrs=hours)['approved_points']
+    save(client, other, date(2025, 8, 1), completed_hrs=16)
+
+    def trend(**params):
+        response = client.get(f'/api/employee/{employee_id}/performance_trend', query_string=params)
+        assert response.status_code == 200, response.json
+        return response.json
+
+    daily = trend(end='2025-08-04', days=7)
+    assert (daily['bucket'], daily['start'], daily['labels'][0]) == ('day', '2025-07-29', '07/29')
+    assert daily['points'] == [0, points[date(2025, 7, 30)], 0, points[date(2025, 8, 1)],
+                               points[date(2025, 8, 2)], 0, points[date(2025, 8, 4)]]
+    assert daily['records'] == [0, 1, 0, 1, 1, 0, 1]
+
+    def average(*days):
+        return round(sum(points[day] for day in days) / len(days), 2)
+
+    weekly = trend(start='2025-07-30', end='2025-08-10', bucket='week')
+    assert weekly['labels'] == ['28 Jul 25', '04 Aug 25']
+    assert weekly['points'] == [average(date(2025, 7, 30), date(2025, 8, 1), date(2025, 8, 2)),
+                                average(date(2025, 8, 4))]
+    assert weekly['records'] == [3, 1]
+
+    monthly = trend(start='2025-07-01', end='2025-10-31', bucket='month')
+    assert monthly['labels'] == ['Jul 2025', 'Aug 2025', 'Sep 2025', 'Oct 2025']
+    assert monthly['points'] == [average(date(2025, 7, 30)), average(date(2025, 8, 1), date(2025, 8, 2), date(2025, 8, 4)),
+                                 average(date(2025, 9, 2)), 0]
+
+    # Long windows are downsampled by default
+    assert trend(end='2025-08-04', days=181)['bucket'] == 'week'
+    assert trend(end='2025-08-04', days=1101)['bucket'] == 'month'
+    assert len(trend(end='2025-08-04', days=3660)['points']) == 122  # Ten years, partial months at both ends
+    for params in ({'days': 0}, {'days': 3661}, {'bucket': 'hour'}, {'start': '2025-08-05', 'end': '2025-08-04'}):
+        assert client.get(f'/api/employee/{employee_id}/performance_trend', query_string=params).status_code == 400
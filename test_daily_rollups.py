@@ -0,0 +1,81 @@
+"""DailyRollup running totals against a rebuild from the daily rows"""
+
+import random
+from datetime import date, timedelta
+
+from conftest import performance_record
+
+
+def rollup_snapshot(app_context):
+    """{(date, department_id): totals} of the stored rollups, rows that net to zero left out"""
+    app_context.db.session.expire_all()
+    snapshot = {}
+    for rollup in app_context.DailyRollup.query:
+        totals = tuple(round(getattr(rollup, field), 6) for field in app_context.ROLLUP_TOTAL_FIELDS)
+        if any(totals):
+            snapshot[(rollup.date, rollup.department_id)] = totals
+    return snapshot
+
+
+def rebuilt_snapshot(app_context):
+    app_context.rebuild_daily_rollups()
+    snapshot = rollup_snapshot(app_context)
+    app_context.db.session.rollback()
+    return snapshot
+
+
+def random_record(rng, employee_id, day):
+    return performance_record(employee_id, day, completed_hrs=rng.choice([0, 4, 8, 11]),
+                              meeting_hrs=rng.choice([0, 1, 2]), task_failed=rng.random() < 0.1,
+                              leave_taken=rng.random() < 0.1)
+
+
+def test_running_rollups_match_a_rebuild(app_context, client, make_employee):
+    rng = random.Random(22)
+    employees = [make_employee(), make_employee(), make_employee(department='Sales'), make_employee(department=None)]
+    days = [date(2025, 8, 1) + timedelta(days=offset) for offset in range(10)]
+
+    for _ in range(40):  # Inserts and overwrites
+        response = client.post('/api/performance', json=random_record(rng, rng.choice(employees), rng.choice(days)))
+        assert response.status_code == 200
+    keys = rng.sample([(employee_id, day) for employee_id in employees for day in days], 30)
+    records = [random_record(rng, employee_id, day) for employee_id, day in keys]
+    assert client.post('/api/performance/bulk', json={'records': records}).json['success']
+
+    snapshot = rollup_snapshot(app_context)
+    assert {department_id for _, department_id in snapshot} >= {app_context.ROLLUP_NO_DEPARTMENT}
+    assert snapshot == rebuilt_snapshot(app_context)
+
+
+def test_department_moves_carry_the_rollups(app_context, client, make_employee):
+    mover, stayer = make_employee(), make_employee(department='Sales')
+    sales_id = app_context.Department.query.filter_by(name='Sales').one().id
+    for day in (date(2025, 8, 4), date(2025, 8, 5)):
+        client.post('/api/performance', json=performance_record(mover, day, completed_hrs=9))
+        client.post('/api/performance', json=performance_record(stayer, day, completed_hrs=6))
+
+    client.post(f'/api/employee/{mover}/edit', json={'department_id': sales_id})
+    snapshot = rollup_snapshot(app_context)
+    assert {department_id for _, department_id in snapshot} == {sales_id}
+    assert snapshot == rebuilt_snapshot(app_context)
+
+    # Writes after the move land in the new department
+    client.post('/api/performance', json=performance_record(mover, date(2025, 8, 4), completed_hrs=4))
+    assert rollup_snapshot(app_context) == rebuilt_snapshot(app_context)
+
+
+def test_rebuild_command_repairs_a_range(app_context, client, make_employee):
+    employee_id = make_employee()
+    for day in (date(2025, 8, 4), date(2025, 8, 5), date(2025, 9, 1)):
+        client.post('/api/performance', json=performance_record(employee_id, day))
+    expected = rollup_snapshot(app_context)
+    app_context.db.session.execute(app_context.db.update(app_context.DailyRollup).values(total_points=0))
+    app_context.db.session.commit()
+
+    runner = app_context.app.test_cli_runner()
+    result = runner.invoke(args=['rebuild-rollups', '--start', '2025-08-01', '--end', '2025-08-31'])
+    assert 'Rebuilt 2 daily rollup row(s)' in result.output
+    repaired = rollup_snapshot(app_context)
+    assert {key: totals for key, totals in repaired.items() if key[0].month == 8} == \
+        {key: totals for key, totals in expected.items() if key[0].month == 8}
+    assert repaired[(date(2025, 9, 1), app_context.Department.query.one().id)][0] == 0  # Outside the range
@@ -0,0 +1,51 @@
+"""Engine options, SQLite pragmas and pool statistics"""
+
+import pytest
+
+import database_config
+
+
+@pytest.mark.parametrize('url, pool_size, pre_ping, recycle', [
+    ('sqlite:////tmp/performancepro.db', 10, False, -1),
+    ('postgresql://user@db/performancepro', 10, True, 1800),
+    ('mysql+pymysql://user@db/performancepro', 5, True, 280),
+])
+def test_pool_defaults_per_backend(monkeypatch, url, pool_size, pre_ping, recycle):
+    for variable in ('DB_POOL_SIZE', 'DB_MAX_OVERFLOW', 'DB_POOL_RECYCLE', 'DB_POOL_PRE_PING'):
+        monkeypatch.delenv(variable, raising=False)
+    options = database_config.engine_options(url)
+    assert (options['pool_size'], options['pool_pre_ping'], options['pool_recycle']) == (pool_size, pre_ping, recycle)
+    assert options['pool_timeout'] == database_config.POOL_TIMEOUT_SECONDS
+    assert ('connect_args' in options) == url.startswith('sqlite')
+
+
+def test_environment_overrides_and_memory_sqlite(monkeypatch):
+    monkeypatch.setenv('DB_POOL_SIZE', '3')
+    monkeypatch.setenv('DB_POOL_PRE_PING', 'yes')
+    options = database_config.engine_options('postgresql://user@db/performancepro')
+    assert (options['pool_size'], options['pool_pre_ping']) == (3, True)
+
+    # An in-memory database is one shared connection, so no pool sizing
+    assert database_config.engine_options('sqlite://') == {
+        'connect_args': {'timeout': database_config.SQLITE_BUSY_TIMEOUT_MS / 1000}}
+    assert database_config.database_url('postgres://user@db/x') == 'postgresql://user@db/x'
+
+
+def test_new_sqlite_connections_get_the_pragmas(app_context):
+    with app_context.db.engine.connect() as connection:
+        pragma = lambda name: connection.exec_driver_sql(f'PRAGMA {name}').scalar()
+        assert pragma('journal_mode') == 'wal'
+        assert pragma('busy_timeout') == database_config.SQLITE_BUSY_TIMEOUT_MS
+        assert pragma('synchronous') == 1  # NORMAL
+        assert pragma('cache_size') == -database_config.SQLITE_CACHE_SIZE_KB
+
+
+def test_db_stats_reports_pool_checkouts(app_context, client):
+    before = client.get('/api/db_stats').json['engines']['default']
+    assert (before['backend'], before['pool']) == ('sqlite', 'QueuePool')
+    client.get('/api/leaderboard')
+    app_context.db.session.remove()  # Requests share the fixture's app context, and so its session
+    after = client.get('/api/db_stats').json['engines']['default']
+    assert after['checkouts'] > before['checkouts']
+    assert after['checked_out'] == before['checked_out']
+    assert after['peak_checked_out'] >= 1
@@ -0,0 +1,102 @@
+"""Employee directory: keyset paging, filters and hub figures"""
+
+import pytest
+
+NAMES = ['Dana', 'Ari', 'Cole', 'Ari', 'Bea', 'Eli', 'Cole']
+
+
+def directory_pages(client, **params):
+    """Every page of /api/employees as lists of ids"""
+    pages, after = [], None
+    while True:
+        query = dict(params, after=after) if after else params
+        body = client.get('/api/employees', query_string=query).json
+        pages.append([employee['id'] for employee in body['employees']])
+        after = body['next_after']
+        if after is None:
+            return pages
+
+
+@pytest.fixture
+def directory(app_context, make_employee):
+    return {make_employee(name=name): name for name in NAMES}
+
+
+@pytest.mark.parametrize('sort', ['id', 'name'])
+def test_pages_cover_the_directory_once_in_order(client, directory, sort):
+    pages = directory_pages(client, sort=sort, limit=2)
+    ids = [employee_id for page in pages for employee_id in page]
+    key = (lambda employee_id: (directory[employee_id], employee_id)) if sort == 'name' else None
+    assert ids == sorted(directory, key=key)
+    assert all(len(page) == 2 for page in pages[:-1])
+
+
+def test_deleted_and_renamed_rows_do_not_restart_paging(app_context, client, directory):
+    db, Employee = app_context.db, app_context.Employee
+    first = client.get('/api/employees', query_string={'sort': 'name', 'limit': 3}).json
+    seen = [employee['id'] for employee in first['employees']]  # Ari, Ari, Bea
+
+    # The last row of the page disappears and an unseen one is renamed to sort before it
+    db.session.delete(db.session.get(Employee, seen[-1]))
+    dana = next(employee_id for employee_id, name in directory.items() if name == 'Dana')
+    db.session.get(Employee, dana).name = 'Aaron'
+    db.session.commit()
+
+    rest = directory_pages(client, sort='name', limit=3)
+    body = client.get('/api/employees', query_string={'sort': 'name', 'limit': 10,
+                                                       'after': first['next_after']}).json
+    assert [employee['name'] for employee in body['employees']] == ['Cole', 'Cole', 'Eli']
+    assert rest[0][0] == dana
+
+
+@pytest.mark.parametrize('after', ['not-a-cursor', '123', 'WyJ4Il0'])
+def test_bad_cursor_is_rejected(client, directory, after):
+    # 'WyJ4Il0' is the cursor ["x"]: valid base64 and JSON but not a sort key
+    assert client.get('/api/employees', query_string={'after': after}).status_code == 400
+    assert client.get('/employees', query_string={'after': after}).status_code == 400
+
+
+def test_cursor_from_another_sort_is_rejected(client, directory):
+    after = client.get('/api/employees', query_string={'sort': 'name', 'limit': 2}).json['next_after']
+    assert client.get('/api/employees', query_string={'sort': 'id', 'after': after}).status_code == 400
+
+
+def test_hub_pages_through_the_directory(client, directory):
+    first = client.get('/employees', query_string={'limit': 5})
+    assert first.status_code == 200
+    assert b'(continued)' not in first.data
+    assert b'after=' in first.data
+    assert f'{len(NAMES)} employees'.encode() in first.data  # Department card count
+
+
+def test_hub_figures_are_cached_until_an_employee_changes(app_context, client, directory, monkeypatch):
+    calls = []
+    compute = app_context.compute_employee_directory_stats
+    monkeypatch.setattr(app_context, 'compute_employee_directory_stats', lambda: calls.append(1) or compute())
+
+    client.get('/employees')
+    client.get('/employees', query_string={'sort': 'name'})
+    assert len(calls) == 1
+
+    department_id = app_context.Department.query.one().id
+    response = client.post('/add_employee', json={
+        'name': 'New Hire', 'email': 'new@example.com', 'designation': 'Engineer',
+        'base_salary': 50000, 'join_date': '2025-01-01', 'employment_type': 'Contract'
+    })
+    assert response.json['success'] is True
+    stats = app_context.employee_directory_stats()
+    assert len(calls) == 2
+    assert (stats['total'], stats['unassigned']) == (len(NAMES) + 1, 1)
+    assert stats['department_counts'] == {str(department_id): len(NAMES)}
+    assert 'Contract' in stats['employment_types']
+    assert client.get('/employees').status_code == 200
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize('q, expected', [('50%', ['Rate 50% Lead']), ('a_b', ['a_b Tester']), ('\\', ['Back\\slash']),
+                                         ('rate', ['Rate 50% Lead', 'Rate 500 Lead'])])
+def test_search_matches_wildcards_literally(client, make_employee, q, expected):
+    for name in ('Rate 50% Lead', 'Rate 500 Lead', 'a_b Tester', 'axb Tester', 'Back\\slash'):
+        make_employee(name=name, designation='Staff')
+    body = client.get('/api/employees', query_string={'q': q}).json
+    assert [employee['name'] for employee in body['employees']] == expected
@@ -0,0 +1,93 @@
+"""Server-Sent Events fan-out, replay and resync"""
+
+import json
+from datetime import date
+
+import pytest
+
+from conftest import performance_record
+from event_stream import Broadcaster, StreamFull, RESYNC
+
+
+def first_event(broadcaster, subscriber):
+    stream = broadcaster.stream(subscriber)
+    assert next(stream).startswith('retry:')
+    return next(stream)
+
+
+def test_publish_reaches_every_subscriber():
+    broadcaster = Broadcaster()
+    subscribers = [broadcaster.subscribe(), broadcaster.subscribe()]
+    broadcaster.publish('performance', {'employee_id': 7})
+
+    for subscriber in subscribers:
+        event = first_event(broadcaster, subscriber)
+        assert 'event: performance\n' in event
+        assert 'data: {"employee_id":7}' in event
+
+
+def test_reconnect_replays_missed_events():
+    broadcaster = Broadcaster()
+    broadcaster.publish('performance', {'n': 1})
+    seen = broadcaster.event_id(broadcaster.sequence)
+    broadcaster.publish('performance', {'n': 2})
+
+    subscriber = broadcaster.subscribe(seen)
+    assert 'data: {"n":2}' in first_event(broadcaster, subscriber)
+
+
+def test_unknown_or_expired_event_id_asks_for_resync():
+    broadcaster = Broadcaster(history_size=2)
+    for n in range(4):
+        broadcaster.publish('performance', {'n': n})
+
+    for last_event_id in ('another-process-3', broadcaster.event_id(1)):
+        assert f'event: {RESYNC}\n' in first_event(broadcaster, broadcaster.subscribe(last_event_id))
+
+
+def test_skipped_payload_forces_resync():
+    broadcaster = Broadcaster()
+    broadcaster.publish('performance', lambda: {'n': 1})  # Nobody listening: payload is never built
+    seen = broadcaster.event_id(0)
+    assert f'event: {RESYNC}\n' in first_event(broadcaster, broadcaster.subscribe(seen))
+
+
+def test_connection_limit():
+    broadcaster = Broadcaster(max_clients=1)
+    subscriber = broadcaster.subscribe()
+    with pytest.raises(StreamFull):
+        broadcaster.subscribe()
+    broadcaster.unsubscribe(subscriber)
+    broadcaster.subscribe()
+
+
+def test_stream_endpoint_rejects_clients_over_the_limit(app_context, client, monkeypatch):
+    monkeypatch.setattr(app_context.broadcaster, 'max_clients', 0)
+    response = client.get('/api/stream')
+    assert response.status_code == 503
+
+
+def test_company_totals_count_history_without_summaries(app_context, client, make_employee):
+    day = date(2025, 8, 4)
+    veteran, newcomer = make_employee(), make_employee()
+    client.post('/api/performance', json=performance_record(veteran, day, completed_hrs=9))
+    client.post('/api/performance', json=performance_record(veteran, date(2025, 8, 5), completed_hrs=7))
+    # History written before summaries were stored
+    app_context.MonthlySummary.query.delete()
+    app_context.db.session.commit()
+
+    subscriber = app_context.broadcaster.subscribe()
+    try:
+        client.post('/api/performance', json=performance_record(newcomer, day, completed_hrs=8))
+        event = first_event(app_context.broadcaster, subscriber)
+    finally:
+        app_context.broadcaster.unsubscribe(subscriber)
+
+    company = json.loads(event.split('data: ', 1)[1])['company_month']
+    Record = app_context.DailyPerformance
+    points, hours = app_context.db.session.query(
+        app_context.db.func.sum(Record.approved_points), app_context.db.func.sum(Record.completed_hrs)
+    ).one()
+    assert company['total_points'] == pytest.approx(round(points, 2))
+    assert company['total_hours'] == pytest.approx(round(hours, 2))
+    assert company['total_hours'] == 24
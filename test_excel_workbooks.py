@@ -0,0 +1,203 @@
+"""Tracker workbooks: streamed export, styling, sharded generation and import"""
+
+import os
+from datetime import date
+
+import openpyxl
+
+import excel_import
+import validate_formulas
+import workbook_generator
+from conftest import performance_record
+from employee_performance_tracker import PerformanceTracker, HEADERS, HEADER_STYLE, SUMMARY_INPUT_STYLE
+
+AUGUST_WORKDAYS = 26  # Monday-Saturday, no holidays
+
+
+def saved_workbook(tmp_path, response, name='export.xlsx'):
+    assert response.status_code == 200, response.get_data(as_text=True)[:200]
+    path = tmp_path / name
+    path.write_bytes(response.get_data())
+    return path
+
+
+def test_company_export_streams_one_valid_sheet_per_employee(app_context, client, make_employee, tmp_path):
+    ada = make_employee(name='Ada Lovelace')
+    twin = make_employee(name='Ada Lovelace', department='Sales')
+    make_employee(name='Former Staff', is_active=False)
+    client.post('/api/performance', json=performance_record(ada, date(2025, 8, 4), completed_hrs=7.5, meeting_hrs=1))
+    client.post('/api/performance', json=performance_record(twin, date(2025, 8, 5), leave_taken=True))
+    client.post('/api/performance', json=performance_record(ada, date(2025, 9, 1)))  # Other month
+
+    response = client.get('/api/export_excel/all/2025/8')
+    assert response.is_streamed
+    assert 'Company_Performance_2025_08.xlsx' in response.headers['Content-Disposition']
+    path = saved_workbook(tmp_path, response)
+
+    report = validate_formulas.validate_excel_formulas(str(path))
+    assert report['error_count'] == 0, report['errors']
+    assert (report['sheets'], report['rows']) == (2, 2 * AUGUST_WORKDAYS)
+
+    wb = openpyxl.load_workbook(path)
+    assert wb.sheetnames == ['Ada_Lovelace_Performance', 'EMP00002_Performance']
+    rows = list(wb['Ada_Lovelace_Performance'].iter_rows(min_row=1, max_row=3, max_col=9, values_only=True))
+    assert list(rows[0]) == HEADERS[:9]
+    assert rows[1][0].date() == date(2025, 8, 1) and rows[1][2:7] == (None,) * 5  # No entry that day
+    assert rows[2][0].date() == date(2025, 8, 2)
+    daily = {row[0].date(): row for row in wb['Ada_Lovelace_Performance'].iter_rows(
+        min_row=2, max_row=AUGUST_WORKDAYS + 1, values_only=True)}
+    assert daily[date(2025, 8, 4)][2:9] == (1, 9, 7.5, 1, 1, 'N', 'N')
+
+    sales = saved_workbook(tmp_path, client.get('/api/export_excel/all/2025/8?department=Sales'), 'sales.xlsx')
+    assert openpyxl.load_workbook(sales, read_only=True).sheetnames == ['Ada_Lovelace_Performance']
+
+
+def test_employee_export_checks_its_parameters(app_context, client, make_employee):
+    employee_id = make_employee()
+    assert client.get(f'/api/export_excel/{employee_id}/2025/13').status_code == 400
+    assert client.get(f'/api/export_excel/{employee_id + 1}/2025/8').status_code == 404
+    response = client.get(f'/api/export_excel/{employee_id}/2025/8')
+    assert response.status_code == 200
+    assert 'EMP00001_Performance_2025_08.xlsx' in response.headers['Content-Disposition']
+
+
+def tracker_with_sheets(count):
+    tracker = PerformanceTracker()
+    for index in range(count):
+        tracker.add_employee(f"Employee {index}", 2025, 8)
+    return tracker
+
+
+def test_tracker_cells_use_shared_named_styles(tmp_path):
+    paths = []
+    for count in (1, 6):
+        path = tmp_path / f'tracker-{count}.xlsx'
+        tracker_with_sheets(count).save_workbook(str(path))
+        paths.append(path)
+    small, large = (openpyxl.load_workbook(path) for path in paths)
+
+    # Styles are registered once per workbook, not once per sheet or cell
+    assert len(large.named_styles) == len(small.named_styles)
+    assert len(large._cell_styles) == len(small._cell_styles)
+
+    ws = large.worksheets[-1]
+    header = ws.cell(row=1, column=1)
+    assert header.style == HEADER_STYLE and header.font.bold and header.protection.locked
+    for row in (2, 3):
+        inputs, formula = ws.cell(row=row, column=5), ws.cell(row=row, column=14)
+        assert not inputs.protection.locked and formula.protection.locked
+        assert (inputs.number_format, formula.number_format) == ('0.0', '0.00')
+        assert (inputs.fill.fgColor.rgb == '00F8F9FA') == (row % 2 == 0)
+    salary = ws.cell(row=AUGUST_WORKDAYS + 6, column=3)
+    assert salary.style == SUMMARY_INPUT_STYLE and not salary.protection.locked
+    assert ws.protection.sheet
+
+
+def test_exported_sheets_match_tracker_styles(app_context, client, make_employee, tmp_path):
+    make_employee(name='Employee 0')
+    exported = openpyxl.load_workbook(saved_workbook(tmp_path, client.get('/api/export_excel/all/2025/8')))
+    path = tmp_path / 'tracker.xlsx'
+    tracker_with_sheets(1).save_workbook(str(path))
+    created = openpyxl.load_workbook(path)
+
+    exported_ws, created_ws = exported.worksheets[0], created.worksheets[0]
+    assert exported_ws.max_row == created_ws.max_row
+    for exported_row, created_row in zip(exported_ws.iter_rows(), created_ws.iter_rows()):
+        assert [cell.style for cell in exported_row] == [cell.style for cell in created_row]
+
+
+def test_employee_file_accepts_csv_or_plain_names(tmp_path):
+    csv_file = tmp_path / 'staff.csv'
+    csv_file.write_text('name,department,base_salary\nAda,Research,72000\nGrace,,\n')
+    names = tmp_path / 'names.txt'
+    names.write_text('Ada\n\nGrace\n')
+
+    ada, grace = workbook_generator.read_employee_file(str(csv_file))
+    assert (ada.department, ada.base_salary, ada.employee_id) == ('Research', 72000, 'EMP00001')
+    assert (grace.department, grace.base_salary) == ('General', workbook_generator.DEFAULT_BASE_SALARY)
+    assert [employee.name for employee in workbook_generator.read_employee_file(str(names))] == ['Ada', 'Grace']
+
+
+def test_generator_shards_and_appends_valid_workbooks(tmp_path):
+    employees = [workbook_generator.SheetEmployee(index, name, f"EMP{index:05d}", department, 50000)
+                 for index, (name, department) in enumerate(
+                     [('Ada', 'Research'), ('Grace', 'Research'), ('Ada', 'Ops'), ('Linus', 'Ops'), ('Ken', 'Ops')], 1)]
+
+    written = workbook_generator.generate(employees, 2025, 8, str(tmp_path / 'parts'), shard_size=2, workers=2)
+    assert [count for _, count in written] == [2, 2, 1]
+    titles = [name for path, _ in written for name in openpyxl.load_workbook(path, read_only=True).sheetnames]
+    assert titles == ['Ada_Performance', 'Grace_Performance', 'EMP00003_Performance',
+                      'Linus_Performance', 'Ken_Performance']
+    for path, count in written:
+        report = validate_formulas.validate_excel_formulas(path)
+        assert report['error_count'] == 0 and report['sheets'] == count, report['errors']
+
+    by_department = workbook_generator.generate(employees, 2025, 8, str(tmp_path / 'departments'), by_department=True)
+    assert [(os.path.basename(path), count) for path, count in by_department] == [
+        ('Performance_Ops_2025_08.xlsx', 3), ('Performance_Research_2025_08.xlsx', 2)]
+
+    # Appending splices new sheets in without rewriting the existing ones
+    target = by_department[1][0]
+    newcomers = [workbook_generator.SheetEmployee(9, 'Grace', 'EMP00009', 'Research', 61000),
+                 workbook_generator.SheetEmployee(10, 'Barbara', 'EMP00010', 'Research', 55000)]
+    assert workbook_generator.generate(newcomers, 2025, 8, None, append_to=target) == [(target, 2)]
+    # Titles are unique across every shard of a run, so Research's Ada fell back to the employee code
+    assert openpyxl.load_workbook(target, read_only=True).sheetnames == [
+        'EMP00001_Performance', 'Grace_Performance', 'EMP00009_Performance', 'Barbara_Performance']
+    report = validate_formulas.validate_excel_formulas(target)
+    assert report['error_count'] == 0 and report['sheets'] == 4, report['errors']
+
+
+def test_exported_workbook_round_trips_through_import(app_context, client, make_employee, tmp_path):
+    ada, alan = make_employee(name='Ada Lovelace'), make_employee(name='Alan Turing')
+    client.post('/api/performance', json=performance_record(ada, date(2025, 8, 4), completed_hrs=6))
+    path = saved_workbook(tmp_path, client.get('/api/export_excel/all/2025/8'))
+
+    # Fill the sheets in like a team lead would: edit a day, add a day, and make one typo
+    wb = openpyxl.load_workbook(path)
+    rows = {ws.title: {ws.cell(row=row, column=1).value.date(): row for row in range(2, AUGUST_WORKDAYS + 2)}
+            for ws in wb.worksheets}
+    ada_ws, alan_ws = wb['Ada_Lovelace_Performance'], wb['Alan_Turing_Performance']
+    ada_ws.cell(row=rows[ada_ws.title][date(2025, 8, 4)], column=5).value = 10
+    for column, value in zip(range(3, 10), [1, 9, 8, 1.5, 1, 'N', 'N']):
+        alan_ws.cell(row=rows[alan_ws.title][date(2025, 8, 6)], column=column).value = value
+    for column, value in zip(range(3, 10), [0, 9, 8, 1, 1, 'maybe', 'N']):
+        alan_ws.cell(row=rows[alan_ws.title][date(2025, 8, 7)], column=column).value = value
+    wb.save(path)
+
+    runner = app_context.app.test_cli_runner()
+    report_path = tmp_path / 'report.csv'
+    dry_run = runner.invoke(args=['import-workbooks', str(path), '--workers', '1', '--dry-run'])
+    assert '2 row(s) validated' in dry_run.output
+    assert app_context.DailyPerformance.query.count() == 1
+
+    result = runner.invoke(args=['import-workbooks', str(path), '--workers', '1', '--report', str(report_path)])
+    assert result.exit_code == 1  # The typo is reported, the valid rows still import
+    assert '2 row(s) imported' in result.output
+    report = report_path.read_text()
+    assert 'Alan_Turing_Performance' in report and 'task_failed must be Y or N' in report
+
+    app_context.db.session.expire_all()
+    DailyPerformance = app_context.DailyPerformance
+    stored = {(row.employee_id, row.date): row for row in DailyPerformance.query}
+    assert set(stored) == {(ada, date(2025, 8, 4)), (alan, date(2025, 8, 6))}
+    assert stored[(ada, date(2025, 8, 4))].completed_hrs == 10
+    assert stored[(alan, date(2025, 8, 6))].complexity_factor == 1.5
+    assert stored[(alan, date(2025, 8, 6))].updated_by == 'Excel Import'
+    assert app_context.find_summary_drift(2025, 8) == []
+
+
+def test_import_reports_sheets_without_an_employee(app_context, make_employee, tmp_path):
+    make_employee(name='Ada Lovelace')
+    make_employee(name='Ada Lovelace')
+    path = tmp_path / 'tracker.xlsx'
+    tracker = PerformanceTracker()
+    tracker.add_employee('Ada_Lovelace', 2025, 8, sample_data=True)
+    tracker.add_employee('Nobody', 2025, 8, sample_data=True)
+    tracker.save_workbook(str(path))
+
+    parsed = excel_import.read_tracker_workbook(str(path))
+    report = app_context.import_tracker_workbook(parsed, app_context.employee_sheet_index(), 'Excel Import')
+    assert report['imported'] == 0
+    assert [error for _, _, error in report['errors']] == [
+        'Sheet name matches several employees', 'Sheet name does not match any employee']
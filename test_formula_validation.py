@@ -0,0 +1,91 @@
+"""Pure-Python formula evaluator and tracker workbook validation against performance_rules"""
+
+import random
+import subprocess
+import sys
+from datetime import datetime
+
+import openpyxl
+import pytest
+
+import validate_formulas
+from employee_performance_tracker import PerformanceTracker
+from formula_evaluator import SheetEvaluator, FormulaError, DIV0, VALUE, parse_cell
+
+
+def tracker_workbook(path):
+    # Fixed sample data: exact half-cent ties round differently in Excel (half up) and Python (half even)
+    random.seed(2025)
+    tracker = PerformanceTracker()
+    tracker.add_employee("Alice Smith", 2025, 8, sample_data=True)
+    tracker.add_employee("Bob Jones", 2025, 8, sample_data=True)
+    return tracker.save_workbook(str(path))
+
+
+def test_generated_workbook_validates(tmp_path):
+    report = validate_formulas.validate_excel_formulas(tracker_workbook(tmp_path / 'tracker.xlsx'))
+    assert report['error_count'] == 0, report['errors']
+    assert report['sheets'] == 2
+    assert report['rows'] > 0
+
+
+def test_tampered_formula_is_reported(tmp_path):
+    path = tracker_workbook(tmp_path / 'tracker.xlsx')
+    wb = openpyxl.load_workbook(path)
+    ws = wb.worksheets[0]
+    ws.cell(row=2, column=14).value = '=L2*2'  # Approved Points no longer follows the engine
+    wb.save(path)
+
+    report = validate_formulas.validate_excel_formulas(path)
+    assert report['error_count'] > 0
+    assert any('row 2' in message for message in report['errors'])
+
+
+def test_validation_does_not_import_the_web_app(tmp_path):
+    path = tracker_workbook(tmp_path / 'tracker.xlsx')
+    script = (
+        "import sys, validate_formulas\n"
+        f"report = validate_formulas.validate_excel_formulas({str(path)!r})\n"
+        "assert report['error_count'] == 0, report['errors']\n"
+        "print(sorted(name for name in ('app', 'flask', 'flask_sqlalchemy') if name in sys.modules))\n"
+    )
+    result = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True,
+                            cwd=validate_formulas.__file__.rsplit('/', 1)[0])
+    assert result.stdout.strip().splitlines()[-1] == '[]'
+
+
+def evaluate(formula, **cells):
+    """Value of formula on a sheet holding cells given as A1=value keyword arguments"""
+    grid = {parse_cell(reference): value for reference, value in cells.items()}
+    grid[(99, 1)] = formula
+    return SheetEvaluator(grid).value(99, 1)
+
+
+@pytest.mark.parametrize('formula, cells, expected', [
+    ('=ROUND(A1,2)', {'A1': 2.675}, 2.68),  # Half away from zero; Python's round() gives 2.67
+    ('=ROUND(A1,2)', {'A1': -1.005}, -1.01),
+    ('=IF(A1="Y",0,9-B1)', {'A1': 'y', 'B1': 1.5}, 0),  # Text comparison ignores case
+    ('=IF(A1="Y",0,9-B1)', {'B1': 1.5}, 7.5),  # Blank input
+    ('=IF(A1>B1,A1-B1,0)', {'A1': 10, 'B1': 9}, 1),
+    ('=SUM(A1:A3)', {'A1': 1, 'A2': 'text', 'A3': 2.5}, 3.5),
+    ('=COUNTA(A1:A4)', {'A1': 1, 'A2': '', 'A4': 'x'}, 2),
+    ('=MIN(A1*B1,C1*0.5)', {'A1': 100, 'B1': 300, 'C1': 50000}, 25000),
+    ('=TEXT(A1,"ddd")', {'A1': datetime(2025, 8, 4)}, 'Mon'),
+    ('=A1&"-"&B1', {'A1': 'EMP', 'B1': 7}, 'EMP-7'),
+    ('=-A1+2*3', {'A1': 1}, 5),
+])
+def test_evaluator_follows_excel_semantics(formula, cells, expected):
+    assert evaluate(formula, **cells) == expected
+
+
+def test_evaluator_propagates_errors():
+    assert evaluate('=A1/B1', A1=1, B1=0) == DIV0
+    assert evaluate('=ROUND(A1*2,2)', A1='abc') == VALUE
+    assert evaluate('=SUM(A1:A2)', A1='=1/0', A2=3) == DIV0
+    assert evaluate('=IF(A1=1,1,0)', A1='=A1+1') == VALUE  # Circular reference
+
+
+@pytest.mark.parametrize('formula', ['=VLOOKUP(A1,B1:C2,2)', '=A1+', '=TEXT(A1,"mmm")'])
+def test_evaluator_rejects_formulas_outside_the_tracker_set(formula):
+    with pytest.raises(FormulaError):
+        evaluate(formula, A1=datetime(2025, 8, 4))
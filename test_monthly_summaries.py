@@ -0,0 +1,225 @@
+"""MonthlySummary running totals: incremental deltas, drift repair and finalized months"""
+
+from datetime import date
+
+from conftest import performance_record, statements
+
+DAY = date(2025, 8, 4)
+SUMMARY_FIELDS = ('total_points', 'total_hours', 'recorded_days', 'efficiency_sum',
+                  'task_failures', 'leave_days', 'overtime_days', 'final_bonus')
+
+
+def summary_values(app_context, employee_id, year=2025, month=8):
+    summary = app_context.MonthlySummary.query.filter_by(employee_id=employee_id, year=year, month=month).one()
+    return {field: getattr(summary, field) for field in SUMMARY_FIELDS}
+
+
+def recomputed_values(app_context, employee_id, year=2025, month=8):
+    app_context.db.session.expire_all()
+    summary = app_context.calculate_monthly_compensation(employee_id, year, month)
+    values = {field: getattr(summary, field) for field in SUMMARY_FIELDS}
+    app_context.db.session.rollback()
+    return values
+
+
+def assert_close(actual, expected):
+    assert actual.keys() == expected.keys()
+    for field in actual:
+        assert abs(actual[field] - expected[field]) < 1e-6, field
+
+
+def test_deltas_match_full_recompute(app_context, client, make_employee):
+    employee_id = make_employee()
+    records = [
+        performance_record(employee_id, DAY, completed_hrs=10, complexity_factor=2),
+        performance_record(employee_id, date(2025, 8, 5), leave_taken=True),
+        performance_record(employee_id, date(2025, 8, 6), completed_hrs=7, task_failed=True),
+    ]
+    for record in records:
+        assert client.post('/api/performance', json=record).status_code == 200
+    # Overwrites shift the totals by the difference only
+    client.post('/api/performance', json=performance_record(employee_id, DAY, completed_hrs=3))
+    client.post('/api/performance/bulk', json={'records': [
+        performance_record(employee_id, date(2025, 8, 5), completed_hrs=12),
+        performance_record(employee_id, date(2025, 8, 7), completed_hrs=9),
+    ]})
+
+    stored = summary_values(app_context, employee_id)
+    assert stored['recorded_days'] == 4
+    assert_close(stored, recomputed_values(app_context, employee_id))
+    assert app_context.find_summary_drift(2025, 8) == []
+
+
+def test_drift_fix_repairs_open_summaries(app_context, client, make_employee):
+    employee_id = make_employee()
+    client.post('/api/performance', json=performance_record(employee_id, DAY, completed_hrs=9))
+    summary = app_context.MonthlySummary.query.filter_by(employee_id=employee_id).one()
+    summary.total_points += 5
+    app_context.db.session.commit()
+
+    drift = app_context.find_summary_drift(2025, 8, fix=True)
+    assert [(employee, field) for employee, field, _, _ in drift] == [(employee_id, 'total_points')]
+    assert app_context.find_summary_drift(2025, 8) == []
+
+
+def test_finalized_month_is_frozen(app_context, client, make_employee):
+    employee_id = make_employee()
+    client.post('/api/performance', json=performance_record(employee_id, DAY, completed_hrs=9))
+    response = client.post('/api/finalize_month', json={'year': 2025, 'month': 8})
+    assert response.json['finalized'] == 1
+    frozen = summary_values(app_context, employee_id)
+
+    response = client.post('/api/performance', json=performance_record(employee_id, DAY, completed_hrs=16))
+    assert response.status_code == 409
+
+    response = client.post('/api/performance/bulk', json={'records': [
+        performance_record(employee_id, date(2025, 8, 6), completed_hrs=16),
+        performance_record(employee_id, date(2025, 9, 1), completed_hrs=8),
+    ]})
+    assert [result['success'] for result in response.json['results']] == [False, True]
+
+    # Drift repair leaves the closed month alone even when its daily rows changed underneath
+    performance = app_context.DailyPerformance.query.filter_by(employee_id=employee_id, date=DAY).one()
+    performance.approved_points += 50
+    app_context.db.session.commit()
+    assert app_context.find_summary_drift(2025, 8, fix=True) == []
+
+    app_context.db.session.expire_all()
+    assert summary_values(app_context, employee_id) == frozen
+
+
+def test_reading_a_month_does_not_persist_a_summary(app_context, client, make_employee):
+    employee_id = make_employee()
+    performance = app_context.DailyPerformance(
+        employee_id=employee_id, date=DAY, meeting_hrs=0, assigned_hrs=9, completed_hrs=8,
+        complexity_factor=1.0, qa_factor=1.0, task_failed=False, leave_taken=False
+    )
+    app_context.calculate_performance_metrics(performance)
+    app_context.db.session.add(performance)
+    app_context.db.session.commit()
+
+    summary = app_context.get_monthly_summary(employee_id, 2025, 8)
+    assert summary.total_points == performance.approved_points
+    app_context.db.session.commit()
+    assert app_context.MonthlySummary.query.count() == 0
+
+    assert client.get(f'/performance/{employee_id}').status_code == 200
+    assert app_context.MonthlySummary.query.count() == 0
+
+
+def test_finalize_api_runs_serially(app_context, client, make_employee, monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError('the web route must not start a process pool')
+
+    monkeypatch.setattr(app_context, 'ProcessPoolExecutor', no_pool)
+    monkeypatch.setattr(app_context, 'FINALIZE_PARALLEL_THRESHOLD', 1)
+    monkeypatch.setattr(app_context, 'FINALIZE_WORKERS', 4)
+    for _ in range(3):
+        employee_id = make_employee()
+        client.post('/api/performance', json=performance_record(employee_id, DAY, completed_hrs=9))
+
+    response = client.post('/api/finalize_month', json={'year': 2025, 'month': 8})
+    assert response.json['success'] is True
+    assert response.json['finalized'] == 3
+
+
+def test_finalize_cli_pool_matches_serial_figures(app_context, client, make_employee, monkeypatch):
+    monkeypatch.setattr(app_context, 'FINALIZE_PARALLEL_THRESHOLD', 1)
+    employee_ids = [make_employee() for _ in range(3)]
+    for offset, employee_id in enumerate(employee_ids):
+        client.post('/api/performance', json=performance_record(employee_id, DAY, completed_hrs=6 + offset))
+    expected = {employee_id: recomputed_values(app_context, employee_id) for employee_id in employee_ids}
+
+    result = app_context.app.test_cli_runner().invoke(
+        args=['finalize-month', '--year', '2025', '--month', '8', '--workers', '2'])
+    assert 'Finalized 3 employee(s)' in result.output
+
+    app_context.db.session.expire_all()
+    for employee_id in employee_ids:
+        assert_close(summary_values(app_context, employee_id), expected[employee_id])
+
+
+def test_salary_change_refreshes_open_summaries(app_context, client, make_employee):
+    employee_id = make_employee(base_salary=60000)
+    today = date.today()
+    for day in (DAY, today):
+        client.post('/api/performance', json=performance_record(employee_id, day, completed_hrs=9))
+    client.post('/api/finalize_month', json={'year': 2025, 'month': 8})
+    frozen = summary_values(app_context, employee_id)
+
+    response = client.post(f'/api/employee/{employee_id}/edit', json={'base_salary': 120000})
+    assert response.json['success'] is True
+
+    app_context.db.session.expire_all()
+    summary = app_context.get_monthly_summary(employee_id, today.year, today.month)
+    assert summary.base_salary == 120000
+    assert_close(summary_values(app_context, employee_id, today.year, today.month),
+                 recomputed_values(app_context, employee_id, today.year, today.month))
+    assert summary_values(app_context, employee_id) == frozen  # Finalized months keep the old salary
+    assert client.get(f'/performance/{employee_id}').status_code == 200
+
+
+def reshape_to_baseline_schema(app_context):
+    """Turn the fresh schema back into the original one: no stored summaries, running totals, rollups or indexes"""
+    db = app_context.db
+    for statement in ('DELETE FROM monthly_summary', 'DROP TABLE daily_rollup', 'DROP TABLE company_holiday',
+                      'DROP INDEX ix_daily_performance_date', 'DROP INDEX ix_employee_name_id',
+                      'ALTER TABLE monthly_summary DROP COLUMN recorded_days',
+                      'ALTER TABLE monthly_summary DROP COLUMN efficiency_sum'):
+        db.session.execute(db.text(statement))
+    db.session.commit()
+
+
+def test_upgrade_backfills_summaries_from_the_daily_rows(app_context, client, make_employee):
+    employee_ids = [make_employee(), make_employee(department='Sales')]
+    for employee_id in employee_ids:
+        for day in (date(2025, 7, 31), DAY, date(2025, 8, 5)):
+            client.post('/api/performance', json=performance_record(employee_id, day, completed_hrs=6 + day.day % 4))
+    reshape_to_baseline_schema(app_context)
+
+    app_context.db.create_all()
+    app_context.upgrade_schema()
+
+    summaries = app_context.MonthlySummary.query.all()
+    assert sorted((summary.employee_id, summary.month) for summary in summaries) == [
+        (employee_id, month) for employee_id in employee_ids for month in (7, 8)]
+    for employee_id in employee_ids:
+        stored = summary_values(app_context, employee_id)
+        assert stored['recorded_days'] == 2
+        assert_close(stored, recomputed_values(app_context, employee_id))
+    assert app_context.find_summary_drift(2025, 7) == []
+
+    # Later writes move the backfilled totals by their delta
+    client.post('/api/performance', json=performance_record(employee_ids[0], DAY, completed_hrs=16))
+    assert_close(summary_values(app_context, employee_ids[0]), recomputed_values(app_context, employee_ids[0]))
+    app_context.upgrade_schema()  # Nothing left to backfill
+    assert app_context.MonthlySummary.query.count() == 4
+
+
+def test_delta_writes_the_summary_in_one_statement(app_context, client, make_employee):
+    employee_id = make_employee()
+    client.post('/api/performance', json=performance_record(employee_id, DAY, completed_hrs=6))
+
+    with statements(app_context.db.engine) as executed:
+        client.post('/api/performance', json=performance_record(employee_id, DAY, completed_hrs=9))
+    assert len([sql for sql in executed if 'monthly_summary' in sql.split(' WHERE ')[0]
+                and not sql.startswith('SELECT')]) == 1
+    assert len([sql for sql in executed if sql.startswith('SELECT') and 'employee.department_id' in sql]) == 1
+
+    fields = SUMMARY_FIELDS + ('avg_efficiency', 'bonus_rate', 'base_salary', 'total_compensation')
+    app_context.db.session.expire_all()
+    summary = app_context.MonthlySummary.query.filter_by(employee_id=employee_id).one()
+    stored = {field: getattr(summary, field) for field in fields}
+    summary = app_context.calculate_monthly_compensation(employee_id, 2025, 8)
+    assert_close(stored, {field: getattr(summary, field) for field in fields})
+
+
+def test_delta_caps_the_bonus(app_context, client, make_employee, monkeypatch):
+    monkeypatch.setattr(app_context, 'working_day_count', lambda year, month: 1)
+    employee_id = make_employee()
+    for day in (DAY, date(2025, 8, 5), DAY):
+        client.post('/api/performance', json=performance_record(employee_id, day, completed_hrs=10))
+
+    summary = app_context.MonthlySummary.query.filter_by(employee_id=employee_id).one()
+    assert summary.total_points > 10
+    assert (summary.final_bonus, summary.total_compensation) == (30000, 90000)
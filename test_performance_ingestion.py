@@ -0,0 +1,80 @@
+"""Single and bulk performance writes"""
+
+from datetime import date
+
+from conftest import performance_record, statements
+
+DAY = date(2025, 8, 4)
+
+
+def test_single_save_upserts_in_place(app_context, client, make_employee):
+    employee_id = make_employee()
+    first = client.post('/api/performance', json=performance_record(employee_id, DAY, completed_hrs=6))
+    assert first.json['data']['approved_points'] > 0
+    row_id = app_context.DailyPerformance.query.one().id
+
+    with statements(app_context.db.engine) as executed:
+        second = client.post('/api/performance', json=performance_record(
+            employee_id, DAY, completed_hrs=40, meeting_hrs=-2, complexity_factor=9, task_failed=True))
+    assert second.status_code == 200
+
+    writes = [sql for sql in executed if sql.startswith(('INSERT INTO daily_performance', 'UPDATE daily_performance'))]
+    assert len(writes) == 1 and 'ON CONFLICT' in writes[0]
+
+    app_context.db.session.expire_all()
+    performance = app_context.DailyPerformance.query.one()
+    assert performance.id == row_id
+    assert (performance.completed_hrs, performance.meeting_hrs, performance.complexity_factor) == (16, 0, 3.0)
+    assert performance.approved_points == 0  # Failed task
+    assert performance.updated_by == 'System Admin'
+    assert app_context.PerformanceAudit.query.filter_by(employee_id=employee_id).count() == 2
+
+
+def test_single_save_requires_the_key_fields(app_context, client, make_employee):
+    employee_id = make_employee()
+    response = client.post('/api/performance', json={'employee_id': employee_id, 'completed_hrs': 8})
+    assert response.status_code == 400
+    assert 'date' in response.json['error']
+    assert app_context.DailyPerformance.query.count() == 0
+
+
+def test_single_save_rejects_unknown_employees(app_context, client, make_employee):
+    employee_id = make_employee()
+    response = client.post('/api/performance', json=performance_record(employee_id + 1, DAY))
+    assert response.status_code == 404
+    assert response.json['error'] == f'Unknown employee: {employee_id + 1}'
+    for model in (app_context.DailyPerformance, app_context.DailyRollup, app_context.MonthlySummary):
+        assert model.query.count() == 0
+
+
+def test_bulk_duplicates_are_superseded_not_failed(app_context, client, make_employee):
+    employee_id = make_employee()
+    response = client.post('/api/performance/bulk', json={'records': [
+        performance_record(employee_id, DAY, completed_hrs=6),
+        performance_record(employee_id, date(2025, 8, 5)),
+        performance_record(employee_id, DAY, completed_hrs=9),
+    ]})
+    body = response.json
+
+    assert body['success'] is True
+    assert (body['saved'], body['superseded'], body['failed']) == (2, 1, 0)
+    assert [result['status'] for result in body['results']] == ['superseded', 'saved', 'saved']
+    assert body['results'][0]['superseded_by'] == 2
+    performance = app_context.DailyPerformance.query.filter_by(employee_id=employee_id, date=DAY).one()
+    assert performance.completed_hrs == 9
+
+
+def test_bulk_duplicates_share_the_failure_of_the_last_record(app_context, client, make_employee):
+    employee_id = make_employee()
+    response = client.post('/api/performance/bulk', json={'records': [
+        performance_record(employee_id + 1, DAY),
+        performance_record(employee_id + 1, DAY),
+        performance_record(employee_id, DAY),
+        {'employee_id': employee_id},
+    ]})
+    body = response.json
+
+    assert body['success'] is False
+    assert (body['saved'], body['superseded'], body['failed']) == (1, 0, 3)
+    assert [result['status'] for result in body['results']] == ['failed', 'failed', 'saved', 'failed']
+    assert body['results'][0]['index'] == 0
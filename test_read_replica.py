@@ -0,0 +1,60 @@
+"""Replica routing, read-your-writes and the response cache"""
+
+import time
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine
+
+import database_config
+import response_cache
+from conftest import performance_record
+
+LEADERBOARD = '/api/leaderboard?month=2025-08'
+
+
+@pytest.fixture
+def lagging_replica(app_context, tmp_path, monkeypatch):
+    """A replica bind on its own SQLite file that never catches up with the primary"""
+    db = app_context.db
+    engine = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    db.metadata.create_all(engine)
+    monkeypatch.setitem(app_context.app.config, 'SQLALCHEMY_BINDS', {database_config.READ_BIND: 'replica'})
+    monkeypatch.setitem(db.engines, database_config.READ_BIND, engine)
+    yield engine
+    engine.dispose()
+
+
+def leaderboard_ids(response):
+    return [row['employee_id'] for row in response.json]
+
+
+def test_writer_reads_the_primary_and_never_a_cached_replica_copy(app_context, lagging_replica, make_employee):
+    writer, reader = app_context.app.test_client(), app_context.app.test_client()
+    employee_id = make_employee()
+    assert writer.post('/api/performance', json=performance_record(employee_id, date(2025, 8, 4))).status_code == 200
+
+    # Another client fills the cache from the replica, which has not seen the write
+    stale = reader.get(LEADERBOARD)
+    assert leaderboard_ids(stale) == []
+    assert reader.get(LEADERBOARD).headers['X-Cache'] == 'HIT'
+
+    fresh = writer.get(LEADERBOARD)
+    assert fresh.headers['X-Cache'] == 'MISS'
+    assert leaderboard_ids(fresh) == [employee_id]
+    assert fresh.headers['ETag'] != stale.headers['ETag']
+
+
+def test_replica_entries_expire_with_the_read_your_writes_window(app_context, lagging_replica, client):
+    client.get(LEADERBOARD)
+    (expires_at, entry), = response_cache.backend.entries.values()
+    assert '|replica|' in next(iter(response_cache.backend.entries))
+    assert expires_at <= time.monotonic() + database_config.READ_YOUR_WRITES_SECONDS
+
+
+def test_without_a_replica_reads_use_the_primary(app_context, client, make_employee):
+    employee_id = make_employee()
+    client.post('/api/performance', json=performance_record(employee_id, date(2025, 8, 4)))
+    reader = app_context.app.test_client()
+    assert leaderboard_ids(reader.get(LEADERBOARD)) == [employee_id]
+    assert '|primary|' in next(iter(response_cache.backend.entries))
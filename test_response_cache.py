@@ -0,0 +1,93 @@
+"""Analytics response cache: generation invalidation and ETag revalidation"""
+
+from datetime import date
+
+import response_cache
+from conftest import performance_record
+
+DAY = date(2025, 8, 4)
+LEADERBOARD = '/api/leaderboard?month=2025-08'
+
+
+def test_hit_after_miss_and_304_on_revalidation(app_context, client, make_employee):
+    employee_id = make_employee()
+    client.post('/api/performance', json=performance_record(employee_id, DAY))
+
+    first = client.get(LEADERBOARD)
+    assert first.headers['X-Cache'] == 'MISS'
+    second = client.get(LEADERBOARD)
+    assert second.headers['X-Cache'] == 'HIT'
+    assert second.get_data() == first.get_data()
+    assert second.headers['ETag'] == first.headers['ETag']
+
+    revalidation = client.get(LEADERBOARD, headers={'If-None-Match': first.headers['ETag']})
+    assert revalidation.status_code == 304
+    assert revalidation.headers['ETag'] == first.headers['ETag']
+
+
+def test_etag_is_the_same_on_another_worker(app_context, client, make_employee):
+    employee_id = make_employee()
+    client.post('/api/performance', json=performance_record(employee_id, DAY))
+    etag = client.get(LEADERBOARD).headers['ETag']
+
+    # A second worker has its own empty cache and its own generation counters
+    response_cache.backend = response_cache.MemoryBackend()
+    response_cache.backend.bump(['2025-08/*', 'all/*'])
+    response = client.get(LEADERBOARD, headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.headers['ETag'] == etag
+
+
+def test_writes_invalidate_only_their_month(app_context, client, make_employee):
+    employee_id = make_employee()
+    client.post('/api/performance', json=performance_record(employee_id, DAY))
+    etag = client.get(LEADERBOARD).headers['ETag']
+
+    client.post('/api/performance', json=performance_record(employee_id, date(2025, 9, 1)))
+    assert client.get(LEADERBOARD).headers['X-Cache'] == 'HIT'
+
+    client.post('/api/performance', json=performance_record(employee_id, date(2025, 8, 5)))
+    response = client.get(LEADERBOARD, headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['X-Cache'] == 'MISS'
+    assert response.headers['ETag'] != etag
+
+
+def test_errors_are_not_cached(app_context, client):
+    assert client.get('/api/leaderboard?month=2025-13').status_code == 400
+    response = client.get('/api/leaderboard?month=2025-13')
+    assert response.status_code == 400
+    assert 'X-Cache' not in response.headers
+
+
+def cache_states(client, departments):
+    return {department: client.get(f"{LEADERBOARD}&department={department}" if department else LEADERBOARD)
+            .headers['X-Cache'] for department in departments}
+
+
+def test_writes_invalidate_only_their_department(app_context, client, make_employee):
+    engineer, seller = make_employee(), make_employee(department='Sales')
+    departments = dict(app_context.db.session.query(app_context.Department.name, app_context.Department.id))
+    views = [None, 'Engineering', 'Sales']
+    client.post('/api/performance', json=performance_record(engineer, DAY))
+    cache_states(client, views)
+
+    client.post('/api/performance', json=performance_record(engineer, date(2025, 8, 5)))
+    assert cache_states(client, views) == {None: 'MISS', 'Engineering': 'MISS', 'Sales': 'HIT'}
+    # Ids and names share the same generations
+    assert cache_states(client, [str(departments['Sales'])]) == {str(departments['Sales']): 'MISS'}
+    assert cache_states(client, [str(departments['Sales'])]) == {str(departments['Sales']): 'HIT'}
+
+    # Moving an employee touches every month of both departments
+    client.post(f'/api/employee/{seller}/edit', json={'department_id': departments['Engineering']})
+    assert cache_states(client, views) == {None: 'MISS', 'Engineering': 'MISS', 'Sales': 'MISS'}
+    assert cache_states(client, views) == {None: 'HIT', 'Engineering': 'HIT', 'Sales': 'HIT'}
+
+
+def test_whole_month_invalidation_reaches_every_department(app_context, client, make_employee):
+    make_employee(), make_employee(department='Sales')
+    views = [None, 'Engineering', 'Sales']
+    cache_states(client, views)
+    with app_context.app.test_request_context():
+        app_context.invalidate_month_cache([(2025, 8)])
+    assert cache_states(client, views) == {None: 'MISS', 'Engineering': 'MISS', 'Sales': 'MISS'}
@@ -0,0 +1,94 @@
+"""NumPy batch scoring kernel against the scalar engine"""
+
+from datetime import date
+from types import SimpleNamespace
+
+import numpy as np
+
+from conftest import performance_record
+from performance_rules import calculate_performance_metrics
+from scoring_kernel import calculate_performance_metrics_batch, INPUT_COLUMNS, DERIVED_COLUMNS
+
+
+def scalar_columns(inputs):
+    # Plain Python values, as loaded from the database (round() on np.float64 rounds differently)
+    rows = [calculate_performance_metrics(SimpleNamespace(**dict(zip(INPUT_COLUMNS, values))))
+            for values in zip(*(np.asarray(inputs[column]).tolist() for column in INPUT_COLUMNS))]
+    return {column: np.array([getattr(row, column) for row in rows], dtype=np.float64)
+            for column in DERIVED_COLUMNS}
+
+
+def test_batch_matches_scalar_engine_bit_for_bit():
+    rng = np.random.default_rng(7)
+    size = 20000
+    inputs = {
+        # Quarter-hour and 0.05-step factors produce plenty of exact rounding ties
+        'meeting_hrs': rng.integers(0, 37, size) / 4,
+        'assigned_hrs': rng.integers(4, 49, size) / 4,
+        'completed_hrs': rng.integers(0, 65, size) / 4,
+        'complexity_factor': rng.integers(10, 61, size) / 20,
+        'qa_factor': rng.integers(6, 41, size) / 20,
+        'task_failed': rng.random(size) < 0.05,
+        'leave_taken': rng.random(size) < 0.05,
+    }
+    inputs['meeting_hrs'][:50] = 9  # No available hours
+
+    batch = calculate_performance_metrics_batch(**inputs)
+    expected = scalar_columns(inputs)
+    for column in DERIVED_COLUMNS:
+        assert np.array_equal(batch[column], expected[column]), column
+
+
+def test_rounding_ties_follow_python_round():
+    # efficiency * raw_points lands on (or within float error of) a half cent
+    inputs = {
+        'meeting_hrs': [1, 1, 0, 5], 'assigned_hrs': [9, 9, 9, 9], 'completed_hrs': [8, 4.5, 2.25, 0.5],
+        'complexity_factor': [1.0, 1.0, 1.0, 1.0], 'qa_factor': [0.3, 1.0, 1.0, 1.0],
+        'task_failed': [False] * 4, 'leave_taken': [False] * 4,
+    }
+    batch = calculate_performance_metrics_batch(**inputs)
+    assert list(batch['approved_points']) == list(scalar_columns(inputs)['approved_points'])
+
+
+def test_recompute_command_repairs_stale_derived_columns(app_context, client, make_employee):
+    employee_id = make_employee()
+    for day in (date(2025, 8, 4), date(2025, 8, 5)):
+        client.post('/api/performance', json=performance_record(employee_id, day, completed_hrs=7))
+    DailyPerformance = app_context.DailyPerformance
+    expected = DailyPerformance.query.order_by(DailyPerformance.date).first().approved_points
+    app_context.db.session.execute(app_context.db.update(DailyPerformance).where(
+        DailyPerformance.date == date(2025, 8, 4)).values(approved_points=99))
+    app_context.db.session.commit()
+
+    runner = app_context.app.test_cli_runner()
+    args = ['recompute-performance', '--start', '2025-08-01', '--end', '2025-08-31']
+    assert '1 would change' in runner.invoke(args=args + ['--dry-run']).output
+    assert '1 rewritten' in runner.invoke(args=args).output
+
+    app_context.db.session.expire_all()
+    assert DailyPerformance.query.order_by(DailyPerformance.date).first().approved_points == expected
+    assert app_context.find_summary_drift(2025, 8) == []
+
+
+def test_recompute_command_leaves_finalized_months_alone(app_context, client, make_employee):
+    employee_id = make_employee()
+    for day in (date(2025, 7, 31), date(2025, 8, 4)):
+        client.post('/api/performance', json=performance_record(employee_id, day, completed_hrs=7))
+    client.post('/api/finalize_month', json={'year': 2025, 'month': 7})
+    DailyPerformance, MonthlySummary = app_context.DailyPerformance, app_context.MonthlySummary
+    app_context.db.session.execute(app_context.db.update(DailyPerformance).values(approved_points=99))
+    app_context.db.session.commit()
+    july = MonthlySummary.query.filter_by(employee_id=employee_id, year=2025, month=7).one()
+    frozen = (july.total_points, july.final_bonus)
+
+    output = app_context.app.test_cli_runner().invoke(
+        args=['recompute-performance', '--start', '2025-07-01', '--end', '2025-08-31']).output
+    assert '1 rewritten, 1 left in finalized months' in output
+
+    app_context.db.session.expire_all()
+    points = dict(app_context.db.session.query(DailyPerformance.date, DailyPerformance.approved_points))
+    assert points[date(2025, 7, 31)] == 99
+    assert points[date(2025, 8, 4)] != 99
+    july = MonthlySummary.query.filter_by(employee_id=employee_id, year=2025, month=7).one()
+    assert (july.total_points, july.final_bonus) == frozen
+    assert app_context.find_summary_drift(2025, 8) == []
@@ -0,0 +1,77 @@
+"""Working-day calendar against a day-by-day count, and company holiday maintenance"""
+
+import random
+from datetime import date, timedelta
+
+import pytest
+
+import work_calendar
+from conftest import performance_record
+
+HOLIDAYS = [date(2025, 8, 15), date(2025, 8, 17), date(2025, 12, 25), date(2026, 1, 1), date(2024, 2, 29)]
+
+
+@pytest.fixture
+def holidays():
+    work_calendar.set_holidays(HOLIDAYS)
+    yield HOLIDAYS
+    work_calendar.set_holidays([])
+
+
+def naive_working_days(start, end):
+    days = [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+    return [day for day in days if day.weekday() < 6 and day not in HOLIDAYS]
+
+
+def test_month_tables_match_a_day_by_day_walk(holidays):
+    for year in (2024, 2025, 2026):
+        for month in range(1, 13):
+            start = date(year, month, 1)
+            end = date(year + 1, 1, 1) - timedelta(days=1) if month == 12 else date(year, month + 1, 1) - timedelta(days=1)
+            expected = naive_working_days(start, end)
+            assert work_calendar.working_days(year, month) == expected
+            assert work_calendar.working_day_count(year, month) == len(expected)
+            assert work_calendar.working_days_through(start + timedelta(days=9)) == len(
+                naive_working_days(start, start + timedelta(days=9)))
+    assert work_calendar.working_day_count(2025, 8) == 25  # 26 Monday-Saturdays, the 17th is a Sunday
+
+
+def test_ranges_match_a_day_by_day_walk(holidays):
+    rng = random.Random(14)
+    for _ in range(300):
+        start = date(2023, 1, 1) + timedelta(days=rng.randrange(1400))
+        end = start + timedelta(days=rng.randrange(-5, 500))
+        expected = len(naive_working_days(start, end)) if end >= start else 0
+        assert work_calendar.working_days_between(start, end) == expected, (start, end)
+
+
+def test_month_tables_are_reused_until_the_holidays_change(holidays):
+    work_calendar.working_days(2025, 8)
+    hits = work_calendar.month_table.cache_info().hits
+    work_calendar.set_holidays(list(reversed(HOLIDAYS)))  # Same set
+    work_calendar.working_days(2025, 8)
+    assert work_calendar.month_table.cache_info().hits == hits + 1
+
+    work_calendar.set_holidays(HOLIDAYS[1:])
+    assert work_calendar.month_table.cache_info().currsize == 0
+    assert work_calendar.working_day_count(2025, 8) == 26
+
+
+def test_holiday_commands_refresh_open_summaries(app_context, client, make_employee):
+    employee_id = make_employee()
+    client.post('/api/performance', json=performance_record(employee_id, date(2025, 8, 4)))
+    summary = app_context.MonthlySummary.query.one()
+    assert summary.total_workdays == 26
+
+    runner = app_context.app.test_cli_runner()
+    result = runner.invoke(args=['holidays', 'add', '2025-08-15', 'Independence Day'])
+    assert '25 working day(s); 1 open summary(ies) refreshed' in result.output
+    app_context.db.session.expire_all()
+    assert app_context.MonthlySummary.query.one().total_workdays == 25
+    assert app_context.get_working_days(2025, 8)[11:13] == [date(2025, 8, 14), date(2025, 8, 16)]
+
+    assert 'Independence Day' in runner.invoke(args=['holidays', 'list', '--year', '2025']).output
+    assert runner.invoke(args=['holidays', 'add', '2025-08-15', 'Again']).exit_code != 0
+    assert '26 working day(s)' in runner.invoke(args=['holidays', 'remove', '2025-08-15']).output
+    app_context.db.session.expire_all()
+    assert app_context.MonthlySummary.query.one().total_workdays == 26
@@ -1,122 +1,181 @@
 #!/usr/bin/env python3
 """
-Validate the formulas in the generated Excel file
+Validate the formulas in generated Excel files
+Recalculates every row of every tracker sheet with a pure-Python formula evaluator
+(no Excel/LibreOffice recalculation needed) and checks the results against
+the app's scoring rules (performance_rules)
 """
 
+import argparse
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
 import openpyxl
 
-def validate_excel_formulas():
-    """Validate that all formulas in the Excel file are working correctly"""
-    
-    print("🔍 Validating Excel formulas...")
-    
-    # Load the generated workbook
-    filename = "Employee_Performance_Tracker_Aug2025.xlsx"
-    wb = openpyxl.load_workbook(filename, data_only=True)
-    
-    # Check Template sheet (clean data)
-    print("\n📋 Validating Template sheet...")
-    ws = wb["Template_Performance"]
-    
-    # Check a sample row (row 2)
-    print("Row 2 values:")
-    date_val = ws['A2'].value
-    day_val = ws['B2'].value  
-    meeting_hrs = ws['C2'].value
-    assigned_hrs = ws['D2'].value
-    completed_hrs = ws['E2'].value
-    complexity = ws['F2'].value
-    qa_factor = ws['G2'].value
-    task_failed = ws['H2'].value
-    leave_taken = ws['I2'].value
-    available_hrs = ws['J2'].value
-    efficiency = ws['K2'].value
-    raw_points = ws['L2'].value
-    ot_points = ws['M2'].value
-    approved_points = ws['N2'].value
-    
-    print(f"  Date: {date_val}")
-    print(f"  Day: {day_val}")
-    print(f"  Meeting Hrs: {meeting_hrs}")
-    print(f"  Assigned Hrs: {assigned_hrs}")
-    print(f"  Completed Hrs: {completed_hrs}")
-    print(f"  Complexity: {complexity}")
-    print(f"  QA Factor: {qa_factor}")
-    print(f"  Task Failed: {task_failed}")
-    print(f"  Leave Taken: {leave_taken}")
-    print(f"  Available Hrs: {available_hrs} (formula result)")
-    print(f"  Efficiency: {efficiency:.1%} (formula result)")
-    print(f"  Raw Points: {raw_points} (formula result)")
-    print(f"  OT Points: {ot_points} (formula result)")
-    print(f"  Approved Points: {approved_points} (formula result)")
-    
-    # Verify calculations manually
-    expected_available = 9 - meeting_hrs  # 9 - 0 = 9
-    expected_efficiency = completed_hrs / expected_available if expected_available > 0 else 0  # 9/9 = 1.0
-    expected_raw = completed_hrs * complexity * qa_factor  # 9 * 1 * 1 = 9
-    expected_ot = max(0, completed_hrs - assigned_hrs)  # max(0, 9-9) = 0
-    expected_approved = expected_efficiency * expected_raw if task_failed != "Y" else 0  # 1.0 * 9 = 9
-    
-    print(f"\nManual verification:")
-    print(f"  Expected Available: {expected_available} ✓" if available_hrs == expected_available else f"  Expected Available: {expected_available} ❌ Got: {available_hrs}")
-    print(f"  Expected Efficiency: {expected_efficiency:.1%} ✓" if abs(efficiency - expected_efficiency) < 0.01 else f"  Expected Efficiency: {expected_efficiency:.1%} ❌ Got: {efficiency:.1%}")
-    print(f"  Expected Raw Points: {expected_raw} ✓" if raw_points == expected_raw else f"  Expected Raw Points: {expected_raw} ❌ Got: {raw_points}")
-    print(f"  Expected OT Points: {expected_ot} ✓" if ot_points == expected_ot else f"  Expected OT Points: {expected_ot} ❌ Got: {ot_points}")
-    print(f"  Expected Approved: {expected_approved} ✓" if approved_points == expected_approved else f"  Expected Approved: {expected_approved} ❌ Got: {approved_points}")
-    
-    # Check summary section
-    print("\n📊 Validating Summary section...")
-    
-    # Find summary section (around row 30)
-    for row in range(25, 35):
-        cell_value = ws.cell(row=row, column=1).value
-        if cell_value and "Total Earned Points" in str(cell_value):
-            summary_start = row
-            break
+from employee_performance_tracker import PerformanceTracker, HEADERS
+from excel_export import SHEET_SUFFIX
+from excel_import import find_workbooks
+from formula_evaluator import SheetEvaluator, ExcelError, FormulaError, to_number
+from performance_rules import calculate_performance_metrics, summary_financials
+
+DEFAULT_FILE = "Employee_Performance_Tracker_Aug2025.xlsx"
+TOLERANCE = 1e-9
+MAX_ERRORS_PER_FILE = 50
+
+FORMULA_COLUMNS = [2, 10, 11, 12, 13, 14]  # B and J-N
+DERIVED_COLUMNS = {10: 'available_hrs', 11: 'efficiency', 12: 'raw_points', 13: 'ot_points', 14: 'approved_points'}
+SUMMARY_CHECKS = [  # (offset from first summary row, summary_financials key)
+    (1, 'total_workdays'), (3, 'bonus_rate'), (4, 'final_bonus'), (5, 'total_compensation')
+]
+
+
+def read_sheet_cells(ws):
+    """All non-empty cells of a read-only worksheet as {(row, column): value}"""
+    cells = {}
+    for row_idx, row in enumerate(ws.iter_rows(values_only=True), 1):
+        for col_idx, value in enumerate(row, 1):
+            if value is not None:
+                cells[(row_idx, col_idx)] = value
+    return cells
+
+
+def engine_metrics(inputs):
+    """Run the app's scoring engine on one sheet row's input values (C-I)"""
+    meeting, assigned, completed, complexity, qa, failed, leave = inputs
+    performance = SimpleNamespace(
+        meeting_hrs=to_number(meeting), assigned_hrs=to_number(assigned),
+        completed_hrs=to_number(completed), complexity_factor=to_number(complexity),
+        qa_factor=to_number(qa),
+        task_failed=str(failed or '').upper() == 'Y',
+        leave_taken=str(leave or '').upper() == 'Y'
+    )
+    return calculate_performance_metrics(performance)
+
+
+def differs(sheet_value, expected):
+    if isinstance(sheet_value, ExcelError):
+        return True
+    return abs(to_number(sheet_value) - expected) > TOLERANCE
+
+
+def validate_sheet(ws_title, cells, tracker, errors):
+    """Check one sheet's formulas and recalculated values; returns the number of data rows"""
+    def error(message):
+        errors.append(f"{ws_title}: {message}")
+
+    evaluator = SheetEvaluator(cells)
+
+    headers = [cells.get((1, col)) for col in range(1, len(HEADERS) + 1)]
+    if headers != HEADERS:
+        error("header row does not match the tracker layout")
+
+    # Daily rows run from row 2 until the blank row above the summary
+    row = 2
+    total_points = 0.0
+    while cells.get((row, 1)) is not None:
+        inputs = [cells.get((row, col)) for col in range(3, 10)]
+        expected_formulas = tracker.daily_row(row, cells[(row, 1)], inputs)
+        for col in FORMULA_COLUMNS:
+            if cells.get((row, col)) != expected_formulas[col - 1]:
+                error(f"{HEADERS[col - 1]} formula in row {row} was changed to {cells.get((row, col))!r}")
+
+        expected = engine_metrics(inputs)
+        for col, field in DERIVED_COLUMNS.items():
+            sheet_value = evaluator.value(row, col)
+            if differs(sheet_value, getattr(expected, field)):
+                error(f"row {row} {HEADERS[col - 1]}: sheet {sheet_value!r}, engine {getattr(expected, field)!r}")
+        total_points += expected.approved_points
+        row += 1
+
+    num_workdays = row - 2
+    summary_start = num_workdays + 4
+    if cells.get((summary_start, 1)) != "Total Earned Points":
+        error(f"summary section not found at row {summary_start}")
+        return num_workdays
+
+    for i, (label, formula) in enumerate(tracker.summary_rows(num_workdays)):
+        if i != 2 and cells.get((summary_start + i, 3)) != formula:  # Base Salary is an input
+            error(f"{label} formula was changed to {cells.get((summary_start + i, 3))!r}")
+
+    sheet_points = evaluator.value(summary_start, 3)
+    if differs(sheet_points, total_points):
+        error(f"Total Earned Points: sheet {sheet_points!r}, engine {total_points!r}")
+
+    # Bonus figures are checked from the sheet's own point total so one bad row is reported once
+    base_salary = to_number(cells.get((summary_start + 2, 3)))
+    totals = {'total_points': to_number(sheet_points), 'recorded_days': num_workdays,
+              'leave_days': 0, 'efficiency_sum': 0}
+    expected = summary_financials(totals, base_salary, num_workdays)
+    for offset, field in SUMMARY_CHECKS:
+        sheet_value = evaluator.value(summary_start + offset, 3)
+        if differs(sheet_value, expected[field]):
+            error(f"{tracker.summary_rows(num_workdays)[offset][0]}: sheet {sheet_value!r}, engine {expected[field]!r}")
+
+    return num_workdays
+
+
+def validate_excel_formulas(filename=DEFAULT_FILE):
+    """Validate every tracker sheet of one workbook, streaming it in read-only mode"""
+    report = {'file': filename, 'sheets': 0, 'rows': 0, 'errors': [], 'error_count': 0}
+    tracker = PerformanceTracker()
+
+    try:
+        wb = openpyxl.load_workbook(filename, read_only=True)
+    except Exception as e:
+        report['errors'].append(f"cannot open workbook: {e}")
+        report['error_count'] = 1
+        return report
+
+    try:
+        for ws in wb.worksheets:
+            if not ws.title.endswith(SHEET_SUFFIX):
+                continue
+            sheet_errors = []
+            try:
+                report['rows'] += validate_sheet(ws.title, read_sheet_cells(ws), tracker, sheet_errors)
+            except FormulaError as e:
+                sheet_errors.append(f"{ws.title}: {e}")
+            report['sheets'] += 1
+            report['error_count'] += len(sheet_errors)
+            report['errors'].extend(sheet_errors[:MAX_ERRORS_PER_FILE - len(report['errors'])])
+    finally:
+        wb.close()
+
+    return report
+
+
+def print_report(report):
+    if report['error_count']:
+        print(f"❌ {report['file']}: {report['sheets']} sheets, {report['rows']} rows, {report['error_count']} problems")
+        for message in report['errors'][:10]:
+            print(f"    {message}")
+        if report['error_count'] > 10:
+            print(f"    ... {report['error_count'] - 10} more")
+    else:
+        print(f"✅ {report['file']}: {report['sheets']} sheets, {report['rows']} rows")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate tracker workbook formulas without Excel")
+    parser.add_argument("paths", nargs="*", default=[DEFAULT_FILE], help="workbooks or directories of workbooks")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    workbooks = find_workbooks(args.paths)
+    print(f"🔍 Validating {len(workbooks)} workbook(s)...")
+
+    if len(workbooks) == 1 or args.workers == 1:
+        reports = map(validate_excel_formulas, workbooks)
+        failed = sum(1 for report in reports if print_report(report) or report['error_count'])
     else:
-        print("❌ Could not find summary section")
-        return
-    
-    total_points = ws.cell(row=summary_start, column=3).value
-    workdays = ws.cell(row=summary_start + 1, column=3).value
-    base_salary = ws.cell(row=summary_start + 2, column=3).value
-    bonus_rate = ws.cell(row=summary_start + 3, column=3).value
-    monthly_bonus = ws.cell(row=summary_start + 4, column=3).value
-    total_pay = ws.cell(row=summary_start + 5, column=3).value
-    
-    print(f"  Total Earned Points: {total_points}")
-    print(f"  Workdays: {workdays}")
-    print(f"  Base Salary: ₹{base_salary:,.2f}")
-    print(f"  Bonus Rate per Point: ₹{bonus_rate:.2f}")
-    print(f"  Monthly Bonus: ₹{monthly_bonus:,.2f}")
-    print(f"  Total Pay: ₹{total_pay:,.2f}")
-    
-    # Manual verification of summary
-    expected_total_points = 26 * 9  # 26 days * 9 points = 234
-    expected_bonus_rate = (base_salary * 0.5) / (workdays * 10)  # (50000 * 0.5) / (26 * 10) = 96.15
-    expected_bonus = min(total_points * expected_bonus_rate, base_salary * 0.5)
-    expected_total_pay = base_salary + expected_bonus
-    
-    print(f"\nSummary verification:")
-    print(f"  Expected Total Points: {expected_total_points} ✓" if total_points == expected_total_points else f"  Expected Total Points: {expected_total_points} ❌ Got: {total_points}")
-    print(f"  Expected Bonus Rate: ₹{expected_bonus_rate:.2f} ✓" if abs(bonus_rate - expected_bonus_rate) < 0.01 else f"  Expected Bonus Rate: ₹{expected_bonus_rate:.2f} ❌ Got: ₹{bonus_rate:.2f}")
-    print(f"  Expected Bonus: ₹{expected_bonus:,.2f} ✓" if abs(monthly_bonus - expected_bonus) < 1 else f"  Expected Bonus: ₹{expected_bonus:,.2f} ❌ Got: ₹{monthly_bonus:,.2f}")
-    print(f"  Expected Total Pay: ₹{expected_total_pay:,.2f} ✓" if abs(total_pay - expected_total_pay) < 1 else f"  Expected Total Pay: ₹{expected_total_pay:,.2f} ❌ Got: ₹{total_pay:,.2f}")
-    
-    wb.close()
-    
-    print(f"\n✅ Validation completed for {filename}")
-    print("\n📋 Expected results structure:")
-    print("Date          Day  Meeting  Assigned  Completed  Complexity  QA  Failed  Leave  Available  Efficiency  Raw  OT  Approved")
-    print("2025-08-01    Fri      0         9          9           1     1      N      N          9       100%      9   0         9")
-    print("...")
-    print("Summary:")
-    print(f"Total Earned Points: {expected_total_points}")
-    print(f"Workdays: 26")
-    print(f"Base Salary: ₹50,000")
-    print(f"Bonus Rate/Point: ₹{expected_bonus_rate:.2f}")
-    print(f"Monthly Bonus: ₹{expected_bonus:,.2f}")
-    print(f"Total Pay: ₹{expected_total_pay:,.2f}")
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            reports = pool.map(validate_excel_formulas, workbooks, chunksize=4)
+            failed = sum(1 for report in reports if print_report(report) or report['error_count'])
+
+    print(f"\n{'✅' if not failed else '❌'} {len(workbooks) - failed}/{len(workbooks)} workbooks passed")
+    return 1 if failed else 0
+
 
 if __name__ == "__main__":
-    validate_excel_formulas()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Working-Day Calendar
+Single source of company working days (Monday-Saturday minus company holidays)
+Month tables are precomputed once and LRU-cached; day counts between two dates
+come from cumulative counts instead of walking the calendar day by day
+"""
+
+import calendar
+from bisect import bisect_left
+from datetime import date, timedelta
+from functools import lru_cache
+
+WORKING_WEEKDAYS = 6  # Monday=0 .. Saturday=5 are working days
+CALENDAR_EPOCH = date(2000, 1, 3)  # A Monday; cumulative counts start here
+MONTH_CACHE_SIZE = 240  # 20 years of month tables
+
+_holidays = frozenset()
+_holiday_ordinals = []  # Sorted ordinals of holidays that fall on working weekdays
+
+
+def set_holidays(holidays):
+    """Replace the company holiday list; cached month tables are dropped when it changed"""
+    global _holidays, _holiday_ordinals
+    holidays = frozenset(holidays)
+    if holidays == _holidays:
+        return  # Unchanged; keep the cached month tables
+    _holidays = holidays
+    _holiday_ordinals = sorted(day.toordinal() for day in _holidays if day.weekday() < WORKING_WEEKDAYS)
+    month_table.cache_clear()
+
+
+def holidays():
+    """Current company holidays, sorted"""
+    return sorted(_holidays)
+
+
+def is_working_day(day):
+    return day.weekday() < WORKING_WEEKDAYS and day not in _holidays
+
+
+@lru_cache(maxsize=MONTH_CACHE_SIZE)
+def month_table(year, month):
+    """
+    Precomputed working-day table for one month
+    Returns (working days, cumulative) where cumulative[d] is the number of
+    working days on days 1..d of the month (cumulative[0] == 0)
+    """
+    days_in_month = calendar.monthrange(year, month)[1]
+    workdays, cumulative = [], [0]
+    for day_number in range(1, days_in_month + 1):
+        day = date(year, month, day_number)
+        if is_working_day(day):
+            workdays.append(day)
+        cumulative.append(len(workdays))
+    return tuple(workdays), tuple(cumulative)
+
+
+def working_days(year, month):
+    """All working days of a month, in order"""
+    return list(month_table(year, month)[0])
+
+
+def working_day_count(year, month):
+    return len(month_table(year, month)[0])
+
+
+def working_days_through(day):
+    """Working days from the 1st of day's month up to and including day"""
+    return month_table(day.year, day.month)[1][day.day]
+
+
+def working_days_before(day):
+    """Working days since CALENDAR_EPOCH strictly before day (closed form plus holiday prefix)"""
+    weeks, rest = divmod((day - CALENDAR_EPOCH).days, 7)
+    weekdays = weeks * WORKING_WEEKDAYS + min(rest, WORKING_WEEKDAYS)
+    return weekdays - bisect_left(_holiday_ordinals, day.toordinal())
+
+
+def working_days_between(start, end):
+    """Working days in the inclusive range start..end (0 when end is before start)"""
+    if end < start:
+        return 0
+    return working_days_before(end + timedelta(days=1)) - working_days_before(start)
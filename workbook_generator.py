@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Sharded Workbook Generator
+Builds PerformanceTracker workbooks for many employees in parallel worker processes,
+one workbook per department or per N employees, with an append mode that adds sheets
+to an existing generated workbook without re-serializing the sheets already in it
+"""
+
+import argparse
+import csv
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from zipfile import ZipFile, ZIP_DEFLATED
+
+from employee_performance_tracker import DEFAULT_INPUTS
+from excel_export import build_performance_workbook, write_workbook, sheet_title
+import work_calendar
+
+SheetEmployee = namedtuple('SheetEmployee', 'id name employee_id department base_salary')
+
+DEFAULT_SHARD_SIZE = 500
+DEFAULT_BASE_SALARY = 50000
+
+WORKBOOK_PART = 'xl/workbook.xml'
+WORKBOOK_RELS_PART = 'xl/_rels/workbook.xml.rels'
+CONTENT_TYPES_PART = '[Content_Types].xml'
+STYLES_PART = 'xl/styles.xml'
+WORKSHEET_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml'
+WORKSHEET_REL_TYPE = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet'
+
+
+# Employee Sources
+def read_employee_file(path):
+    """
+    Read employees from a CSV file with a 'name' column
+    (optional: employee_id, department, base_salary) or a plain list of names
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        lines = [line for line in f.read().splitlines() if line.strip()]
+
+    if lines and 'name' in [h.strip().lower() for h in lines[0].split(',')]:
+        rows = [{k.strip().lower(): (v or '').strip() for k, v in row.items()}
+                for row in csv.DictReader(lines)]
+    else:
+        rows = [{'name': line.strip()} for line in lines]
+
+    return [
+        SheetEmployee(
+            id=index,
+            name=row['name'],
+            employee_id=row.get('employee_id') or f"EMP{index:05d}",
+            department=row.get('department') or 'General',
+            base_salary=float(row['base_salary']) if row.get('base_salary') else DEFAULT_BASE_SALARY
+        )
+        for index, row in enumerate(rows, 1)
+    ]
+
+
+def read_employee_table(department=None):
+    """Read active employees from the Employee table"""
+    from app import app, db, Employee, Department, department_filter, load_holidays
+
+    with app.app_context():
+        load_holidays(force=True)  # Company holidays shape the month's working days
+        query = db.session.query(
+            Employee.id, Employee.name, Employee.employee_id,
+            Department.name.label('department'), Employee.base_salary
+        ).outerjoin(Department, Employee.department_id == Department.id).filter(Employee.is_active == True)
+        if department:
+            query = query.filter(department_filter(department))
+
+        return [
+            SheetEmployee(row.id, row.name, row.employee_id, row.department or 'General', row.base_salary)
+            for row in query.order_by(Employee.id)
+        ]
+
+
+# Sharding
+def shard_employees(employees, by_department=False, shard_size=DEFAULT_SHARD_SIZE):
+    """Split employees into (workbook label, employees) shards"""
+    if by_department:
+        departments = {}
+        for employee in employees:
+            departments.setdefault(employee.department, []).append(employee)
+        return [(department, members) for department, members in sorted(departments.items())]
+
+    return [
+        (f"part{number:03d}", employees[start:start + shard_size])
+        for number, start in enumerate(range(0, len(employees), shard_size), 1)
+    ]
+
+
+def shard_filename(label, year, month):
+    safe_label = re.sub(r'[^A-Za-z0-9_-]+', '_', label).strip('_') or 'Employees'
+    return f"Performance_{safe_label}_{year}_{month:02d}.xlsx"
+
+
+def write_shard(path, employees, titles, workdays):
+    """Worker: write one tracker workbook (write-only mode) for a shard of employees"""
+    def build(workbook):
+        return build_performance_workbook(
+            workbook, employees, [], workdays, missing_inputs=DEFAULT_INPUTS, titles=titles
+        )
+
+    write_workbook(build, path)
+    return path, len(employees)
+
+
+# Append Mode
+def workbook_sheet_names(archive):
+    """Sheet titles listed in a workbook archive's workbook.xml"""
+    workbook_xml = archive.read(WORKBOOK_PART).decode('utf-8')
+    return [unescape_xml(name) for name in re.findall(r'<sheet [^>]*name="([^"]*)"', workbook_xml)]
+
+
+def unescape_xml(value):
+    return (value.replace('&lt;', '<').replace('&gt;', '>').replace('&quot;', '"')
+            .replace('&apos;', "'").replace('&amp;', '&'))
+
+
+def relationship_targets(rels_xml):
+    """Map relationship ids to archive member names"""
+    targets = {}
+    for element in re.findall(r'<Relationship [^>]*>', rels_xml):
+        rid = re.search(r'Id="([^"]*)"', element).group(1)
+        target = re.search(r'Target="([^"]*)"', element).group(1)
+        targets[rid] = target.lstrip('/') if target.startswith('/') else f"xl/{target}"
+    return targets
+
+
+def max_number(pattern, text):
+    return max((int(n) for n in re.findall(pattern, text)), default=0)
+
+
+def append_parts(target, parts):
+    """
+    Splice the sheets of generated part workbooks into target
+    Existing sheets are streamed through unchanged (never loaded or re-serialized);
+    only workbook.xml, its relationships and the content types gain new entries
+    """
+    with ZipFile(target) as existing:
+        members = {info.filename: existing.read(info.filename) for info in existing.infolist()
+                   if not info.filename.startswith('xl/worksheets/')}
+        existing_names = [info.filename for info in existing.infolist()]
+
+    workbook_xml = members[WORKBOOK_PART].decode('utf-8')
+    rels_xml = members[WORKBOOK_RELS_PART].decode('utf-8')
+    types_xml = members[CONTENT_TYPES_PART].decode('utf-8')
+
+    sheet_number = max_number(r'xl/worksheets/sheet(\d+)\.xml', ' '.join(existing_names))
+    sheet_id = max_number(r'sheetId="(\d+)"', workbook_xml)
+    rel_id = max_number(r'Id="rId(\d+)"', rels_xml)
+
+    new_sheets, new_rels, new_types, new_members = [], [], [], {}
+    for part in parts:
+        with ZipFile(part) as source:
+            if source.read(STYLES_PART) != members[STYLES_PART]:
+                raise ValueError(f"{target} was not written by this generator (styles differ); cannot append")
+
+            part_workbook = source.read(WORKBOOK_PART).decode('utf-8')
+            part_targets = relationship_targets(source.read(WORKBOOK_RELS_PART).decode('utf-8'))
+            for name, rid in re.findall(r'<sheet [^>]*name="([^"]*)"[^>]*r:id="(rId\d+)"', part_workbook):
+                sheet_number += 1
+                sheet_id += 1
+                rel_id += 1
+                sheet_path = f"xl/worksheets/sheet{sheet_number}.xml"
+                new_members[sheet_path] = (part, part_targets[rid])
+                new_sheets.append(f'<sheet name="{name}" sheetId="{sheet_id}" state="visible" r:id="rId{rel_id}" />')
+                new_rels.append(f'<Relationship Type="{WORKSHEET_REL_TYPE}" Target="/{sheet_path}" Id="rId{rel_id}" />')
+                new_types.append(f'<Override PartName="/{sheet_path}" ContentType="{WORKSHEET_CONTENT_TYPE}" />')
+
+    members[WORKBOOK_PART] = workbook_xml.replace('</sheets>', ''.join(new_sheets) + '</sheets>').encode('utf-8')
+    members[WORKBOOK_RELS_PART] = rels_xml.replace('</Relationships>', ''.join(new_rels) + '</Relationships>').encode('utf-8')
+    members[CONTENT_TYPES_PART] = types_xml.replace('</Types>', ''.join(new_types) + '</Types>').encode('utf-8')
+
+    staging = f"{target}.tmp"
+    with ZipFile(target) as existing, ZipFile(staging, 'w', ZIP_DEFLATED, allowZip64=True) as output:
+        for name in existing_names:
+            if name.startswith('xl/worksheets/'):
+                # Existing sheet XML is streamed through unchanged
+                with existing.open(name) as src, output.open(name, 'w') as dest:
+                    shutil.copyfileobj(src, dest)
+            else:
+                output.writestr(name, members[name])
+        for name, (part, member) in new_members.items():
+            with ZipFile(part) as source, source.open(member) as src, output.open(name, 'w') as dest:
+                shutil.copyfileobj(src, dest)
+    os.replace(staging, target)
+
+    return len(new_members)
+
+
+# Command Line Interface
+def generate(employees, year, month, out_dir, by_department=False, shard_size=DEFAULT_SHARD_SIZE,
+             workers=None, append_to=None):
+    """Write shards in parallel; in append mode the shards are spliced into append_to"""
+    shards = shard_employees(employees, by_department, shard_size)
+    workdays = work_calendar.working_days(year, month)  # Resolved once, with any loaded holidays
+    workers = max(1, min(workers or os.cpu_count() or 1, len(shards) or 1))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        taken = set()
+        if append_to:
+            with ZipFile(append_to) as existing:
+                taken = {name.lower() for name in workbook_sheet_names(existing)}
+            targets = [os.path.join(tmp, f"{index:05d}.xlsx") for index in range(len(shards))]
+        else:
+            os.makedirs(out_dir, exist_ok=True)
+            targets = [os.path.join(out_dir, shard_filename(label, year, month)) for label, _ in shards]
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(write_shard, path, members,
+                            [sheet_title(e.name, e.employee_id, taken) for e in members], workdays)
+                for path, (_, members) in zip(targets, shards)
+            ]
+            written = [future.result() for future in futures]
+
+        if append_to:
+            append_parts(append_to, targets)
+            return [(append_to, sum(count for _, count in written))]
+
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate PerformanceTracker workbooks in parallel")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--employees", metavar="FILE", help="CSV (name[,employee_id,department,base_salary]) or one name per line")
+    source.add_argument("--from-db", action="store_true", help="read active employees from the Employee table")
+    parser.add_argument("--department", help="with --from-db, only this department (id or name)")
+    parser.add_argument("--year", type=int, required=True)
+    parser.add_argument("--month", type=int, required=True, choices=range(1, 13), metavar="MONTH")
+    parser.add_argument("--by-department", action="store_true", help="one workbook per department")
+    parser.add_argument("--shard-size", type=int, default=DEFAULT_SHARD_SIZE, help="employees per workbook")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--out-dir", default="workbooks")
+    parser.add_argument("--append", metavar="WORKBOOK", help="add the employees to an existing generated workbook")
+    args = parser.parse_args()
+
+    employees = read_employee_file(args.employees) if args.employees else read_employee_table(args.department)
+    if not employees:
+        print("❌ No employees to generate")
+        return 1
+
+    print(f"🚀 Generating tracker sheets for {len(employees)} employees...")
+    start = time.perf_counter()
+    written = generate(
+        employees, args.year, args.month, args.out_dir,
+        by_department=args.by_department, shard_size=args.shard_size,
+        workers=args.workers, append_to=args.append
+    )
+    elapsed = time.perf_counter() - start
+
+    for path, count in written:
+        print(f"✅ {path} ({count} sheets)")
+    print(f"⏱️ {len(employees)} sheets in {elapsed:.1f}s ({len(employees) / elapsed:,.0f} sheets/sec)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())